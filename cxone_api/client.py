@@ -8,6 +8,7 @@ import random
 from requests.exceptions import ProxyError, HTTPError, ConnectionError, ReadTimeout, ConnectTimeout
 from cxone_api.__version__ import __version__ as cxone_api_version
 from cxone_api.exceptions import AuthException, CommunicationException
+from cxone_api.data_plane import DataPlaneClient
 
 
 class CxOneClient:
@@ -38,6 +39,8 @@ class CxOneClient:
         self.__randomize_retry_delay = randomize_retry_delay
 
         self.__auth_result = None
+        self.__data_plane = None
+        self.__upload_link_pool = None
 
 
     @staticmethod
@@ -166,6 +169,34 @@ class CxOneClient:
         """The URL for the administrative API endpoint for the Checkmarx One tenant"""
         return self.__auth_endpoint.admin_endpoint
 
+    @property
+    def data_plane(self) -> DataPlaneClient:
+        """The client used to transfer data to and from pre-signed URLs without API authentication.
+
+        A DataPlaneClient using the proxy and SSL verification settings of this client is created on first use.
+        Assign an instance of DataPlaneClient to use different timeouts, retries, or connection pool sizes.
+        """
+        if self.__data_plane is None:
+            self.__data_plane = DataPlaneClient(user_agent=self.__agent, proxy=self.__proxy, ssl_verify=self.__ssl_verify)
+        return self.__data_plane
+
+    @data_plane.setter
+    def data_plane(self, value : DataPlaneClient) -> None:
+        self.__data_plane = value
+
+    @property
+    def upload_link_pool(self) -> "UploadLinkPool":
+        """An optional pool of pre-generated upload links used when uploading content for a scan.
+
+        The default is None, so an upload link is generated for each upload.  Assign an instance of
+        `cxone_api.upload_link_pool.UploadLinkPool` to keep upload links ready for use.
+        """
+        return self.__upload_link_pool
+
+    @upload_link_pool.setter
+    def upload_link_pool(self, value : "UploadLinkPool") -> None:
+        self.__upload_link_pool = value
+
     async def __get_request_headers(self):
         if self.__auth_result is None:
             await self.__do_auth()
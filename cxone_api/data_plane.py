@@ -0,0 +1,162 @@
+"""Module that implements the DataPlaneClient object"""
+import asyncio
+import logging
+import random
+import urllib
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ProxyError, HTTPError, ConnectionError, ReadTimeout, ConnectTimeout
+from .exceptions import CommunicationException
+
+
+def is_presigned_url(url : str) -> bool:
+    """Returns true if the URL carries its own authorization in the form of a pre-signed query string.
+
+    :param url: The URL to inspect.
+    :type url: str
+
+    :rtype: bool
+    """
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+    return len({"X-Amz-Signature", "X-Goog-Signature", "Signature", "sig"} & set(query.keys())) > 0
+
+
+class DataPlaneClient:
+    """The DataPlaneClient object transfers bulk data to and from pre-signed URLs.
+
+    Pre-signed URLs such as upload links carry their own authorization.  Requests sent with this client
+    do not carry the Checkmarx One bearer token and do not wait on or trigger authentication.  The client
+    keeps its own connection pool so bulk transfers do not contend with API calls.
+
+    An instance is available from the `data_plane` property of CxOneClient.
+    """
+
+    def __init__(self, user_agent : str = None, connect_timeout : float = 30, read_timeout : float = 300,
+                 retries : int = 3, retry_delay_s : int = 5, pool_size : int = 10, proxy : dict = None, ssl_verify : bool = True):
+        """
+        :param user_agent: The value sent in the User-Agent header.  Default is None.
+        :type user_agent: str, optional
+
+        :param connect_timeout: The number of seconds to wait for a connection to be established.  Default is 30.
+        :type connect_timeout: float, optional
+
+        :param read_timeout: The number of seconds to wait for the remote side to send data.  Default is 300.
+        :type read_timeout: float, optional
+
+        :param retries: The number of attempts made for a request before raising an exception.  Default is 3.
+        :type retries: int, optional
+
+        :param retry_delay_s: The maximum number of seconds to wait before retrying a failed request.  Default is 5.
+        :type retry_delay_s: int, optional
+
+        :param pool_size: The maximum number of connections kept open for reuse.  Default is 10.
+        :type pool_size: int, optional
+
+        :param proxy: A dictionary of scheme:url pairs to route all communications through a proxy.  Default is None.
+        :type proxy: Dict, optional
+
+        :param ssl_verify: Set to true to verify SSL certificate validity for connections, false otherwise.  Default is true.
+        :type ssl_verify: bool, optional
+        """
+        self.__timeout = (connect_timeout, read_timeout)
+        self.__retries = max(1, retries)
+        self.__retry_delay = retry_delay_s
+        self.__proxy = proxy
+        self.__ssl_verify = ssl_verify
+        self.__agent = user_agent
+
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+
+    @staticmethod
+    def __rewind_position(data):
+        if data is None or isinstance(data, (bytes, bytearray, str)):
+            return 0
+        elif hasattr(data, "seek") and hasattr(data, "tell"):
+            try:
+                return data.tell()
+            except OSError:
+                return None
+
+        return None
+
+    async def __delay(self):
+        if self.__retry_delay > 0:
+            await asyncio.sleep(random.randint(1, self.__retry_delay))
+
+    async def request(self, method : str, url : str, stream : bool = False, headers : dict = None,
+                      data = None) -> requests.Response:
+        """Executes a request against a pre-signed URL.
+
+        Failed requests are retried on connection errors and server errors.  When `data` is a file object,
+        it is rewound before each retry; other iterable request bodies can only be sent once and are not retried.
+        When `stream` is true, only establishing the response is retried; reading the response body is the
+        responsibility of the caller.
+
+        :param method: The HTTP method (e.g. GET, PUT)
+        :type method: str
+
+        :param url: The pre-signed URL.
+        :type url: str
+
+        :param stream: Set to true to read the response body incrementally.  Default is false.
+        :type stream: bool, optional
+
+        :param headers: Additional request headers.  Default is None.
+        :type headers: dict, optional
+
+        :param data: The request body.  Default is None.
+
+        :raises CommunicationException: Raised when the request could not be completed.
+
+        :rtype: requests.Response
+        """
+        _log = logging.getLogger("DataPlaneClient.request")
+
+        request_headers = {} if headers is None else dict(headers)
+        if self.__agent is not None:
+            request_headers["User-Agent"] = self.__agent
+
+        rewind_to = DataPlaneClient.__rewind_position(data)
+        attempts = self.__retries if rewind_to is not None else 1
+
+        for attempt in range(0, attempts):
+            if attempt > 0:
+                await self.__delay()
+                if hasattr(data, "seek"):
+                    data.seek(rewind_to)
+
+            try:
+                response = await asyncio.to_thread(self.__session.request, method, url, stream=stream,
+                                                   headers=request_headers, data=data, timeout=self.__timeout,
+                                                   proxies=self.__proxy, verify=self.__ssl_verify)
+            except (ProxyError, HTTPError, ConnectionError, ReadTimeout, ConnectTimeout) as ex:
+                _log.warning(f"Attempt {attempt + 1} of {attempts} failed after exception {type(ex).__name__}.")
+                if attempt == attempts - 1:
+                    raise
+                continue
+
+            if response.status_code not in [429, 500, 502, 503, 504] or attempt == attempts - 1:
+                return response
+
+            _log.warning(f"Attempt {attempt + 1} of {attempts} failed with response "
+                         f"{response.status_code} for {method} {urllib.parse.urlsplit(url).path}")
+            response.close()
+
+        raise CommunicationException(self.request, method, urllib.parse.urlsplit(url).path)
+
+    async def get(self, url : str, stream : bool = False, headers : dict = None) -> requests.Response:
+        """Executes a GET request against a pre-signed URL.
+
+        :rtype: requests.Response
+        """
+        return await self.request("GET", url, stream=stream, headers=headers)
+
+    async def put(self, url : str, data, headers : dict = None) -> requests.Response:
+        """Executes a PUT request against a pre-signed URL.
+
+        :rtype: requests.Response
+        """
+        return await self.request("PUT", url, headers=headers, data=data)
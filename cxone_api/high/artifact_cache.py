@@ -0,0 +1,230 @@
+from cxone_api.client import CxOneClient
+from typing import Any, Union
+from pathlib import Path
+from collections import OrderedDict
+import hashlib, json, os, shutil, tempfile, threading
+
+
+class ArtifactCache:
+  """A content-addressed on-disk cache for generated artifacts such as reports and SCA exports.
+
+  Artifacts are stored under a key derived from the parameters used to generate them.  Entries are written
+  atomically so a partially written artifact is never returned, even if multiple processes share the cache
+  directory.  When the total size of the cache exceeds `max_bytes`, the least recently used entries are removed.
+
+  The size and last use of each entry are indexed in memory.  The index is loaded from the cache directory
+  the first time it is needed; entries written by other processes afterwards are indexed when they are read.
+
+  The cache methods perform blocking file I/O; async callers should invoke them with `asyncio.to_thread`.
+  """
+
+  __SUFFIX = ".artifact"
+
+  def __init__(self, cache_dir : Union[str, os.PathLike], max_bytes : int = 1024 * 1024 * 1024):
+    """
+    :param cache_dir: The directory where cached artifacts are stored.  It is created if it does not exist.
+    :type cache_dir: Union[str, os.PathLike]
+
+    :param max_bytes: The maximum total size of the cached artifacts, defaults to 1GiB.
+    :type max_bytes: int
+    """
+    self.__dir = Path(cache_dir)
+    self.__dir.mkdir(parents=True, exist_ok=True)
+    self.__max = max_bytes
+    self.__lock = threading.Lock()
+    self.__index = None
+    self.__total = 0
+
+  @property
+  def cache_dir(self) -> Path:
+    """The directory where cached artifacts are stored."""
+    return self.__dir
+
+  @property
+  def max_bytes(self) -> int:
+    """The maximum total size of the cached artifacts."""
+    return self.__max
+
+  @staticmethod
+  def key(client : CxOneClient, *parts : Any) -> str:
+    """Computes a cache key for an artifact generated by a tenant.
+
+    :param client: The CxOneClient instance that generates the artifact.  The tenant endpoints are part of the key.
+    :type client: CxOneClient
+
+    :param parts: JSON serializable values that identify the artifact.
+
+    :rtype: str
+    """
+    identity = [str(client.auth_endpoint), str(client.api_endpoint)] + list(parts)
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+  def __path(self, key : str) -> Path:
+    return self.__dir / key[:2] / f"{key}{ArtifactCache.__SUFFIX}"
+
+  def __entries(self):
+    for path in self.__dir.glob(f"*/*{ArtifactCache.__SUFFIX}"):
+      try:
+        stat = path.stat()
+        yield path, stat.st_size, stat.st_mtime
+      except FileNotFoundError:
+        pass
+
+  def __load_index(self) -> "OrderedDict[Path, int]":
+    # Called with the lock held.  The index is ordered from least to most recently used.
+    if self.__index is None:
+      self.__index = OrderedDict()
+      for path, size, _ in sorted(self.__entries(), key=lambda e: e[2]):
+        self.__index[path] = size
+      self.__total = sum(self.__index.values())
+    return self.__index
+
+  def __indexed(self, path : Path, size : Union[int, None]) -> None:
+    # Records an entry as most recently used, or removes it from the index if size is None.
+    with self.__lock:
+      index = self.__load_index()
+      self.__total -= index.pop(path, 0)
+      if size is not None:
+        index[path] = size
+        self.__total += size
+
+  @property
+  def size(self) -> int:
+    """The total size of the cached artifacts in bytes."""
+    with self.__lock:
+      self.__load_index()
+      return self.__total
+
+  def __touch(self, path : Path, size : int) -> None:
+    # The modification time records the last use of an entry for other processes and the next index load.
+    try:
+      os.utime(path)
+      self.__indexed(path, size)
+    except FileNotFoundError:
+      self.__indexed(path, None)
+
+  def __evict(self) -> None:
+    with self.__lock:
+      index = self.__load_index()
+      while self.__total > self.__max and len(index) > 0:
+        path, size = index.popitem(last=False)
+        self.__total -= size
+        try:
+          path.unlink()
+        except FileNotFoundError:
+          pass
+
+  def __commit(self, key : str, write) -> None:
+    dest = self.__path(key)
+    dest.parent.mkdir(exist_ok=True)
+    fd, temp = tempfile.mkstemp(dir=dest.parent, suffix=".tmp")
+    try:
+      with os.fdopen(fd, "wb") as f:
+        write(f)
+        size = f.tell()
+      os.replace(temp, dest)
+    except BaseException:
+      if os.path.exists(temp):
+        os.unlink(temp)
+      raise
+
+    self.__indexed(dest, size)
+    self.__evict()
+
+  def contains(self, key : str) -> bool:
+    """Returns true if an artifact is cached for the key.
+
+    :rtype: bool
+    """
+    return self.__path(key).exists()
+
+  def get(self, key : str) -> Union[bytes, None]:
+    """Retrieves a cached artifact.
+
+    :param key: The cache key computed with `key`.
+    :type key: str
+
+    :return: The artifact content or None if the artifact is not cached.
+    :rtype: Union[bytes, None]
+    """
+    path = self.__path(key)
+    try:
+      with open(path, "rb") as f:
+        content = f.read()
+    except FileNotFoundError:
+      self.__indexed(path, None)
+      return None
+
+    self.__touch(path, len(content))
+    return content
+
+  def put(self, key : str, content : bytes) -> None:
+    """Stores an artifact in the cache.
+
+    :param key: The cache key computed with `key`.
+    :type key: str
+
+    :param content: The artifact content.
+    :type content: bytes
+    """
+    self.__commit(key, lambda f: f.write(content))
+
+  def copy_to(self, key : str, dest : Union[str, os.PathLike]) -> Union[int, None]:
+    """Copies a cached artifact to a file.
+
+    :param key: The cache key computed with `key`.
+    :type key: str
+
+    :param dest: The path where the artifact is written.
+    :type dest: Union[str, os.PathLike]
+
+    :return: The number of bytes written or None if the artifact is not cached.
+    :rtype: Union[int, None]
+    """
+    path = self.__path(key)
+    try:
+      with open(path, "rb") as src, open(dest, "wb") as f:
+        shutil.copyfileobj(src, f)
+        written = f.tell()
+    except FileNotFoundError:
+      self.__indexed(path, None)
+      return None
+
+    self.__touch(path, written)
+    return written
+
+  def put_file(self, key : str, src : Union[str, os.PathLike]) -> None:
+    """Stores the content of a file in the cache.
+
+    :param key: The cache key computed with `key`.
+    :type key: str
+
+    :param src: The path of the file containing the artifact content.
+    :type src: Union[str, os.PathLike]
+    """
+    def copy(f):
+      with open(src, "rb") as s:
+        shutil.copyfileobj(s, f)
+
+    self.__commit(key, copy)
+
+  def remove(self, key : str) -> None:
+    """Removes an artifact from the cache if it is cached."""
+    path = self.__path(key)
+    try:
+      path.unlink()
+    except FileNotFoundError:
+      pass
+    self.__indexed(path, None)
+
+  def clear(self) -> None:
+    """Removes all artifacts from the cache."""
+    for path, _, _ in list(self.__entries()):
+      try:
+        path.unlink()
+      except FileNotFoundError:
+        pass
+
+    with self.__lock:
+      self.__index = OrderedDict()
+      self.__total = 0
@@ -0,0 +1,285 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, Iterable, List, Union
+from dataclasses import dataclass, field
+from requests import Response
+from .. import CxOneClient
+from ..util import json_on_ok
+from ..exceptions import ScanException, ResponseException
+from ..low.scans import retrieve_list_of_scans, retrieve_scan_status_summary
+from .scans import ScanInvoker
+import asyncio, logging, uuid
+
+
+def scan_status_counts(summary : Any) -> Dict[str, int]:
+    """Extracts the number of scans in each status from the response of `retrieve_scan_status_summary`.
+
+    The response is a dictionary with a `status` element that maps each status name to the number of scans
+    in that status, e.g. `{"status" : {"Queued" : 2, "Running" : 5}}`.
+
+    :param summary: The JSON response of `retrieve_scan_status_summary`.
+    :type summary: Any
+
+    :raises ResponseException: Raised if the response does not have the expected format.
+
+    :return: A dictionary of status names to the number of scans in that status.
+    :rtype: Dict[str, int]
+    """
+    counts = summary.get("status", None) if isinstance(summary, dict) else None
+
+    if not isinstance(counts, dict) or not all([isinstance(v, int) and not isinstance(v, bool) for v in counts.values()]):
+        raise ResponseException(f"Unexpected scan status summary format: {summary}")
+
+    return dict(counts)
+
+
+@dataclass(frozen=True)
+class ScanRequest:
+    """A request to invoke a scan.
+
+    Scans with a `clone_url` are invoked with `ScanInvoker.scan_by_clone_url`, other scans are invoked
+    with `ScanInvoker.scan_by_project_config`.
+    """
+    project_id : str
+    branch : str = None
+    engine_config : List[Dict] = None
+    scan_tags : Dict[str, str] = None
+    clone_url : str = None
+    clone_user : str = None
+    clone_cred_type : ScanInvoker.CredentialTypeEnum = ScanInvoker.CredentialTypeEnum.NONE
+    clone_cred_value : str = field(default=None, repr=False)
+
+
+@dataclass(frozen=True)
+class ScanSubmissionResult:
+    """The outcome of submitting one scan request."""
+    request : ScanRequest
+    scan_id : str = None
+    exception : BaseException = None
+    attempts : int = 1
+
+    @property
+    def ok(self) -> bool:
+        """True if the scan was invoked."""
+        return self.exception is None
+
+
+class BulkScanSubmitter:
+    """Submits a large number of scan requests with bounded concurrency.
+
+    Requests are submitted as they are read from the source iterable, with at most `concurrency` submissions
+    executing at the same time.  If `max_queued` is set, submissions are paused while the tenant's scan status
+    summary reports `max_queued` or more scans in the `Queued` status.  The queue length is shared by all
+    submissions and retrieved again only after `queue_check_interval_s` seconds.
+
+    A failed submission is only retried if it is certain the scan was not created:
+
+    * The server responded with status 429 (too many requests).
+    * The submission failed without a definitive response and no scan carrying the submission's unique
+      tag exists.  This requires `submission_tag`: when it is set, each submission is tagged with
+      `submission_tag` set to a unique value so that the outcome of an ambiguous failure can be found with
+      the scan list API.  By default scans are not tagged and ambiguous failures are not retried.
+
+    Configuration errors such as a missing branch are never retried.
+    """
+
+    def __init__(self, client : CxOneClient, concurrency : int = 10, max_attempts : int = 3, retry_delay_s : float = 10.0,
+                 max_queued : int = None, queue_check_interval_s : float = 30.0, submission_tag : str = None):
+        """
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :param concurrency: The maximum number of submissions executing at the same time.  Defaults to 10.
+        :type concurrency: int, optional
+
+        :param max_attempts: The maximum number of attempts to submit each scan.  Defaults to 3.
+        :type max_attempts: int, optional
+
+        :param retry_delay_s: The number of seconds to wait before a retry.  The delay doubles with each retry.  Defaults to 10.
+        :type retry_delay_s: float, optional
+
+        :param max_queued: Pause submissions while the tenant has this many queued scans.  Defaults to no limit.
+        :type max_queued: int, optional
+
+        :param queue_check_interval_s: The number of seconds a retrieved queue length is used before it is retrieved again.  Defaults to 30.
+        :type queue_check_interval_s: float, optional
+
+        :param submission_tag: The scan tag used to identify each submission, e.g. "submission-id".  Defaults to None, which does not tag scans.
+        :type submission_tag: str, optional
+        """
+        self.__client = client
+        self.__concurrency = max(1, concurrency)
+        self.__max_attempts = max(1, max_attempts)
+        self.__retry_delay = retry_delay_s
+        self.__max_queued = max_queued
+        self.__queue_interval = queue_check_interval_s
+        self.__tag = submission_tag
+        self.__gate = asyncio.Lock()
+        self.__queued = None
+        self.__queued_at = None
+
+    async def queued_count(self) -> int:
+        """Returns the number of scans in the tenant's queue.
+
+        :rtype: int
+        """
+        return scan_status_counts(json_on_ok(await retrieve_scan_status_summary(self.__client))).get("Queued", 0)
+
+    async def __wait_for_capacity(self) -> None:
+        if self.__max_queued is None:
+            return
+
+        _log = logging.getLogger("BulkScanSubmitter")
+        loop = asyncio.get_running_loop()
+
+        def stale() -> bool:
+            return self.__queued_at is None or loop.time() - self.__queued_at >= self.__queue_interval
+
+        while True:
+            if stale():
+                # Only one submission retrieves the queue length; the others use the count it retrieved.
+                async with self.__gate:
+                    if stale():
+                        try:
+                            self.__queued = await self.queued_count()
+                        except asyncio.CancelledError:
+                            raise
+                        except BaseException as ex:
+                            _log.warning(f"Unable to retrieve the scan status summary: {ex}")
+                            self.__queued = None
+                        self.__queued_at = loop.time()
+
+            if self.__queued is None or self.__queued < self.__max_queued:
+                return
+
+            _log.debug(f"{self.__queued} scans queued, pausing submissions.")
+            await asyncio.sleep(max(0, self.__queued_at + self.__queue_interval - loop.time()))
+
+    async def __invoke(self, request : ScanRequest, tags : Dict[str, str]) -> Response:
+        if request.clone_url is not None:
+            return await ScanInvoker.scan_by_clone_url(self.__client, request.project_id, request.clone_url, request.branch,
+                                                       request.clone_user, request.clone_cred_type, request.clone_cred_value,
+                                                       request.engine_config, tags)
+        else:
+            return await ScanInvoker.scan_by_project_config(self.__client, request.project_id, request.branch,
+                                                            request.engine_config, tags)
+
+    async def __find_submitted(self, request : ScanRequest, submission_id : str) -> Union[str, None]:
+        scans = json_on_ok(await retrieve_list_of_scans(self.__client, project_id=request.project_id,
+                                                        tags_keys=[self.__tag], tags_values=[submission_id]))
+        for scan in scans.get('scans', None) or []:
+            if (scan.get('tags', None) or {}).get(self.__tag, None) == submission_id:
+                return scan['id']
+        return None
+
+    async def submit_one(self, request : ScanRequest) -> ScanSubmissionResult:
+        """Submits a single scan request.
+
+        :param request: The scan request.
+        :type request: ScanRequest
+
+        :rtype: ScanSubmissionResult
+        """
+        _log = logging.getLogger("BulkScanSubmitter")
+
+        submission_id = str(uuid.uuid4())
+        tags = dict(request.scan_tags) if request.scan_tags is not None else {}
+        if self.__tag is not None:
+            tags[self.__tag] = submission_id
+
+        attempt = 0
+        while True:
+            attempt += 1
+            await self.__wait_for_capacity()
+
+            retryable = False
+            try:
+                response = await self.__invoke(request, tags if len(tags) > 0 else None)
+                if response.ok:
+                    scan = response.json()
+                    if self.__queued is not None:
+                        # Count the new scan until the queue length is retrieved again.
+                        self.__queued += 1
+                    return ScanSubmissionResult(request, scan.get('id', scan.get('scanId', None)), attempts=attempt)
+
+                error = ResponseException(f"Scan submission failed: Code: [{response.status_code}] {response.text}")
+                retryable = response.status_code == 429
+                ambiguous = response.status_code >= 500
+            except ScanException as ex:
+                return ScanSubmissionResult(request, exception=ex, attempts=attempt)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as ex:
+                # The library's exceptions, including AuthException, derive from BaseException.
+                error = ex
+                ambiguous = True
+
+            if ambiguous and self.__tag is not None:
+                try:
+                    scan_id = await self.__find_submitted(request, submission_id)
+                    if scan_id is not None:
+                        return ScanSubmissionResult(request, scan_id, attempts=attempt)
+                    retryable = True
+                except asyncio.CancelledError:
+                    raise
+                except BaseException as ex:
+                    _log.warning(f"Unable to determine if submission {submission_id} created a scan: {ex}")
+
+            if not retryable or attempt >= self.__max_attempts:
+                return ScanSubmissionResult(request, exception=error, attempts=attempt)
+
+            _log.warning(f"Retrying scan submission for project {request.project_id} after: {error}")
+            await asyncio.sleep(self.__retry_delay * (2 ** (attempt - 1)))
+
+    async def submit(self, requests : Union[Iterable[ScanRequest], AsyncIterable[ScanRequest]]) -> AsyncGenerator[ScanSubmissionResult, None]:
+        """Submits scan requests and yields the result of each submission in the order the submissions complete.
+
+        Requests are read from the source only as capacity to submit them becomes available.
+
+        :param requests: The scan requests.
+        :type requests: Union[Iterable[ScanRequest], AsyncIterable[ScanRequest]]
+
+        :return: A generator that is used in an `async for` statement.
+        :rtype: AsyncGenerator[ScanSubmissionResult, None]
+        """
+        results = asyncio.Queue()
+        slots = asyncio.Semaphore(self.__concurrency)
+        tasks = set()
+
+        async def run(request : ScanRequest):
+            try:
+                await results.put(await self.submit_one(request))
+            finally:
+                slots.release()
+
+        async def source():
+            if hasattr(requests, "__aiter__"):
+                async for request in requests:
+                    yield request
+            else:
+                for request in requests:
+                    yield request
+
+        async def feed():
+            try:
+                async for request in source():
+                    await slots.acquire()
+                    task = asyncio.create_task(run(request))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                await asyncio.gather(*list(tasks))
+            finally:
+                await results.put(None)
+
+        feeder = asyncio.create_task(feed())
+        try:
+            while True:
+                result = await results.get()
+                if result is None:
+                    break
+                yield result
+
+            await feeder
+        finally:
+            for t in [feeder] + list(tasks):
+                t.cancel()
+            await asyncio.gather(feeder, *list(tasks), return_exceptions=True)
@@ -0,0 +1,150 @@
+from typing import Dict, Iterable, List, Pattern, Tuple
+from dataclasses import replace
+from ..zip_stream import ZipOptions
+from .scans import ScanFilterConfig
+import posixpath, re
+
+
+class _FilterRules:
+    def __init__(self, expression : str, case_sensitive : bool):
+        self.includes : List[Tuple[Pattern, bool]] = []
+        self.excludes : List[Tuple[Pattern, bool]] = []
+        self.prune_patterns : List[Pattern] = []
+
+        flags = 0 if case_sensitive else re.IGNORECASE
+        for raw in (expression or "").split(","):
+            pattern = raw.strip()
+            exclude = pattern.startswith("!")
+            if exclude:
+                pattern = pattern[1:].strip()
+            pattern = pattern.lstrip("/")
+            if len(pattern) == 0:
+                continue
+            if pattern.endswith("/"):
+                pattern += "**"
+
+            compiled = (re.compile(_FilterRules.__to_regex(pattern), flags), "/" not in pattern)
+            if exclude:
+                self.excludes.append(compiled)
+                if pattern.endswith("/**"):
+                    self.prune_patterns.append(re.compile(_FilterRules.__to_regex(pattern[:-3]), flags))
+            else:
+                self.includes.append(compiled)
+
+    @staticmethod
+    def __to_regex(pattern : str) -> str:
+        regex = ""
+        pos = 0
+        while pos < len(pattern):
+            if pattern.startswith("**/", pos):
+                regex += "(?:.*/)?"
+                pos += 3
+            elif pattern.startswith("**", pos):
+                regex += ".*"
+                pos += 2
+            elif pattern[pos] == "*":
+                regex += "[^/]*"
+                pos += 1
+            elif pattern[pos] == "?":
+                regex += "[^/]"
+                pos += 1
+            else:
+                regex += re.escape(pattern[pos])
+                pos += 1
+        return f"^{regex}$"
+
+    @staticmethod
+    def __matches(rules : List[Tuple[Pattern, bool]], path : str) -> bool:
+        name = posixpath.basename(path)
+        for regex, name_only in rules:
+            if regex.match(path) or (name_only and regex.match(name)):
+                return True
+        return False
+
+    def includes_file(self, path : str) -> bool:
+        if _FilterRules.__matches(self.excludes, path):
+            return False
+        return len(self.includes) == 0 or _FilterRules.__matches(self.includes, path)
+
+    def prunes_directory(self, path : str) -> bool:
+        return any([p.match(path) for p in self.prune_patterns])
+
+
+class FileFilter:
+    """A local matcher for Checkmarx One file filter expressions.
+
+    A filter expression is a comma-separated list of glob patterns.  Patterns that start with `!` exclude matching
+    files; other patterns are inclusions.  If an expression has inclusions, only files matching an inclusion are
+    included.  Exclusions take precedence over inclusions.  `*` and `?` match within a single path segment,
+    `**` matches across path segments, and patterns without a `/` also match the file name in any directory.
+
+    A `FileFilter` combines the expressions for several engines: a file is included if any engine's expression
+    includes it, since the same source upload is used by every engine in the scan.
+
+    Instances are callable with a path relative to the source root.  Use `zip_options` to prune files
+    before they are compressed and uploaded; the size of the excluded files is reported by `ZipStats`.
+    """
+
+    def __init__(self, expressions : Iterable[str], case_sensitive : bool = True):
+        """
+        :param expressions: The filter expressions for each engine.  An expression of None or an empty
+                            expression includes all files.
+        :type expressions: Iterable[str]
+
+        :param case_sensitive: Set to false to match paths without regard to case.  Defaults to true.
+        :type case_sensitive: bool, optional
+        """
+        self.__rules = [_FilterRules(e, case_sensitive) for e in expressions]
+        if len(self.__rules) == 0:
+            self.__rules.append(_FilterRules(None, case_sensitive))
+
+    @staticmethod
+    def for_engines(filter_config : ScanFilterConfig, engines : Iterable[str], additional_filters : Dict[str, str] = None,
+                    case_sensitive : bool = True) -> "FileFilter":
+        """Creates a matcher from the tenant and project filters inherited by each engine in a scan.
+
+        :param filter_config: The inherited filter configuration.
+        :type filter_config: ScanFilterConfig
+
+        :param engines: The names of the engines in the scan (e.g. "sast", "sca").
+        :type engines: Iterable[str]
+
+        :param additional_filters: A dictionary of engine names to filter expressions that are added to the inherited filters.
+        :type additional_filters: Dict[str, str], optional
+
+        :param case_sensitive: Set to false to match paths without regard to case.  Defaults to true.
+        :type case_sensitive: bool, optional
+
+        :rtype: FileFilter
+        """
+        extra = additional_filters if additional_filters is not None else {}
+        return FileFilter([filter_config.compute_filters(engine, extra.get(engine, None)) for engine in engines], case_sensitive)
+
+    def includes(self, path : str) -> bool:
+        """Returns true if the file at a path relative to the source root is included.
+
+        :rtype: bool
+        """
+        normalized = path.replace("\\", "/").lstrip("/")
+        return any([r.includes_file(normalized) for r in self.__rules])
+
+    def prunes_directory(self, path : str) -> bool:
+        """Returns true if every file in the directory at a path relative to the source root is excluded.
+
+        :rtype: bool
+        """
+        normalized = path.replace("\\", "/").strip("/")
+        return all([r.prunes_directory(normalized) for r in self.__rules])
+
+    def __call__(self, path : str) -> bool:
+        return self.includes(path)
+
+    def zip_options(self, options : ZipOptions = None) -> ZipOptions:
+        """Returns zip options that add only the files included by this filter.
+
+        :param options: The options to apply the filter to.  Defaults to `ZipOptions()`.
+        :type options: ZipOptions, optional
+
+        :rtype: ZipOptions
+        """
+        return replace(options if options is not None else ZipOptions(), include=self, prune=self.prunes_directory)
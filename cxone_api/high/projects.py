@@ -1,11 +1,11 @@
-import asyncio
-from cxone_api.util import CloneUrlParser, json_on_ok
+import asyncio, logging
+from cxone_api.util import CloneUrlParser, json_on_ok, page_generator
 from cxone_api import CxOneClient
-from cxone_api.low.projects import retrieve_last_scan, retrieve_project_info
+from cxone_api.low.projects import retrieve_last_scan, retrieve_project_info, retrieve_list_of_projects
 from cxone_api.low.scans import retrieve_scan_details
 from cxone_api.low.scan_configuration import retrieve_project_configuration
 from cxone_api.low.repos_manager import get_scm_by_id, retrieve_repo_by_id
-from typing import List, Dict
+from typing import List, Dict, Iterable
 
 
 class ProjectRepoConfig:
@@ -18,6 +18,7 @@ class ProjectRepoConfig:
         self.__fetched_scm_config = False
         self.__is_imported = False
         self.__lock = asyncio.Lock()
+        self.__memo = {}
 
     @staticmethod
     async def from_project_json(cxone_client: CxOneClient, json: dict):
@@ -56,6 +57,112 @@ class ProjectRepoConfig:
         retval.__is_imported = "repoId" in retval.__project_data.keys()
         return retval
 
+    @staticmethod
+    async def load_many(cxone_client: CxOneClient, project_ids: Iterable[str], concurrency: int = 10,
+                        scm_cache: Dict[str, dict] = None, include_scan_config: bool = False,
+                        ids_per_page: int = 50) -> Dict[str, "ProjectRepoConfig"]:
+        """A factory method to create instances for many projects with a minimum of API calls.
+
+            The project information is retrieved with the paged project list rather than one request
+            per project.  The repo-manager configuration of each imported project is retrieved concurrently
+            and the SCM configurations are retrieved once per SCM ID, so the returned instances do not need
+            to make further API calls to resolve their repository configuration.
+
+            :param cxone_client: The CxOneClient instance used to communicate with Checkmarx One.
+            :type cxone_client: CxOneClient
+
+            :param project_ids: The project IDs.
+            :type project_ids: Iterable[str]
+
+            :param concurrency: The maximum number of concurrent API calls.  Defaults to 10.
+            :type concurrency: int, optional
+
+            :param scm_cache: A dictionary of SCM configurations keyed by SCM ID.  SCM configurations found in
+                              the dictionary are not retrieved and retrieved configurations are added to it, allowing
+                              the cache to be shared between calls.  Defaults to None.
+            :type scm_cache: Dict[str, dict], optional
+
+            :param include_scan_config: If true, the project scan configuration is also retrieved for each project.
+                                        Defaults to False.
+            :type include_scan_config: bool, optional
+
+            :param ids_per_page: The number of project IDs requested with each call to the project list API.
+                                 Defaults to 50.
+            :type ids_per_page: int, optional
+
+            :raises ResponseException: Raised if the project list API responds with an error.
+
+            :returns: A dictionary of instances keyed by project ID in the order of `project_ids`.  Projects
+                      that were not found are not in the dictionary.
+            :rtype: Dict[str, ProjectRepoConfig]
+        """
+        ids = list(dict.fromkeys(project_ids))
+        scm_cache = scm_cache if scm_cache is not None else {}
+        limiter = asyncio.Semaphore(concurrency)
+
+        found = {}
+        for start in range(0, len(ids), ids_per_page):
+            async for project in page_generator(retrieve_list_of_projects, "projects", client=cxone_client,
+                                                ids=ids[start:start + ids_per_page]):
+                found[project['id']] = await ProjectRepoConfig.from_project_json(cxone_client, project)
+
+        instances = {pid : found[pid] for pid in ids if pid in found}
+
+        async def fetch_repo(instance : ProjectRepoConfig):
+            async with limiter:
+                await instance.__get_repomgr_config()
+
+        await asyncio.gather(*[fetch_repo(i) for i in instances.values() if i.__is_imported])
+
+        needed = set()
+        for instance in instances.values():
+            scm_id = await instance.scm_id
+            if scm_id is not None and scm_id not in scm_cache:
+                needed.add(scm_id)
+
+        async def fetch_scm(scm_id : str):
+            async with limiter:
+                response = await get_scm_by_id(cxone_client, scm_id)
+                if response.ok:
+                    scm_cache[scm_id] = response.json()
+                else:
+                    logging.getLogger("ProjectRepoConfig").warning(
+                        f"Unable to retrieve SCM {scm_id}: Code: [{response.status_code}] Url: {response.request.url}")
+
+        await asyncio.gather(*[fetch_scm(s) for s in needed])
+
+        for instance in instances.values():
+            scm_id = await instance.scm_id
+            if scm_id in scm_cache:
+                # SCM configurations that could not be retrieved are left to be fetched on demand.
+                instance.__fetched_scm_config = True
+                instance.__scm_config = scm_cache[scm_id]
+
+        if include_scan_config:
+            async def fetch_scan_config(instance : ProjectRepoConfig):
+                async with limiter:
+                    await instance.get_project_scan_config()
+
+            await asyncio.gather(*[fetch_scan_config(i) for i in instances.values()])
+
+        return instances
+
+    def refresh(self) -> None:
+        """Discards the resolved repository values and retrieved configurations.
+
+           The configurations are retrieved again the next time a property that depends on them is used.
+        """
+        self.__memo = {}
+        self.__fetched_scan_config = False
+        self.__fetched_repomgr_config = False
+        self.__fetched_scm_config = False
+
+    async def __memoized(self, key, resolver):
+        # Resolved values are kept until refresh() is called.
+        if key not in self.__memo:
+            self.__memo[key] = await resolver()
+        return self.__memo[key]
+
     def __getattr__(self, name):
         if name in self.__project_data.keys():
             return self.__project_data[name]
@@ -70,7 +177,7 @@ class ProjectRepoConfig:
         async with self.__lock:
             if not self.__fetched_scan_config:
                 self.__fetched_scan_config = True
-                self.__scan_config = json_on_ok(await retrieve_project_configuration(self.__client, projectid=self.project_id))
+                self.__scan_config = json_on_ok(await retrieve_project_configuration(self.__client, project_id=self.project_id))
 
         return self.__scan_config
 
@@ -136,22 +243,29 @@ class ProjectRepoConfig:
         return ""
 
     async def __get_logical_repo_url(self):
-        if len(await self.__get_repourl_from_repomgr_config()) > 0:
-            return await self.__get_repourl_from_repomgr_config()
+        repomgr_url = await self.__get_repourl_from_repomgr_config()
+        if len(repomgr_url) > 0:
+            return repomgr_url
         elif len(self.__project_data['repoUrl']) > 0:
             return self.__project_data['repoUrl']
-        elif len(await self.__get_repourl_from_scan_config()) > 0:
-            return await self.__get_repourl_from_scan_config()
+
+        scan_config_url = await self.__get_repourl_from_scan_config()
+        if scan_config_url is not None and len(scan_config_url) > 0:
+            return scan_config_url
         else:
             return None
 
     async def __get_logical_primary_branch(self):
         if len(self.__project_data['mainBranch']) > 0:
             return self.__project_data['mainBranch']
-        elif len(await self.__get_primary_branch_from_repomgr_config()) > 0:
-            return await self.__get_primary_branch_from_repomgr_config()
-        elif len(await self.__get_primary_branch_from_scan_config()):
-            return await self.__get_primary_branch_from_scan_config()
+
+        repomgr_branch = await self.__get_primary_branch_from_repomgr_config()
+        if len(repomgr_branch) > 0:
+            return repomgr_branch
+
+        scan_config_branch = await self.__get_primary_branch_from_scan_config()
+        if len(scan_config_branch) > 0:
+            return scan_config_branch
 
         return None
 
@@ -171,30 +285,34 @@ class ProjectRepoConfig:
     @property
     async def primary_branch(self):
         """The configured primary branch."""
-        return await self.__get_logical_primary_branch()
+        return await self.__memoized("primary_branch", self.__get_logical_primary_branch)
+
+    async def __resolve_repo_url(self):
+        url = await self.__get_logical_repo_url()
+        return url if url is not None and len(url) > 0 else None
 
     @property
     async def repo_url(self):
         """The URL for the source repository."""
-        url = await self.__get_logical_repo_url()
-        return url if url is not None and len(url) > 0 else None
+        return await self.__memoized("repo_url", self.__resolve_repo_url)
 
     @property
     async def is_scm_imported(self):
         """A boolean value indicating if the project was created using a code repository import."""
         return self.__is_imported
 
-    @property
-    async def scm_creds_expired(self):
-        """A boolean value indicating if the SCM credentials have expired."""
+    async def __resolve_scm_creds_expired(self):
         if not self.__is_imported:
             return True
 
         return await self.__get_repomgr_config() is None
 
     @property
-    async def scm_id(self):
-        """The internal ID of the SCM configuration."""
+    async def scm_creds_expired(self):
+        """A boolean value indicating if the SCM credentials have expired."""
+        return await self.__memoized("scm_creds_expired", self.__resolve_scm_creds_expired)
+
+    async def __resolve_scm_id(self):
         if not await self.is_scm_imported or await self.scm_creds_expired:
             return None
 
@@ -208,16 +326,22 @@ class ProjectRepoConfig:
             return None
 
     @property
-    async def scm_org(self):
-        """The organization in the SCM that owns the source repository associated with this project."""
+    async def scm_id(self):
+        """The internal ID of the SCM configuration."""
+        return await self.__memoized("scm_id", self.__resolve_scm_id)
+
+    async def __resolve_scm_org(self):
         if not await self.is_scm_imported or await self.scm_creds_expired:
             return None
 
         return CloneUrlParser(await self.scm_type, await self.repo_url).org
 
     @property
-    async def scm_type(self):
-        """The type of SCM where this repository lives."""
+    async def scm_org(self):
+        """The organization in the SCM that owns the source repository associated with this project."""
+        return await self.__memoized("scm_org", self.__resolve_scm_org)
+
+    async def __resolve_scm_type(self):
         if not await self.is_scm_imported or await self.scm_creds_expired:
             return None
 
@@ -229,6 +353,11 @@ class ProjectRepoConfig:
         else:
             return None
 
+    @property
+    async def scm_type(self):
+        """The type of SCM where this repository lives."""
+        return await self.__memoized("scm_type", self.__resolve_scm_type)
+
     @property
     async def repo_id(self):
         """The internal ID of the source repository configuration."""
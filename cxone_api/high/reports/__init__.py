@@ -1,5 +1,6 @@
 from cxone_api.high.reports.report_contents import Scanners, ImprovedScanReport, LegacyScanReport, ProjectReport, ApplicationList, ProjectList, ScanList
 from cxone_api.high.reports.file_formats import PDFReport, CSVReport, JSONReport
 from cxone_api.high.reports.abstract_report import ReportType
-
-
+from cxone_api.high.reports.batch import ReportBatchResult, generate_reports
+from cxone_api.high.reports.csv_stream import CsvSchema, iter_csv_records, iter_csv_dicts
+from cxone_api.high.artifact_cache import ArtifactCache
@@ -2,10 +2,13 @@ from cxone_api.high.reports.abstract_report import AbstractReportRequest
 from cxone_api.low.reports import create_a_report, retrieve_report_status
 from cxone_api.high.reports.exceptions import ReportException
 from cxone_api.util import json_on_ok
+from cxone_api.exceptions import ResponseException
+from cxone_api.transfer import download_to_file, iter_download, DEFAULT_CHUNK_SIZE
+from cxone_api.high.artifact_cache import ArtifactCache
 from requests import Response
-from typing import Any
+from typing import Any, AsyncGenerator, BinaryIO, Union
 from time import perf_counter
-import asyncio
+import asyncio, os
 
 class AbstractReportFileFormat:
   __SLEEP_MAX_SECONDS = 10
@@ -30,12 +33,19 @@ class AbstractReportFileFormat:
 
   @property
   def file_format(self) -> str:
+    """The name of the file format sent to the API."""
     return self.__format
   
   @property
   def content_type(self) -> AbstractReportRequest:
+    """The requested type of report content."""
     return self.__content
-  
+
+  @property
+  def timeout_seconds(self) -> int:
+    """The number of seconds to wait for the server to generate a report."""
+    return self.__timeout
+
   async def _create(self) -> Response:
     request_payload = {
       "reportName" : self.__content.report_name,
@@ -50,7 +60,7 @@ class AbstractReportFileFormat:
   async def _download(self, url : str) -> Any:
     raise NotImplementedError("_download")
   
-  async def _get_report(self) -> Any:
+  async def _submit(self) -> str:
     create_response = await self._create()
 
     response_json = json_on_ok(create_response, [202, 400, 401, 403])
@@ -58,29 +68,125 @@ class AbstractReportFileFormat:
     if not create_response.ok:
       raise ReportException.error_on_create(response_json.get("message", f"{create_response.status_code}"))
     
-    report_id = response_json['reportId']
+    return response_json['reportId']
+
+  async def _check_status(self, report_id : str) -> Union[str, None]:
+    status_response = json_on_ok(await retrieve_report_status(self.__content.client, report_id))
+    
+    if status_response['status'] == "failed":
+      raise ReportException.report_gen_fail(self.__content.data)
+    elif status_response['status'] == "completed":
+      return status_response['url']
+    
+    return None
+
+  async def _get_report_url(self) -> str:
+    report_id = await self._submit()
 
     start = perf_counter()
     sleep = AbstractReportFileFormat.__SLEEP_INCREMENT_SECONDS
-    timed_out = True
+    url = None
     while perf_counter() - start < self.__timeout:
       await asyncio.sleep(min(sleep, AbstractReportFileFormat.__SLEEP_MAX_SECONDS))
 
-      status_response = json_on_ok(await retrieve_report_status(self.__content.client, report_id))
-      
-      if status_response['status'] == "failed":
-        raise ReportException.report_gen_fail(self.__content.data)
-      elif status_response['status'] == "completed":
-        timed_out = False
+      url = await self._check_status(report_id)
+      if url is not None:
         break
       
       sleep += AbstractReportFileFormat.__SLEEP_INCREMENT_SECONDS
     
-    if timed_out:
+    if url is None:
       raise ReportException.report_gen_timeout(self.__content.data)
 
+    return url
+
+  async def _get_report(self) -> Any:
+    return await self._download(await self._get_report_url())
+
+  @property
+  def cache_key(self) -> str:
+    """The key identifying the report content in an `ArtifactCache`."""
+    return ArtifactCache.key(self.__content.client, "report", self.__content.report_name, self.file_format,
+                             self.__content.report_type, self.__content.data, self.__content.additional_data)
+
+  def _serialize(self, content : Any) -> bytes:
+    raise NotImplementedError("_serialize")
+
+  def _deserialize(self, data : bytes) -> Any:
+    raise NotImplementedError("_deserialize")
+
+  async def _get_cached_report(self, cache : ArtifactCache) -> Any:
+    if cache is None or not self.__content.cacheable:
+      return await self._get_report()
 
-    return await self._download(status_response['url'])
+    key = self.cache_key
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+      return self._deserialize(cached)
 
+    content = await self._get_report()
+    await asyncio.to_thread(cache.put, key, self._serialize(content))
+    return content
 
+  @staticmethod
+  def prepare(content_type : AbstractReportRequest, wait_timeout_seconds : int=300) -> "AbstractReportFileFormat":
+    raise NotImplementedError("prepare")
 
+  @classmethod
+  async def get_report_to_file(cls, content_type : AbstractReportRequest, dest : Union[str, os.PathLike, BinaryIO],
+                               wait_timeout_seconds : int=300, chunk_size : int=DEFAULT_CHUNK_SIZE) -> int:
+    """Retrieves the report content and streams it directly to a file.
+
+    The report content is never held in memory in its entirety.  If the connection drops during the download,
+    the download is resumed where it stopped.
+
+    :param content_type: The type of report to create.  The report types supported are the same as for `get_report`.
+    :type content_type: AbstractReportRequest
+
+    :param dest: A path where the report is written or a binary file object open for writing.
+    :type dest: Union[str, os.PathLike, BinaryIO]
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :param chunk_size: The maximum number of bytes held in memory while writing, defaults to 1MiB.
+    :type chunk_size: int
+
+    :raises ReportException: Raised when retrieval of a report fails for any reason.
+
+    :return: The number of bytes written.
+    :rtype: int
+    """
+    report = cls.prepare(content_type, wait_timeout_seconds)
+    url = await report._get_report_url()
+    try:
+      return await download_to_file(content_type.client, url, dest, chunk_size)
+    except ResponseException:
+      raise ReportException.report_download_fail(url)
+
+  @classmethod
+  async def iter_report_chunks(cls, content_type : AbstractReportRequest, wait_timeout_seconds : int=300,
+                               chunk_size : int=DEFAULT_CHUNK_SIZE) -> AsyncGenerator[bytes, None]:
+    """Retrieves the report content as a stream of byte chunks.
+
+    :param content_type: The type of report to create.  The report types supported are the same as for `get_report`.
+    :type content_type: AbstractReportRequest
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :param chunk_size: The maximum number of bytes in each chunk, defaults to 1MiB.
+    :type chunk_size: int
+
+    :raises ReportException: Raised when retrieval of a report fails for any reason.
+
+    :return: A generator that is used in an `async for` statement.
+    :rtype: AsyncGenerator[bytes, None]
+    """
+    report = cls.prepare(content_type, wait_timeout_seconds)
+    url = await report._get_report_url()
+    try:
+      async for chunk in iter_download(content_type.client, url, chunk_size):
+        yield chunk
+    except ResponseException:
+      raise ReportException.report_download_fail(url)
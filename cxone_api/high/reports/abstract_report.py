@@ -69,3 +69,11 @@ class AbstractReportRequest:
   def additional_data(self) -> Dict:
     """A property that is optionally implemented by the subclass to return a JSON dictionary."""
     return {}
+
+  @property
+  def cacheable(self) -> bool:
+    """True if the generated report content does not change and can be cached.
+
+    Emailed reports are not cached since generating the report sends the email.  Subclasses return false when
+    the report content reflects the current state of the tenant."""
+    return self.__type != ReportType.EMAIL
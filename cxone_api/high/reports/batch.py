@@ -0,0 +1,79 @@
+from cxone_api.high.reports.abstract_file_format import AbstractReportFileFormat
+from cxone_api.high.reports.exceptions import ReportException
+from cxone_api.high.scheduling import PollScheduler
+from typing import Any, AsyncGenerator, Iterable
+from dataclasses import dataclass
+import asyncio
+
+
+@dataclass(frozen=True)
+class ReportBatchResult:
+  """The outcome of generating one report in a batch."""
+  report : AbstractReportFileFormat
+  content : Any = None
+  exception : BaseException = None
+
+  @property
+  def ok(self) -> bool:
+    """True if the report content was retrieved."""
+    return self.exception is None
+
+
+async def generate_reports(reports : Iterable[AbstractReportFileFormat], submit_concurrency : int = 10,
+                           download_concurrency : int = 4, scheduler : PollScheduler = None) -> AsyncGenerator[ReportBatchResult, None]:
+  """Generates many reports concurrently and yields each result as soon as it has been downloaded.
+
+  Report creation requests are submitted with limited concurrency.  The status of all pending reports is
+  checked by a single `PollScheduler` and each report is downloaded as soon as the server indicates it
+  has been generated.  Failures are returned as results rather than interrupting the batch.
+
+  Example:
+
+    `async for result in generate_reports([PDFReport.prepare(ImprovedScanReport(client, s, p)) for s, p in scans]):`
+
+  :param reports: Report requests created with the `prepare` static method of a report file format class.
+  :type reports: Iterable[AbstractReportFileFormat]
+
+  :param submit_concurrency: The maximum number of report creation requests executing at the same time, defaults to 10.
+  :type submit_concurrency: int, optional
+
+  :param download_concurrency: The maximum number of report downloads executing at the same time, defaults to 4.
+  :type download_concurrency: int, optional
+
+  :param scheduler: The scheduler used to check the status of pending reports.  A new scheduler is used if not provided.
+  :type scheduler: PollScheduler, optional
+
+  :return: A generator that is used in an `async for` statement.
+  :rtype: AsyncGenerator[ReportBatchResult, None]
+  """
+  poller = scheduler if scheduler is not None else PollScheduler()
+  submit_limit = asyncio.Semaphore(max(1, submit_concurrency))
+  download_limit = asyncio.Semaphore(max(1, download_concurrency))
+  results = asyncio.Queue()
+
+  async def generate(report : AbstractReportFileFormat):
+    try:
+      async with submit_limit:
+        report_id = await report._submit()
+
+      try:
+        url = await poller.wait(lambda: report._check_status(report_id), report.timeout_seconds)
+      except asyncio.TimeoutError:
+        raise ReportException.report_gen_timeout(report.content_type.data)
+
+      async with download_limit:
+        await results.put(ReportBatchResult(report, content=await report._download(url)))
+    except asyncio.CancelledError:
+      raise
+    except BaseException as ex:
+      await results.put(ReportBatchResult(report, exception=ex))
+
+  tasks = [asyncio.create_task(generate(r)) for r in reports]
+
+  try:
+    for _ in range(len(tasks)):
+      yield await results.get()
+  finally:
+    for t in tasks:
+      t.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,101 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Callable, Dict, List
+import codecs, csv
+
+
+CsvSchema = Dict[str, Callable[[str], Any]]
+"""A map of CSV column names to functions that convert the column text to a typed value.
+
+Columns that are not in the schema are returned as strings.  Empty column values are returned as None
+for columns in the schema.
+"""
+
+
+async def iter_csv_records(chunks : AsyncIterable[bytes], encoding : str = "utf-8-sig") -> AsyncGenerator[List[str], None]:
+  """Parses CSV records from a stream of byte chunks.
+
+  A record that contains quoted line breaks is assembled from several lines before it is parsed, so only the
+  text of the current record is held in memory.
+
+  :param chunks: An async iterable of the CSV content, such as the generator returned by `iter_report_chunks`.
+  :type chunks: AsyncIterable[bytes]
+
+  :param encoding: The text encoding of the content, defaults to UTF-8 with an optional byte order mark.
+  :type encoding: str
+
+  :return: A generator that is used in an `async for` statement.
+  :rtype: AsyncGenerator[List[str], None]
+  """
+  decoder = codecs.getincrementaldecoder(encoding)()
+  partial = ""
+  record_lines = []
+  quotes = 0
+
+  def complete_lines(text : str):
+    nonlocal partial
+    lines = (partial + text).split("\n")
+    partial = lines.pop()
+    return [line + "\n" for line in lines]
+
+  def add_line(line : str):
+    nonlocal quotes
+    record_lines.append(line)
+    quotes += line.count('"')
+    # An odd number of quotes means a quoted field continues on the next line.
+    if quotes % 2 == 0:
+      record = next(csv.reader(record_lines), [])
+      record_lines.clear()
+      quotes = 0
+      return record
+    return None
+
+  async for chunk in chunks:
+    for line in complete_lines(decoder.decode(chunk)):
+      record = add_line(line)
+      if record:
+        yield record
+
+  lines = complete_lines(decoder.decode(b"", final=True))
+  if len(partial) > 0:
+    lines.append(partial)
+  for line in lines:
+    record = add_line(line)
+    if record:
+      yield record
+
+  if len(record_lines) > 0:
+    record = next(csv.reader(record_lines), [])
+    if record:
+      yield record
+
+
+def _convert(value : str, converter : Callable[[str], Any]) -> Any:
+  return None if len(value) == 0 else converter(value)
+
+
+async def iter_csv_dicts(chunks : AsyncIterable[bytes], schema : CsvSchema = None,
+                         encoding : str = "utf-8-sig") -> AsyncGenerator[Dict[str, Any], None]:
+  """Parses CSV records from a stream of byte chunks into dictionaries keyed by the column names in the header row.
+
+  :param chunks: An async iterable of the CSV content, such as the generator returned by `iter_report_chunks`.
+  :type chunks: AsyncIterable[bytes]
+
+  :param schema: Converters for typed columns, defaults to returning all columns as strings.
+  :type schema: CsvSchema, optional
+
+  :param encoding: The text encoding of the content, defaults to UTF-8 with an optional byte order mark.
+  :type encoding: str
+
+  :return: A generator that is used in an `async for` statement.
+  :rtype: AsyncGenerator[Dict[str, Any], None]
+  """
+  header = None
+  converters = None
+
+  async for record in iter_csv_records(chunks, encoding):
+    if header is None:
+      header = record
+      converters = [None if schema is None else schema.get(name, None) for name in header]
+      continue
+
+    yield {name : (value if converter is None else _convert(value, converter))
+           for name, value, converter in zip(header, record, converters)}
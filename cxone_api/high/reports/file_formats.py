@@ -1,8 +1,11 @@
 from cxone_api.high.reports.abstract_file_format import AbstractReportFileFormat
 from cxone_api.high.reports.report_contents import *
 from cxone_api.high.reports.exceptions import ReportException
-from typing import Union, Dict
-from requests import get
+from cxone_api.high.reports.csv_stream import CsvSchema, iter_csv_records, iter_csv_dicts
+from cxone_api.high.artifact_cache import ArtifactCache
+from typing import Any, AsyncGenerator, Union, Dict, List
+from cxone_api.transfer import get_url, DEFAULT_CHUNK_SIZE
+import json
 
 
 class PDFReport(AbstractReportFileFormat):
@@ -12,7 +15,7 @@ class PDFReport(AbstractReportFileFormat):
      in PDF format.
   """
   @staticmethod
-  async def get_report(content_type : Union[ImprovedScanReport, LegacyScanReport, ProjectReport], wait_timeout_seconds : int=300) -> bytearray:
+  async def get_report(content_type : Union[ImprovedScanReport, LegacyScanReport, ProjectReport], wait_timeout_seconds : int=300, cache : ArtifactCache=None) -> bytearray:
     """Retrieves the PDF report content.
 
     :param content_type: The type of report to create.
@@ -21,21 +24,45 @@ class PDFReport(AbstractReportFileFormat):
     :param wait_timeout_seconds: The number of seconds to wait for the server to render the report.
     :type wait_timeout_seconds: int
 
+    :param cache: A cache used to retrieve previously generated report content.  Content is cached only if the
+                  report request is cacheable.  Defaults to no caching.
+    :type cache: ArtifactCache, optional
+
     :raises ReportException: Raised when retrieval of a report fails for any reason.
     
     :return: A bytearray representing the PDF.  The contents of the bytearray can be written to a file to persist the PDF.
     :rtype: bytearray
     """
+    return await PDFReport.prepare(content_type, wait_timeout_seconds)._get_cached_report(cache)
+
+  @staticmethod
+  def prepare(content_type : Union[ImprovedScanReport, LegacyScanReport, ProjectReport], wait_timeout_seconds : int=300) -> "PDFReport":
+    """Creates a report request that has not yet been submitted, suitable for use with `generate_reports`.
+
+    :param content_type: The type of report to create.
+    :type content_type: Union[ImprovedScanReport, LegacyScanReport, ProjectReport]
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :rtype: PDFReport
+    """
     assert(type(content_type) in [ImprovedScanReport, LegacyScanReport, ProjectReport])
-    return await (PDFReport("pdf", content_type, wait_timeout_seconds))._get_report()
+    return PDFReport("pdf", content_type, wait_timeout_seconds)
 
   async def _download(self, url : str) -> bytearray:
-    resp = await self.content_type.client.exec_request(get, url=url)
+    resp = await get_url(self.content_type.client, url)
     if resp.ok:
       return resp.content
     else:
       raise ReportException.report_download_fail(url)
 
+  def _serialize(self, content : bytearray) -> bytes:
+    return bytes(content)
+
+  def _deserialize(self, data : bytes) -> bytearray:
+    return data
+
 class CSVReport(AbstractReportFileFormat):
   """Downloads the requested report content in a CSV format.
   
@@ -43,7 +70,7 @@ class CSVReport(AbstractReportFileFormat):
      in CSV format.
   """
   @staticmethod
-  async def get_report(content_type : Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList], wait_timeout_seconds : int=300) -> str:
+  async def get_report(content_type : Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList], wait_timeout_seconds : int=300, cache : ArtifactCache=None) -> str:
     """Retrieves the CSV report content.
 
     :param content_type: The type of report to create.
@@ -52,21 +79,101 @@ class CSVReport(AbstractReportFileFormat):
     :param wait_timeout_seconds: The number of seconds to wait for the server to render the report.
     :type wait_timeout_seconds: int
 
+    :param cache: A cache used to retrieve previously generated report content.  Content is cached only if the
+                  report request is cacheable.  Defaults to no caching.
+    :type cache: ArtifactCache, optional
+
     :raises ReportException: Raised when retrieval of a report fails for any reason.
     
     :return: A string representing the CSV.
     :rtype: str
     """
+    return await CSVReport.prepare(content_type, wait_timeout_seconds)._get_cached_report(cache)
+
+  @staticmethod
+  def prepare(content_type : Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList], wait_timeout_seconds : int=300) -> "CSVReport":
+    """Creates a report request that has not yet been submitted, suitable for use with `generate_reports`.
+
+    :param content_type: The type of report to create.
+    :type content_type: Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList]
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :rtype: CSVReport
+    """
     assert(type(content_type) in [ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList])
-    return await (CSVReport("csv", content_type, wait_timeout_seconds))._get_report()
+    return CSVReport("csv", content_type, wait_timeout_seconds)
+
+  @staticmethod
+  async def iter_rows(content_type : Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList], wait_timeout_seconds : int=300,
+                      chunk_size : int=DEFAULT_CHUNK_SIZE) -> AsyncGenerator[List[str], None]:
+    """Retrieves the CSV report content as a stream of parsed rows, including the header row.
+
+    The report is parsed as it is downloaded; the entire report content is never held in memory.
+
+    :param content_type: The type of report to create.
+    :type content_type: Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList]
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :param chunk_size: The maximum number of bytes downloaded at a time, defaults to 1MiB.
+    :type chunk_size: int
+
+    :raises ReportException: Raised when retrieval of a report fails for any reason.
+
+    :return: A generator that is used in an `async for` statement.
+    :rtype: AsyncGenerator[List[str], None]
+    """
+    async for row in iter_csv_records(CSVReport.iter_report_chunks(content_type, wait_timeout_seconds, chunk_size)):
+      yield row
+
+  @staticmethod
+  async def iter_dicts(content_type : Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList], wait_timeout_seconds : int=300,
+                       schema : CsvSchema=None, chunk_size : int=DEFAULT_CHUNK_SIZE) -> AsyncGenerator[Dict[str, Any], None]:
+    """Retrieves the CSV report content as a stream of dictionaries keyed by the column names in the header row.
+
+    The report is parsed as it is downloaded; the entire report content is never held in memory.
+
+    Example:
+
+      `async for scan in CSVReport.iter_dicts(ScanList(client, project_id), schema={"Total Vulnerabilities" : int}):`
+
+    :param content_type: The type of report to create.
+    :type content_type: Union[ImprovedScanReport, LegacyScanReport, ApplicationList, ProjectList, ScanList]
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :param schema: A map of column names to functions that convert the column text to a typed value.  Columns not
+                   in the schema are returned as strings.  Defaults to returning all columns as strings.
+    :type schema: CsvSchema, optional
+
+    :param chunk_size: The maximum number of bytes downloaded at a time, defaults to 1MiB.
+    :type chunk_size: int
+
+    :raises ReportException: Raised when retrieval of a report fails for any reason.
+
+    :return: A generator that is used in an `async for` statement.
+    :rtype: AsyncGenerator[Dict[str, Any], None]
+    """
+    async for row in iter_csv_dicts(CSVReport.iter_report_chunks(content_type, wait_timeout_seconds, chunk_size), schema):
+      yield row
 
   async def _download(self, url : str) -> str:
-    resp = await self.content_type.client.exec_request(get, url=url)
+    resp = await get_url(self.content_type.client, url)
     if resp.ok:
       return resp.text
     else:
       raise ReportException.report_download_fail(url)
 
+  def _serialize(self, content : str) -> bytes:
+    return content.encode("utf-8")
+
+  def _deserialize(self, data : bytes) -> str:
+    return data.decode("utf-8")
+
 class JSONReport(AbstractReportFileFormat):
   """Downloads the requested report content in a JSON format.
   
@@ -75,7 +182,7 @@ class JSONReport(AbstractReportFileFormat):
   """
 
   @staticmethod
-  async def get_report(content_type : Union[ImprovedScanReport, LegacyScanReport, ProjectReport], wait_timeout_seconds : int=300) -> Dict:
+  async def get_report(content_type : Union[ImprovedScanReport, LegacyScanReport, ProjectReport], wait_timeout_seconds : int=300, cache : ArtifactCache=None) -> Dict:
     """Retrieves the JSON report content.
 
     :param content_type: The type of report to create.
@@ -84,17 +191,41 @@ class JSONReport(AbstractReportFileFormat):
     :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
     :type wait_timeout_seconds: int
 
+    :param cache: A cache used to retrieve previously generated report content.  Content is cached only if the
+                  report request is cacheable.  Defaults to no caching.
+    :type cache: ArtifactCache, optional
+
     :raises ReportException: Raised when retrieval of a report fails for any reason.
     
     :return: A dictionary representing the JSON report content.
     :rtype: dict
     """
+    return await JSONReport.prepare(content_type, wait_timeout_seconds)._get_cached_report(cache)
+
+  @staticmethod
+  def prepare(content_type : Union[ImprovedScanReport, LegacyScanReport, ProjectReport], wait_timeout_seconds : int=300) -> "JSONReport":
+    """Creates a report request that has not yet been submitted, suitable for use with `generate_reports`.
+
+    :param content_type: The type of report to create.
+    :type content_type: Union[ImprovedScanReport, LegacyScanReport, ProjectReport]
+
+    :param wait_timeout_seconds: The number of seconds to wait for the server to render the report, defaults to 300.
+    :type wait_timeout_seconds: int
+
+    :rtype: JSONReport
+    """
     assert(type(content_type) in [ImprovedScanReport, LegacyScanReport, ProjectReport])
-    return await (JSONReport("json", content_type, wait_timeout_seconds))._get_report()
+    return JSONReport("json", content_type, wait_timeout_seconds)
 
   async def _download(self, url : str) -> Dict:
-    resp = await self.content_type.client.exec_request(get, url=url)
+    resp = await get_url(self.content_type.client, url)
     if resp.ok:
       return resp.json()
     else:
       raise ReportException.report_download_fail(url)
+
+  def _serialize(self, content : Dict) -> bytes:
+    return json.dumps(content).encode("utf-8")
+
+  def _deserialize(self, data : bytes) -> Dict:
+    return json.loads(data)
@@ -3,6 +3,7 @@ from cxone_api.high.reports.abstract_report import AbstractReportRequest
 from enum import Enum
 from typing import List, Dict, Union
 from aenum import MultiValueEnum
+from datetime import date
 
 class Scanners(MultiValueEnum):
   """An enumeration of types of scan engines."""
@@ -147,6 +148,16 @@ class ProjectReport(AbstractReportRequest):
     self.__from = from_date
     self.__to = to_date
 
+  @property
+  def cacheable(self) -> bool:
+    """False if the report date range ends today or later, since the content changes as scans are executed."""
+    try:
+      ends_before_today = date.fromisoformat(str(self.__to)[:10]) < date.today()
+    except ValueError:
+      ends_before_today = False
+
+    return super().cacheable and ends_before_today
+
   @property
   def additional_data(self) -> Dict:
     additional = {
@@ -184,6 +195,11 @@ class ApplicationList(AbstractReportRequest):
     """
     super().__init__(client, "application-list", **kwargs)
 
+  @property
+  def cacheable(self) -> bool:
+    """Always false since the list reflects the current state of the tenant."""
+    return False
+
   @property
   def data(self) -> Dict:
     data_dict = {
@@ -210,6 +226,11 @@ class ProjectList(AbstractReportRequest):
     super().__init__(client, "project-list", **kwargs)
     self.__project_ids = project_ids if project_ids is not None else ""
 
+  @property
+  def cacheable(self) -> bool:
+    """Always false since the list reflects the current state of the tenant."""
+    return False
+
   @property
   def data(self) -> Dict:
     data_dict = {
@@ -239,6 +260,11 @@ class ScanList(AbstractReportRequest):
     self.__project_id = project_id
     self.__branch = branch_name
 
+  @property
+  def cacheable(self) -> bool:
+    """Always false since the list reflects the current state of the tenant."""
+    return False
+
   @property
   def data(self) -> Dict:
     data_dict = {
@@ -1,4 +1,9 @@
-from .report import ScaReportType, ScaReportParameters, ScaReportOptions, get_sca_report
+from .report import ScaReportType, ScaReportParameters, ScaReportOptions, get_sca_report, get_sca_report_content, sca_export_cache_key
 from .analysis.tenant_packages import ScaTenantPackages
 from .analysis.tenant_risks import ScaTenantRisks
-from .analysis.tenant_licenses import ScaTenantLicenses
\ No newline at end of file
+from .analysis.tenant_licenses import ScaTenantLicenses
+from .analysis.columnar import ScaColumnarTable, ScaGroupBy
+from .analysis.batch import ScaGQLBatchExecutor
+from .analysis.partitioned import ScaPartitionKey, partitioned_query
+from .analysis.records import ScaRecord, StringInternTable, record_type
+from .export import ScaExportManager, ScaExportResult
\ No newline at end of file
@@ -1,7 +1,9 @@
 from cxone_api import CxOneClient
-from typing import Dict, List
+from typing import AsyncGenerator, Dict, List
 from requests.compat import urljoin
 from .iterators import where_iterator, ordered_iterator
+from .batch import ScaGQLBatchExecutor
+from .records import ScaRecord, compact_records
 
 class ResultOrder:
   """A class used to build GraphQL ordering directives."""
@@ -41,7 +43,11 @@ class ResultOrder:
 class AbstractScaGQLQuery:
   """The abstract implementation for an SCA analysis query using GraphQL."""
 
-  def __init__(self, client : CxOneClient, page_size : int = 500, page_retries_max : int = 5, page_retry_delay_s : int = 3):
+  # Subclasses set the query text on the class so it can be inspected without an instance.
+  _QUERY_TEXT : str = None
+
+  def __init__(self, client : CxOneClient, page_size : int = 500, page_retries_max : int = 5, page_retry_delay_s : int = 3,
+               batch_executor : ScaGQLBatchExecutor = None):
     """GraphQL query class instances function as asynchronous iterators.
     
     :param client: The CxOneClient instance used to communicate with Checkmarx One
@@ -55,15 +61,29 @@ class AbstractScaGQLQuery:
 
     :param page_retry_delay_s: The number of seconds to wait between each retry attempt, defaults to 3.
     :type page_retry_delay_s: int
+
+    :param batch_executor: An executor that combines page requests from multiple queries into a single API call, defaults to None.
+    :type batch_executor: ScaGQLBatchExecutor, optional
     """
     self.__client = client
     self.__page_size = page_size
     self.__retries = page_retries_max
     self.__retry_delay = page_retry_delay_s
+    self.__batch_executor = batch_executor
 
   def __aiter__(self):
     raise NotImplementedError("__aiter__")
 
+  def records(self) -> AsyncGenerator[ScaRecord, None]:
+    """Iterates the query results as compact, read-only records rather than dictionaries.
+
+    Records use a fixed set of slots for the fields selected by the query and share repeated string values.
+
+    :return: A generator that is used in an `async for` statement.
+    :rtype: AsyncGenerator[ScaRecord, None]
+    """
+    return compact_records(self)
+
   @property
   def _retries(self) -> int:
     return self.__retries
@@ -72,6 +92,10 @@ class AbstractScaGQLQuery:
   def _retry_delay(self) -> int:
     return self.__retry_delay
   
+  @property
+  def _batch_executor(self) -> ScaGQLBatchExecutor:
+    return self.__batch_executor
+
   @property
   def _client(self) -> CxOneClient:
     return self.__client
@@ -86,7 +110,9 @@ class AbstractScaGQLQuery:
   
   @property
   def _query(self) -> str:
-    raise NotImplementedError("query")
+    if self._QUERY_TEXT is None:
+      raise NotImplementedError("query")
+    return self._QUERY_TEXT
 
   @property
   def _result_element(self) -> str:
@@ -126,7 +152,8 @@ class AbstractScaGQLWhereQuery(AbstractScaGQLQuery):
                           element_name=self._result_element,
                           page_size=self._page_size,
                           page_retries_max=self._retries,
-                          page_retry_delay_s=self._retry_delay)
+                          page_retry_delay_s=self._retry_delay,
+                          executor=self._batch_executor)
 
 
 class AbstractScaGQLOrderQuery(AbstractScaGQLWhereQuery):
@@ -151,4 +178,5 @@ class AbstractScaGQLOrderQuery(AbstractScaGQLWhereQuery):
                           element_name=self._result_element,
                           page_size=self._page_size,
                           page_retries_max=self._retries,
-                          page_retry_delay_s=self._retry_delay)
+                          page_retry_delay_s=self._retry_delay,
+                          executor=self._batch_executor)
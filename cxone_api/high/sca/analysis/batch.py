@@ -0,0 +1,172 @@
+from cxone_api import CxOneClient
+from cxone_api.util import json_on_ok
+from cxone_api.exceptions import ResponseException
+from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from requests import post
+from requests.compat import urljoin
+import asyncio, re
+
+
+_QUERY_PATTERN = re.compile(r"^\s*query\s*\((?P<vars>[^)]*)\)\s*\{(?P<body>.*)\}\s*$", re.DOTALL)
+_VARIABLE_PATTERN = re.compile(r"\$(\w+)")
+_ROOT_FIELD_PATTERN = re.compile(r"^\s*(\w+)")
+
+
+def alias_query(query : str, alias : str) -> Tuple[str, str]:
+  """Rewrites a single-selection GraphQL query so it can be combined with other queries in one document.
+
+  Variables are renamed with the alias as a prefix and the root field is given the alias.
+
+  :param query: A GraphQL query document in the form used by the SCA analysis query classes.
+  :type query: str
+
+  :param alias: The alias assigned to the root field of the query.
+  :type alias: str
+
+  :return: A tuple of the variable declarations and the aliased selection.
+  :rtype: Tuple[str, str]
+  """
+  m = _QUERY_PATTERN.match(query)
+  if m is None:
+    raise ValueError("The query is not in a format that can be batched.")
+
+  rename = lambda v: f"${alias}_{v.group(1)}"
+  var_decls = _VARIABLE_PATTERN.sub(rename, m.group("vars")).strip()
+  selection = _VARIABLE_PATTERN.sub(rename, m.group("body"))
+  selection = _ROOT_FIELD_PATTERN.sub(f"{alias}: \\1", selection, count=1)
+
+  return var_decls, selection.strip()
+
+
+@dataclass(frozen=True)
+class _PendingSelection:
+  query : str
+  variables : Dict
+  element_name : str
+  future : asyncio.Future
+
+
+class ScaGQLBatchExecutor:
+  """Combines concurrent SCA analysis GraphQL page requests into a single request.
+
+  Pass an instance to the `batch_executor` parameter of one or more SCA analysis query instances.  Page requests
+  issued by the query iterators within `linger_s` seconds of each other (up to `max_batch_size` requests) are sent
+  as one GraphQL document with each query selection given a unique alias.  The results are then returned
+  to the iterator that requested each page.
+  """
+
+  def __init__(self, client : CxOneClient, max_batch_size : int = 10, linger_s : float = 0.05):
+    """
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param max_batch_size: The maximum number of query selections to send in a single request, defaults to 10.
+    :type max_batch_size: int
+
+    :param linger_s: The number of seconds to wait for additional requests before sending a batch, defaults to 0.05.
+    :type linger_s: float
+    """
+    self.__client = client
+    self.__max = max(1, max_batch_size)
+    self.__linger = linger_s
+    self.__pending = []
+    self.__timer = None
+    self.__tasks = set()
+    self.__round_trips = 0
+
+  @property
+  def round_trips(self) -> int:
+    """The number of GraphQL requests sent by this executor."""
+    return self.__round_trips
+
+  @property
+  def _gql_endpoint_url(self) -> str:
+    return urljoin(self.__client.api_endpoint, "/api/sca/graphql/graphql")
+
+  async def execute(self, query : str, variables : Dict, element_name : str) -> List[Dict]:
+    """Queues a query for execution in the next batch and returns the list of results for the query.
+
+    :param query: The GraphQL query document.
+    :type query: str
+
+    :param variables: The query variables.
+    :type variables: Dict
+
+    :param element_name: The name of the root element of the query results.
+    :type element_name: str
+
+    :raises ResponseException: Raised if the response did not contain results for the query.
+
+    :rtype: List[Dict]
+    """
+    loop = asyncio.get_running_loop()
+    pending = _PendingSelection(query, variables, element_name, loop.create_future())
+    self.__pending.append(pending)
+
+    if len(self.__pending) >= self.__max:
+      self.__flush()
+    elif self.__timer is None:
+      self.__timer = loop.call_later(self.__linger, self.__flush)
+
+    return await pending.future
+
+  def __flush(self):
+    if self.__timer is not None:
+      self.__timer.cancel()
+      self.__timer = None
+
+    batch, self.__pending = self.__pending, []
+
+    if len(batch) > 0:
+      task = asyncio.get_running_loop().create_task(self.__send(batch))
+      self.__tasks.add(task)
+      task.add_done_callback(self.__tasks.discard)
+
+  @staticmethod
+  def _compose(batch : List[_PendingSelection]) -> Dict:
+    declarations = []
+    selections = []
+    variables = {}
+
+    for index, pending in enumerate(batch):
+      alias = f"q{index}"
+      var_decls, selection = alias_query(pending.query, alias)
+      declarations.append(var_decls)
+      selections.append(selection)
+      variables.update({f"{alias}_{k}" : v for k, v in pending.variables.items()})
+
+    newline = "\n"
+    return {
+      "query" : f"query ({newline.join(declarations)}) {{{newline}{newline.join(selections)}{newline}}}",
+      "variables" : variables
+    }
+
+  async def __send(self, batch : List[_PendingSelection]) -> None:
+    try:
+      self.__round_trips += 1
+      resp_json = json_on_ok(await self.__client.exec_request(post, url=self._gql_endpoint_url,
+                                                              json=ScaGQLBatchExecutor._compose(batch)))
+
+      data = resp_json.get("data", None) or {}
+      errors = {}
+      for err in resp_json.get("errors", None) or []:
+        path = err.get("path", None) or [None]
+        errors.setdefault(path[0], []).append(err.get("message", ""))
+
+      for index, pending in enumerate(batch):
+        alias = f"q{index}"
+        result = data.get(alias, None)
+        if pending.future.done():
+          continue
+        elif result is None:
+          pending.future.set_exception(ResponseException(f"No results returned for {pending.element_name}: "
+                                                         f"{errors.get(alias, errors.get(None, []))}"))
+        else:
+          pending.future.set_result(result)
+    except BaseException as ex:
+      for pending in batch:
+        if not pending.future.done():
+          pending.future.set_exception(ex)
+      if isinstance(ex, asyncio.CancelledError):
+        raise
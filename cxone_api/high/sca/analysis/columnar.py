@@ -0,0 +1,482 @@
+from array import array
+from collections import Counter, defaultdict
+from typing import Any, AsyncIterable, Callable, Dict, Iterable, List, Tuple, Union
+import heapq, itertools, math
+
+
+class _Column:
+  """The abstract implementation of a column of values."""
+
+  def __len__(self):
+    raise NotImplementedError("__len__")
+
+  def take(self, indices : List[int]):
+    raise NotImplementedError("take")
+
+  def value_at(self, index : int) -> Any:
+    raise NotImplementedError("value_at")
+
+  def values(self) -> List[Any]:
+    return [self.value_at(i) for i in range(len(self))]
+
+  def group_keys(self) -> Iterable:
+    """Returns one hashable key per row used for grouping."""
+    return self.values()
+
+  def decode_key(self, key : Any) -> Any:
+    return key
+
+  def mask(self, predicate : Union[Any, Callable[[Any], bool]]) -> Iterable[bool]:
+    if callable(predicate):
+      return [bool(predicate(v)) for v in self.values()]
+    return [v == predicate for v in self.values()]
+
+  def numbers(self) -> Iterable[float]:
+    raise TypeError(f"Column of type {type(self).__name__} is not numeric.")
+
+
+class _NumericColumn(_Column):
+  # Missing values are stored as NaN; integral columns decode their values back to int.
+  def __init__(self, data : array, integral : bool):
+    self.__data = data
+    self.__integral = integral
+
+  @staticmethod
+  def from_values(values : List[Any], integral : bool = False):
+    return _NumericColumn(array('d', (math.nan if v is None else float(v) for v in values)), integral)
+
+  def __len__(self):
+    return len(self.__data)
+
+  def take(self, indices : List[int]):
+    data = self.__data
+    return _NumericColumn(array('d', (data[i] for i in indices)), self.__integral)
+
+  def value_at(self, index : int) -> Any:
+    v = self.__data[index]
+    if math.isnan(v):
+      return None
+    return int(v) if self.__integral else v
+
+  def numbers(self) -> Iterable[float]:
+    return self.__data
+
+
+class _BoolColumn(_Column):
+  # Unknown values are stored as -1 so they never compare equal to True or False.
+  def __init__(self, data : array):
+    self.__data = data
+
+  @staticmethod
+  def from_values(values : List[Any]):
+    return _BoolColumn(array('b', (-1 if v is None else int(bool(v)) for v in values)))
+
+  def __len__(self):
+    return len(self.__data)
+
+  def take(self, indices : List[int]):
+    data = self.__data
+    return _BoolColumn(array('b', (data[i] for i in indices)))
+
+  def value_at(self, index : int) -> Any:
+    v = self.__data[index]
+    return None if v < 0 else bool(v)
+
+  def group_keys(self) -> Iterable:
+    return self.__data
+
+  def decode_key(self, key : Any) -> Any:
+    return None if key < 0 else bool(key)
+
+  def mask(self, predicate : Union[Any, Callable[[Any], bool]]) -> Iterable[bool]:
+    if callable(predicate):
+      return super().mask(predicate)
+    target = -1 if predicate is None else int(bool(predicate))
+    return [v == target for v in self.__data]
+
+  def numbers(self) -> Iterable[float]:
+    return [math.nan if v < 0 else float(v) for v in self.__data]
+
+
+class _CategoryColumn(_Column):
+  # Dictionary encoded strings; each row stores an integer code into the category list.
+  def __init__(self, codes : array, categories : List[str], index : Dict[str, int]):
+    self.__codes = codes
+    self.__categories = categories
+    self.__index = index
+
+  @staticmethod
+  def from_values(values : List[Any]):
+    index = {}
+    categories = []
+    codes = array('l')
+    for v in values:
+      if v is None:
+        codes.append(-1)
+        continue
+      code = index.get(v)
+      if code is None:
+        code = index[v] = len(categories)
+        categories.append(v)
+      codes.append(code)
+    return _CategoryColumn(codes, categories, index)
+
+  def __len__(self):
+    return len(self.__codes)
+
+  def take(self, indices : List[int]):
+    codes = self.__codes
+    return _CategoryColumn(array('l', (codes[i] for i in indices)), self.__categories, self.__index)
+
+  def value_at(self, index : int) -> Any:
+    code = self.__codes[index]
+    return None if code < 0 else self.__categories[code]
+
+  def group_keys(self) -> Iterable:
+    return self.__codes
+
+  def decode_key(self, key : Any) -> Any:
+    return None if key < 0 else self.__categories[key]
+
+  def mask(self, predicate : Union[Any, Callable[[Any], bool]]) -> Iterable[bool]:
+    if callable(predicate):
+      # Evaluate the predicate once per distinct value rather than once per row.
+      accepted = {code for code, v in enumerate(self.__categories) if predicate(v)}
+      if -1 in self.__codes and predicate(None):
+        accepted.add(-1)
+    else:
+      accepted = {-1} if predicate is None else {self.__index.get(predicate, -2)}
+    return [c in accepted for c in self.__codes]
+
+
+class _MultiValueColumn(_Column):
+  # Holds list values such as applicationIds; grouping explodes each row into its members.
+  def __init__(self, data : List[Tuple]):
+    self.__data = data
+
+  @staticmethod
+  def from_values(values : List[Any]):
+    return _MultiValueColumn([() if v is None else tuple(v) for v in values])
+
+  def __len__(self):
+    return len(self.__data)
+
+  def take(self, indices : List[int]):
+    data = self.__data
+    return _MultiValueColumn([data[i] for i in indices])
+
+  def value_at(self, index : int) -> Any:
+    return list(self.__data[index])
+
+  def group_keys(self) -> Iterable:
+    return self.__data
+
+  def mask(self, predicate : Union[Any, Callable[[Any], bool]]) -> Iterable[bool]:
+    if callable(predicate):
+      return [bool(predicate(list(v))) for v in self.__data]
+    return [predicate in v for v in self.__data]
+
+
+class _ObjectColumn(_Column):
+  def __init__(self, data : List[Any]):
+    self.__data = data
+
+  def __len__(self):
+    return len(self.__data)
+
+  def take(self, indices : List[int]):
+    data = self.__data
+    return _ObjectColumn([data[i] for i in indices])
+
+  def value_at(self, index : int) -> Any:
+    return self.__data[index]
+
+  def values(self) -> List[Any]:
+    return list(self.__data)
+
+
+def _make_column(values : List[Any]) -> _Column:
+  kinds = {type(v) for v in values if v is not None}
+
+  if len(kinds) == 0 or kinds == {str}:
+    return _CategoryColumn.from_values(values)
+  elif kinds == {bool}:
+    return _BoolColumn.from_values(values)
+  elif kinds == {int}:
+    return _NumericColumn.from_values(values, integral=True)
+  elif kinds <= {int, float}:
+    return _NumericColumn.from_values(values)
+  elif kinds <= {list, tuple}:
+    return _MultiValueColumn.from_values(values)
+  else:
+    return _ObjectColumn(list(values))
+
+
+def _row_value(row : Any, field : str) -> Any:
+  return row.get(field, None) if isinstance(row, dict) else getattr(row, field, None)
+
+
+class ScaGroupBy:
+  """The result of grouping a ScaColumnarTable by one or more fields.
+
+  Aggregation methods return a dictionary keyed by the group value.  When grouping by
+  more than one field, the key is a tuple of values in the order the fields were given.
+  """
+
+  def __init__(self, table : "ScaColumnarTable", fields : List[str]):
+    self.__table = table
+    self.__columns = [table._column(f) for f in fields]
+
+  def __row_keys(self) -> List[Tuple[int, Any]]:
+    # Produces (row index, encoded key) pairs, exploding multi-value columns.
+    if len(self.__columns) == 1:
+      col = self.__columns[0]
+      if isinstance(col, _MultiValueColumn):
+        return [(i, v) for i, members in enumerate(col.group_keys()) for v in members]
+      return list(enumerate(col.group_keys()))
+
+    per_column = []
+    for col in self.__columns:
+      if isinstance(col, _MultiValueColumn):
+        per_column.append(col.group_keys())
+      else:
+        per_column.append([(k,) for k in col.group_keys()])
+
+    return [(i, combo) for i, row in enumerate(zip(*per_column)) for combo in itertools.product(*row)]
+
+  def __decode(self, key : Any) -> Any:
+    if len(self.__columns) == 1:
+      return self.__columns[0].decode_key(key)
+    return tuple(col.decode_key(k) for col, k in zip(self.__columns, key))
+
+  def count(self) -> Dict[Any, int]:
+    """Counts the number of rows in each group.
+
+    :rtype: Dict[Any, int]
+    """
+    if len(self.__columns) == 1 and not isinstance(self.__columns[0], _MultiValueColumn):
+      counts = Counter(self.__columns[0].group_keys())
+    else:
+      counts = Counter(k for _, k in self.__row_keys())
+
+    return {self.__decode(k) : v for k, v in counts.items()}
+
+  def sum(self, field : str, weight : str = None) -> Dict[Any, float]:
+    """Sums a numeric field for each group.  Missing values are ignored.
+
+    :param field: The name of the numeric field to sum.
+    :type field: str
+
+    :param weight: The name of a numeric field used to weight each value, defaults to None.
+    :type weight: str, optional
+
+    :rtype: Dict[Any, float]
+    """
+    values = self.__table._column(field).numbers()
+    if weight is not None:
+      values = [v * w for v, w in zip(values, self.__table._column(weight).numbers())]
+
+    totals = defaultdict(float)
+    for i, k in self.__row_keys():
+      v = values[i]
+      if not math.isnan(v):
+        totals[k] += v
+
+    return {self.__decode(k) : v for k, v in totals.items()}
+
+  def mean(self, field : str) -> Dict[Any, float]:
+    """Computes the mean of a numeric field for each group.  Missing values are ignored.
+
+    :param field: The name of the numeric field.
+    :type field: str
+
+    :rtype: Dict[Any, float]
+    """
+    values = self.__table._column(field).numbers()
+    totals = defaultdict(float)
+    counts = defaultdict(int)
+    for i, k in self.__row_keys():
+      v = values[i]
+      if not math.isnan(v):
+        totals[k] += v
+        counts[k] += 1
+
+    return {self.__decode(k) : totals[k] / counts[k] for k in totals.keys()}
+
+  def max(self, field : str) -> Dict[Any, float]:
+    """Finds the maximum value of a numeric field for each group.  Missing values are ignored.
+
+    :param field: The name of the numeric field.
+    :type field: str
+
+    :rtype: Dict[Any, float]
+    """
+    values = self.__table._column(field).numbers()
+    found = {}
+    for i, k in self.__row_keys():
+      v = values[i]
+      if not math.isnan(v) and (k not in found or v > found[k]):
+        found[k] = v
+
+    return {self.__decode(k) : v for k, v in found.items()}
+
+
+class ScaColumnarTable:
+  """An in-memory, column oriented table for local analysis of SCA analysis query results.
+
+  Each field is stored as a typed column: strings are dictionary encoded as integer codes,
+  numbers are stored in a `float` array, and booleans in a compact byte array.  Filtering and
+  grouping operate on the encoded columns so that repeated aggregations over large result
+  sets avoid re-walking the result dictionaries.
+
+  Use the `from_query` or `from_rows` static methods to create an instance.
+  """
+
+  def __init__(self, columns : Dict[str, _Column], row_count : int):
+    self.__columns = columns
+    self.__count = row_count
+
+  @staticmethod
+  def from_rows(rows : Iterable[Any], fields : List[str]) -> "ScaColumnarTable":
+    """Creates a table from a collection of result rows.
+
+    :param rows: Result dictionaries or records as produced by the SCA analysis query iterators.
+    :type rows: Iterable[Any]
+
+    :param fields: The names of the fields to load into columns.
+    :type fields: List[str]
+
+    :rtype: ScaColumnarTable
+    """
+    raw = {f : [] for f in fields}
+    count = 0
+    for row in rows:
+      count += 1
+      for f in fields:
+        raw[f].append(_row_value(row, f))
+
+    return ScaColumnarTable({f : _make_column(v) for f, v in raw.items()}, count)
+
+  @staticmethod
+  async def from_query(query : AsyncIterable, fields : List[str]) -> "ScaColumnarTable":
+    """Creates a table by consuming all results from an SCA analysis query.
+
+    :param query: An SCA analysis query instance such as ScaTenantRisks.
+    :type query: AsyncIterable
+
+    :param fields: The names of the fields to load into columns.
+    :type fields: List[str]
+
+    :rtype: ScaColumnarTable
+    """
+    # Only the field values are retained while the query is consumed, not the result rows.
+    raw = {f : [] for f in fields}
+    count = 0
+    async for row in query:
+      count += 1
+      for f in fields:
+        raw[f].append(_row_value(row, f))
+
+    return ScaColumnarTable({f : _make_column(v) for f, v in raw.items()}, count)
+
+  def __len__(self):
+    return self.__count
+
+  def _column(self, field : str) -> _Column:
+    if field not in self.__columns.keys():
+      raise KeyError(field)
+    return self.__columns[field]
+
+  @property
+  def fields(self) -> List[str]:
+    """The names of the fields loaded in the table."""
+    return list(self.__columns.keys())
+
+  def column(self, field : str) -> List[Any]:
+    """Returns the decoded values of a column.
+
+    :param field: The name of the field.
+    :type field: str
+
+    :rtype: List[Any]
+    """
+    return self._column(field).values()
+
+  def rows(self) -> Iterable[Dict]:
+    """Iterates over the rows of the table as dictionaries.
+
+    :rtype: Iterable[Dict]
+    """
+    for i in range(self.__count):
+      yield {f : c.value_at(i) for f, c in self.__columns.items()}
+
+  def take(self, indices : List[int]) -> "ScaColumnarTable":
+    """Returns a new table containing the rows at the given indices.
+
+    :param indices: Row indices in the order they will appear in the new table.
+    :type indices: List[int]
+
+    :rtype: ScaColumnarTable
+    """
+    return ScaColumnarTable({f : c.take(indices) for f, c in self.__columns.items()}, len(indices))
+
+  def where(self, mask : Iterable[bool]) -> "ScaColumnarTable":
+    """Returns a new table containing rows where the mask is true.
+
+    :param mask: One boolean value per row.
+    :type mask: Iterable[bool]
+
+    :rtype: ScaColumnarTable
+    """
+    return self.take(list(itertools.compress(range(self.__count), mask)))
+
+  def filter(self, **conditions : Union[Any, Callable[[Any], bool]]) -> "ScaColumnarTable":
+    """Returns a new table containing rows that match all of the given conditions.
+
+    Each keyword names a field.  The value is either a value compared for equality or a
+    callable predicate evaluated with the field value.  For list fields such as `applicationIds`,
+    a non-callable value matches rows where the list contains the value.
+
+    Example: `table.filter(isExploitable=True, isFixAvailable=True, epss=lambda x: x is not None and x > 0.5)`
+
+    :rtype: ScaColumnarTable
+    """
+    selected = range(self.__count)
+    for field, predicate in conditions.items():
+      mask = self._column(field).mask(predicate)
+      selected = [i for i in selected if mask[i]]
+
+    return self.take(list(selected))
+
+  def group_by(self, *fields : str) -> ScaGroupBy:
+    """Groups the table rows by one or more fields.
+
+    Rows are counted once for each member when grouping by a list field such as `applicationIds`.
+
+    :rtype: ScaGroupBy
+    """
+    if len(fields) == 0:
+      raise ValueError("At least one field is required to group.")
+    return ScaGroupBy(self, list(fields))
+
+  def top_k(self, field : str, k : int, largest : bool = True) -> List[Dict]:
+    """Returns the rows with the `k` largest (or smallest) values for a numeric field.
+
+    Rows with a missing value are excluded.
+
+    :param field: The name of the numeric field.
+    :type field: str
+
+    :param k: The number of rows to return.
+    :type k: int
+
+    :param largest: Set to false to return the rows with the smallest values, defaults to True.
+    :type largest: bool, optional
+
+    :rtype: List[Dict]
+    """
+    values = self._column(field).numbers()
+    candidates = (i for i in range(self.__count) if not math.isnan(values[i]))
+    picker = heapq.nlargest if largest else heapq.nsmallest
+    indices = picker(k, candidates, key=values.__getitem__)
+    return list(self.take(indices).rows())
@@ -7,8 +7,9 @@ from requests import post
 
 class abstract_iterator:
 
-  def __init__(self, client : CxOneClient, api_url : str, query : str, element_name : str, page_size : int, page_retries_max : int = 5, page_retry_delay_s : int = 3):
+  def __init__(self, client : CxOneClient, api_url : str, query : str, element_name : str, page_size : int, page_retries_max : int = 5, page_retry_delay_s : int = 3, executor = None):
     self.__client = client
+    self.__executor = executor
     self.__url = api_url
     self.__query = query
     self.__elem = element_name
@@ -38,18 +39,21 @@ class abstract_iterator:
           }
           self._add_variables(variables)
 
-          payload = {
-            "query" : self.__query,
-            "variables" : variables
-          }
-          
-          resp_json = json_on_ok(await self.__client.exec_request(post,
-                                                          url=self.__url,
-                                                          json=payload))
-
-          data = resp_json.get("data", None)
-          assert(data is not None)
-          self.__cache = data.get(self.__elem, None)
+          if self.__executor is not None:
+            self.__cache = await self.__executor.execute(self.__query, variables, self.__elem)
+          else:
+            payload = {
+              "query" : self.__query,
+              "variables" : variables
+            }
+            
+            resp_json = json_on_ok(await self.__client.exec_request(post,
+                                                            url=self.__url,
+                                                            json=payload))
+
+            data = resp_json.get("data", None)
+            assert(data is not None)
+            self.__cache = data.get(self.__elem, None)
           assert(self.__cache is not None)
         except BaseException:
           if retries > 0:
@@ -0,0 +1,118 @@
+from cxone_api import CxOneClient
+from cxone_api.util import page_generator
+from cxone_api.low.projects import retrieve_list_of_projects
+from cxone_api.low.applications import retrieve_applications_info
+from .base import AbstractScaGQLWhereQuery
+from typing import AsyncGenerator, Dict, List, Type
+import asyncio, enum
+
+
+class ScaPartitionKey(enum.Enum):
+  """An enumeration of fields that can be used to partition an SCA analysis query."""
+  PROJECT_ID = "projectId"
+  APPLICATION_ID = "applicationIds"
+
+  def where_for(self, value : str) -> Dict:
+    """Returns the filtering criteria that selects a single partition.
+
+    :param value: The project or application ID of the partition.
+    :type value: str
+
+    :rtype: Dict
+    """
+    if self == ScaPartitionKey.APPLICATION_ID:
+      return {self.value : {"some" : {"eq" : value}}}
+    return {self.value : {"eq" : value}}
+
+  async def values(self, client : CxOneClient) -> List[str]:
+    """Retrieves the IDs of all partitions in the tenant.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :rtype: List[str]
+    """
+    if self == ScaPartitionKey.APPLICATION_ID:
+      return [a['id'] async for a in page_generator(retrieve_applications_info, "applications", client=client)]
+    return [p['id'] async for p in page_generator(retrieve_list_of_projects, "projects", client=client)]
+
+
+async def partitioned_query(client : CxOneClient, query_class : Type[AbstractScaGQLWhereQuery], partition_key : ScaPartitionKey,
+                            partitions : List[str] = None, where : Dict = None, concurrency : int = 4,
+                            **query_kwargs) -> AsyncGenerator[Dict, None]:
+  """Executes an SCA analysis query as a set of concurrently executing queries, one per project or application.
+
+  Each partition query uses the partition criteria combined with the optional `where` criteria.  Results
+  from all partitions are merged into a single stream in the order they are received; any ordering requested
+  by the query is only preserved within a partition.
+
+  Rows for a project that belongs to more than one application are emitted once for each application
+  when partitioning by `ScaPartitionKey.APPLICATION_ID`.
+
+  :param client: The CxOneClient instance used to communicate with Checkmarx One
+  :type client: CxOneClient
+
+  :param query_class: The SCA analysis query class such as ScaTenantRisks.
+  :type query_class: Type[AbstractScaGQLWhereQuery]
+
+  :param partition_key: The field used to partition the query.
+  :type partition_key: ScaPartitionKey
+
+  :param partitions: A list of project or application IDs to query.  All IDs in the tenant are used if not provided.
+  :type partitions: List[str], optional
+
+  :param where: Filtering criteria combined with the criteria of each partition, defaults to None.
+  :type where: Dict, optional
+
+  :param concurrency: The maximum number of partitions queried concurrently, defaults to 4.
+  :type concurrency: int, optional
+
+  :param query_kwargs: Keyword arguments passed to the query class constructor (e.g. page_size, batch_executor).
+
+  :return: A generator that is used in an `async for` statement.
+  :rtype: AsyncGenerator[Dict, None]
+  """
+  if partitions is None:
+    partitions = await partition_key.values(client)
+
+  work = asyncio.Queue()
+  for p in partitions:
+    work.put_nowait(p)
+
+  done = object()
+  results = asyncio.Queue(maxsize=max(1, concurrency) * 100)
+
+  async def worker():
+    try:
+      while not work.empty():
+        partition = work.get_nowait()
+        query = query_class(client, **query_kwargs)
+        query.where = partition_key.where_for(partition) if where is None \
+          else {"and" : [where, partition_key.where_for(partition)]}
+
+        async for row in query:
+          await results.put(row)
+    except asyncio.CancelledError:
+      raise
+    except BaseException as ex:
+      await results.put(ex)
+      return
+
+    await results.put(done)
+
+  workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(partitions))))]
+  remaining = len(workers)
+
+  try:
+    while remaining > 0:
+      item = await results.get()
+      if item is done:
+        remaining -= 1
+      elif isinstance(item, BaseException):
+        raise item
+      else:
+        yield item
+  finally:
+    for w in workers:
+      w.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
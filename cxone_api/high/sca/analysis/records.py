@@ -0,0 +1,129 @@
+from typing import Any, AsyncGenerator, AsyncIterable, Dict, Tuple, Type
+import re
+
+
+class ScaRecord:
+  """The base class for compact, read-only records produced from SCA analysis query results.
+
+  Record classes are generated per query class with one slot per field selected by the query.  Field
+  values are available as attributes, with `get` and item access provided for compatibility with code
+  written for the result dictionaries.  List values are stored as tuples.
+  """
+  __slots__ = ()
+  _fields : Tuple[str] = ()
+
+  def __init__(self, *values : Any):
+    for name, value in zip(self._fields, values):
+      object.__setattr__(self, name, value)
+
+  def __setattr__(self, name, value):
+    raise AttributeError(f"{type(self).__name__} is read-only.")
+
+  def __getitem__(self, name : str) -> Any:
+    if name not in self._fields:
+      raise KeyError(name)
+    return getattr(self, name)
+
+  def get(self, name : str, default : Any = None) -> Any:
+    """Returns the value of a field or the default if the record has no such field."""
+    return getattr(self, name) if name in self._fields else default
+
+  def keys(self) -> Tuple[str]:
+    """Returns the names of the record fields."""
+    return self._fields
+
+  def to_dict(self) -> Dict:
+    """Returns the record as a dictionary."""
+    return {f : getattr(self, f) for f in self._fields}
+
+  def __eq__(self, other):
+    return type(self) is type(other) and all(getattr(self, f) == getattr(other, f) for f in self._fields)
+
+  def __hash__(self):
+    return hash(tuple(_hashable(getattr(self, f)) for f in self._fields))
+
+  def __repr__(self):
+    return f"{type(self).__name__}({', '.join(f'{f}={getattr(self, f)!r}' for f in self._fields)})"
+
+
+def _hashable(value : Any) -> Any:
+  # Dictionary values such as tags are hashed by their items; the record keeps the dictionary.
+  if isinstance(value, dict):
+    return frozenset((k, _hashable(v)) for k, v in value.items())
+  elif isinstance(value, (list, tuple)):
+    return tuple(_hashable(v) for v in value)
+  return value
+
+
+class StringInternTable:
+  """Deduplicates repeated string values so that equal strings share a single instance.
+
+  Unlike `sys.intern`, the table is released when it is no longer referenced.
+  """
+
+  def __init__(self):
+    self.__table = {}
+
+  def __len__(self):
+    return len(self.__table)
+
+  def intern(self, value : Any) -> Any:
+    """Returns the shared instance of a value, converting lists to tuples of shared values.
+
+    :param value: The value to intern.
+    :type value: Any
+
+    :rtype: Any
+    """
+    if isinstance(value, str):
+      return self.__table.setdefault(value, value)
+    elif isinstance(value, list):
+      return tuple(self.intern(v) for v in value)
+    elif isinstance(value, dict):
+      return {self.intern(k) : self.intern(v) for k, v in value.items()}
+    return value
+
+
+_SELECTION_PATTERN = re.compile(r"\)\s*\{(?P<fields>[^{}]*)\}", re.DOTALL)
+_record_types = {}
+
+
+def record_type(query_class : Type) -> Type[ScaRecord]:
+  """Returns the record class with the fields selected by an SCA analysis query class.
+
+  :param query_class: An SCA analysis query class such as ScaTenantRisks.
+  :type query_class: Type
+
+  :rtype: Type[ScaRecord]
+  """
+  if query_class not in _record_types.keys():
+    query = getattr(query_class, "_QUERY_TEXT", None)
+    m = _SELECTION_PATTERN.search(query) if query is not None else None
+    if m is None:
+      raise ValueError(f"Unable to determine the fields selected by {query_class.__name__}.")
+
+    fields = tuple(re.findall(r"\w+", m.group("fields")))
+    _record_types[query_class] = type(f"{query_class.__name__}Record", (ScaRecord,),
+                                      {"__slots__" : fields, "_fields" : fields})
+
+  return _record_types[query_class]
+
+
+async def compact_records(query : AsyncIterable) -> AsyncGenerator[ScaRecord, None]:
+  """Iterates the results of an SCA analysis query as compact records.
+
+  A new string intern table is used for each iteration so that repeated names and values share storage.
+
+  :param query: An SCA analysis query instance such as ScaTenantRisks.
+  :type query: AsyncIterable
+
+  :return: A generator that is used in an `async for` statement.
+  :rtype: AsyncGenerator[ScaRecord, None]
+  """
+  cls = record_type(type(query))
+  fields = cls._fields
+  table = StringInternTable()
+  intern = table.intern
+
+  async for row in query:
+    yield cls(*[intern(row.get(f, None)) for f in fields])
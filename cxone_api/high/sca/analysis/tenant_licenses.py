@@ -8,9 +8,7 @@ class ScaTenantLicenses(AbstractScaGQLWhereQuery):
   def _result_element(self) -> str:
     return "reportingLicenses"
 
-  @property
-  def _query(self) -> str:
-    return """
+  _QUERY_TEXT = """
 query (
 $where: ReportingLicenseModelFilterInput
 $take: Int!
@@ -8,9 +8,7 @@ class ScaTenantPackages(AbstractScaGQLOrderQuery):
   def _result_element(self) -> str:
     return "reportingPackages"
 
-  @property
-  def _query(self) -> str:
-    return """
+  _QUERY_TEXT = """
 query (
 $where: ReportingPackageModelFilterInput
 $take: Int!
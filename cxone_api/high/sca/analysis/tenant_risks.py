@@ -6,9 +6,7 @@ class ScaTenantRisks(AbstractScaGQLWhereQuery):
   def _result_element(self) -> str:
     return "reportingRisks"
 
-  @property
-  def _query(self) -> str:
-    return """
+  _QUERY_TEXT = """
 query (
 $where: ReportingRiskModelFilterInput
 $take: Int!
@@ -0,0 +1,199 @@
+from cxone_api import CxOneClient
+from cxone_api.exceptions import ResponseException
+from cxone_api.transfer import iter_download, DEFAULT_CHUNK_SIZE
+from cxone_api.high.scheduling import PollScheduler
+from cxone_api.high.artifact_cache import ArtifactCache
+from .report import ScaReportOptions, sca_export_cache_key, _request_export, _check_export_status
+from typing import AsyncGenerator, Iterable, Tuple, Union
+from dataclasses import dataclass
+from requests.compat import urljoin
+from pathlib import Path
+import asyncio, os, tempfile, zlib
+
+
+@dataclass(frozen=True)
+class ScaExportResult:
+  """The outcome of exporting one SCA report."""
+  scanId : str
+  reportOptions : ScaReportOptions
+  path : Path = None
+  bytes_written : int = 0
+  exception : BaseException = None
+
+  @property
+  def ok(self) -> bool:
+    """True if the report was written to `path`."""
+    return self.exception is None
+
+
+class _StreamDecompressor:
+  # Decompresses gzip or zlib content incrementally; any other content is passed through unchanged.
+  def __init__(self):
+    self.__decompressor = None
+    self.__decided = False
+
+  def feed(self, chunk : bytes) -> bytes:
+    if not self.__decided:
+      self.__decided = True
+      if chunk[:2] == b"\x1f\x8b" or (len(chunk) > 1 and chunk[0] == 0x78 and (chunk[0] << 8 | chunk[1]) % 31 == 0):
+        self.__decompressor = zlib.decompressobj(wbits=47)
+
+    return chunk if self.__decompressor is None else self.__decompressor.decompress(chunk)
+
+  def flush(self) -> bytes:
+    return b"" if self.__decompressor is None else self.__decompressor.flush()
+
+
+class ScaExportManager:
+  """Exports SCA reports for many scans concurrently and streams each completed report to disk.
+
+  Export requests are submitted with limited concurrency and the status of all pending exports is
+  checked by a single `PollScheduler`.  Each report is downloaded as soon as it is ready without holding
+  the report in memory.  When an export was requested with `compressOutput` set, gzip or zlib compressed
+  content is decompressed as it is written; other content is written as received.
+  """
+
+  def __init__(self, client : CxOneClient, dest_dir : Union[str, os.PathLike], submit_concurrency : int = 10,
+               download_concurrency : int = 4, timeout_seconds : float = 300.0, scheduler : PollScheduler = None,
+               decompress : bool = True, cache : ArtifactCache = None):
+    """
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param dest_dir: The directory where exported reports are written.
+    :type dest_dir: Union[str, os.PathLike]
+
+    :param submit_concurrency: The maximum number of export requests executing at the same time, defaults to 10.
+    :type submit_concurrency: int
+
+    :param download_concurrency: The maximum number of downloads executing at the same time, defaults to 4.
+    :type download_concurrency: int
+
+    :param timeout_seconds: The number of seconds to wait for each export to be produced, defaults to 300.
+    :type timeout_seconds: float
+
+    :param scheduler: The scheduler used to check the status of pending exports.  A new scheduler with a 5 second
+                      initial delay is used if not provided.
+    :type scheduler: PollScheduler, optional
+
+    :param decompress: Set to false to write compressed exports without decompressing them, defaults to True.
+    :type decompress: bool
+
+    :param cache: A cache used to retrieve previously exported reports and to store new exports.  Defaults to no caching.
+    :type cache: ArtifactCache, optional
+    """
+    self.__client = client
+    self.__dest = Path(dest_dir)
+    self.__submit_limit = asyncio.Semaphore(max(1, submit_concurrency))
+    self.__download_limit = asyncio.Semaphore(max(1, download_concurrency))
+    self.__timeout = timeout_seconds
+    self.__scheduler = scheduler if scheduler is not None else PollScheduler(initial_delay_s=5.0)
+    self.__decompress = decompress
+    self.__cache = cache
+
+  @staticmethod
+  def default_file_name(scanId : str, reportOptions : ScaReportOptions) -> str:
+    """The file name used for an export when a destination is not provided.
+
+    :rtype: str
+    """
+    return f"{scanId}-{reportOptions.fileFormat.name}.{reportOptions.fileFormat.extension}"
+
+  async def __download(self, exportId : str, dest : Path, decompress : bool) -> int:
+    url = urljoin(self.__client.api_endpoint, f"sca/export/requests/{exportId}/download")
+    decompressor = _StreamDecompressor() if decompress else None
+    written = 0
+
+    # The report is written to a temporary file that replaces dest only when the download completes.
+    fd, temp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+    try:
+      with os.fdopen(fd, "wb") as f:
+        async for chunk in iter_download(self.__client, url, DEFAULT_CHUNK_SIZE):
+          data = chunk if decompressor is None else decompressor.feed(chunk)
+          await asyncio.to_thread(f.write, data)
+          written += len(data)
+
+        if decompressor is not None:
+          tail = decompressor.flush()
+          await asyncio.to_thread(f.write, tail)
+          written += len(tail)
+
+      os.replace(temp, dest)
+    except BaseException:
+      if os.path.exists(temp):
+        os.unlink(temp)
+      raise
+
+    return written
+
+  async def export(self, scanId : str, reportOptions : ScaReportOptions, dest : Union[str, os.PathLike] = None) -> ScaExportResult:
+    """Exports the SCA report for a single scan.
+
+    :param scanId: The scan id with SCA results that will be used to produce the report.
+    :type scanId: str
+
+    :param reportOptions: Options that control the SCA report.
+    :type reportOptions: ScaReportOptions
+
+    :param dest: The path where the report is written.  Defaults to a file named by `default_file_name` in the destination directory.
+    :type dest: Union[str, os.PathLike], optional
+
+    :raises ResponseException: Raised if the export fails or is not produced before the timeout.
+
+    :rtype: ScaExportResult
+    """
+    path = Path(dest) if dest is not None else self.__dest / ScaExportManager.default_file_name(scanId, reportOptions)
+    decompress = self.__decompress and reportOptions.exportParameters.compressOutput
+
+    if self.__cache is not None:
+      key = sca_export_cache_key(self.__client, scanId, reportOptions, decompress)
+      written = await asyncio.to_thread(self.__cache.copy_to, key, path)
+      if written is not None:
+        return ScaExportResult(scanId, reportOptions, path, written)
+
+    async with self.__submit_limit:
+      exportId = await _request_export(self.__client, scanId, reportOptions)
+
+    try:
+      await self.__scheduler.wait(lambda: _check_export_status(self.__client, exportId), self.__timeout)
+    except asyncio.TimeoutError:
+      raise ResponseException(f"Unable to retrieve SCA scan report after {int(self.__timeout)} seconds")
+
+    async with self.__download_limit:
+      written = await self.__download(exportId, path, decompress)
+
+    if self.__cache is not None:
+      await asyncio.to_thread(self.__cache.put_file, key, path)
+
+    return ScaExportResult(scanId, reportOptions, path, written)
+
+  async def export_many(self, exports : Iterable[Tuple[str, ScaReportOptions]]) -> AsyncGenerator[ScaExportResult, None]:
+    """Exports SCA reports for many scans and yields each result as soon as the report has been written.
+
+    Failures are returned as results with the `exception` attribute set rather than interrupting the other exports.
+
+    :param exports: Pairs of scan id and report options.
+    :type exports: Iterable[Tuple[str, ScaReportOptions]]
+
+    :return: A generator that is used in an `async for` statement.
+    :rtype: AsyncGenerator[ScaExportResult, None]
+    """
+    results = asyncio.Queue()
+
+    async def run(scanId : str, reportOptions : ScaReportOptions):
+      try:
+        await results.put(await self.export(scanId, reportOptions))
+      except asyncio.CancelledError:
+        raise
+      except BaseException as ex:
+        await results.put(ScaExportResult(scanId, reportOptions, exception=ex))
+
+    tasks = [asyncio.create_task(run(scanId, options)) for scanId, options in exports]
+
+    try:
+      for _ in range(len(tasks)):
+        yield await results.get()
+    finally:
+      for t in tasks:
+        t.cancel()
+      await asyncio.gather(*tasks, return_exceptions=True)
@@ -2,11 +2,14 @@ from cxone_api import CxOneClient
 from cxone_api.exceptions import ResponseException
 from cxone_api.util import json_on_ok
 from ...low.sca import request_scan_report, get_scan_report_status, retrieve_scan_report
-import requests, enum
-from typing import List
+from ..artifact_cache import ArtifactCache
+import requests, enum, asyncio
+from typing import List, Union
 from dataclasses import dataclass, field
 from dataclasses_json import dataclass_json, config
-from time import perf_counter, sleep
+from time import perf_counter
+
+_MAX_POLL_DELAY_SECONDS = 30
 
 
 class ScaReportType(enum.Enum):
@@ -20,6 +23,11 @@ class ScaReportType(enum.Enum):
   ScanReportCsv = "ScanReportCsv"
   ScanReportPdf = "ScanReportPdf"
 
+  @property
+  def extension(self) -> str:
+    """The file name extension for the report type."""
+    return self.value[-3:].lower() if not self.value.endswith("Json") else "json"
+
 
 @dataclass_json
 @dataclass(frozen=True)
@@ -61,10 +69,65 @@ async def get_sca_report(client : CxOneClient, scanId : str, reportOptions : Sca
   :rtype: Response
 
   """
-  args = { "scanId" : scanId}
-  args.update(reportOptions.to_dict())
-  response = json_on_ok(await request_scan_report(client, **args))
-  exportId = response['exportId']
+  return await _get_sca_report(client, scanId, reportOptions, timeout_seconds)
+
+
+async def get_sca_report_content(client : CxOneClient, scanId : str, reportOptions : ScaReportOptions, timeout_seconds : float = 300.0,
+                                 cache : ArtifactCache = None) -> bytes:
+  """Retrieves the content of an SCA scan report, optionally from a cache.
+
+  :param client: The CxOneClient instance used to communicate with Checkmarx One
+  :type client: CxOneClient
+
+  :param scanid: The scan id with SCA results that will be used to produce the report.
+  :type scanid: str
+
+  :param reportOptions: Options that control the SCA report.
+  :type reportOptions: ScaReportOptions
+
+  :param timeout_seconds: The number of seconds to wait for the report to be produced before raising an exception to indicate failure.
+  :type timeout_seconds: float
+
+  :param cache: A cache used to retrieve a previously produced report and to store a newly produced report.
+                Defaults to no caching.
+  :type cache: ArtifactCache, optional
+
+  :raises ResponseException: An exception that indicates failure to retrieve the report for any reason.
+  :rtype: bytes
+
+  """
+  if cache is not None:
+    key = sca_export_cache_key(client, scanId, reportOptions)
+    cached = await asyncio.to_thread(cache.get, key)
+    if cached is not None:
+      return cached
+
+  response = await _get_sca_report(client, scanId, reportOptions, timeout_seconds)
+  if not response.ok:
+    raise ResponseException(f"Unable to retrieve SCA scan report: Code: [{response.status_code}] Url: {response.request.url}")
+
+  if cache is not None:
+    await asyncio.to_thread(cache.put, key, response.content)
+
+  return response.content
+
+
+def sca_export_cache_key(client : CxOneClient, scanId : str, reportOptions : ScaReportOptions, decompressed : bool = False) -> str:
+  """The key identifying an SCA report in an `ArtifactCache`.
+
+  :param decompressed: True if the cached content is the decompressed form of a compressed report.
+  :type decompressed: bool
+
+  :rtype: str
+  """
+  parts = ["sca-export", scanId, reportOptions.to_dict()]
+  if decompressed:
+    parts.append("decompressed")
+  return ArtifactCache.key(client, *parts)
+
+
+async def _get_sca_report(client : CxOneClient, scanId : str, reportOptions : ScaReportOptions, timeout_seconds : float) -> requests.Response:
+  exportId = await _request_export(client, scanId, reportOptions)
 
   loop_timer = cur_timer = perf_counter()
   delay_secs = 5
@@ -73,15 +136,29 @@ async def get_sca_report(client : CxOneClient, scanId : str, reportOptions : Sca
   while cur_timer - loop_timer <= timeout_seconds + delay_secs:
       cur_timer = perf_counter()
 
-      status = json_on_ok(await get_scan_report_status(client, exportId))
-      if status['exportStatus'] == "Completed":
+      if await _check_export_status(client, exportId):
           ready = True
           break
-      sleep(delay_secs)
-      delay_secs *= 2
+      await asyncio.sleep(delay_secs)
+      delay_secs = min(delay_secs * 2, _MAX_POLL_DELAY_SECONDS)
   
   if not ready:
       raise ResponseException(f"Unable to retrieve SCA scan report after {int(cur_timer - loop_timer)} seconds")
   
   return await retrieve_scan_report(client, exportId)
 
+
+async def _request_export(client : CxOneClient, scanId : str, reportOptions : ScaReportOptions) -> str:
+  args = { "scanId" : scanId}
+  args.update(reportOptions.to_dict())
+  response = json_on_ok(await request_scan_report(client, **args))
+  return response['exportId']
+
+
+async def _check_export_status(client : CxOneClient, exportId : str) -> Union[bool, None]:
+  status = json_on_ok(await get_scan_report_status(client, exportId))
+  if status['exportStatus'] == "Completed":
+    return True
+  elif status['exportStatus'] == "Failed":
+    raise ResponseException(f"SCA export {exportId} failed: {status.get('errorMessage', '')}")
+  return None
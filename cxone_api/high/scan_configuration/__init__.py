@@ -2,6 +2,7 @@ from typing import List, Dict
 from .base_config import BaseScanConfiguration
 from ...client import CxOneClient
 from ..util import json_on_ok
+from ..tenant_config_cache import TenantConfigurationCache
 from ...exceptions import ResponseException, ConfigurationException
 from ...low.scan_configuration import \
   retrieve_tenant_configuration, update_tenant_configuration, delete_tenant_configuration, \
@@ -27,11 +28,13 @@ class TenantScanConfiguration(BaseScanConfiguration):
 
   async def _write_config(self, items : List[Dict]) -> None:
     resp = await update_tenant_configuration(self.client, items)
+    TenantConfigurationCache.invalidate_for(self.client)
     if not resp.ok:
       raise ResponseException(resp)
 
   async def _write_deletes(self, keys : List[str]) -> None:
     resp = await delete_tenant_configuration(self.client, config_keys=','.join(keys))
+    TenantConfigurationCache.invalidate_for(self.client)
     if not resp.ok:
       raise ResponseException(resp)
 
@@ -0,0 +1,256 @@
+from typing import Iterable, List, Set
+from dataclasses import dataclass, field
+from enum import IntEnum
+from fnmatch import fnmatch
+from .. import CxOneClient
+from ..util import json_on_ok
+from ..exceptions import ResponseException, CommunicationException
+from ..low.scans import retrieve_scan_status_summary
+from .bulk_scans import BulkScanSubmitter, ScanRequest, ScanSubmissionResult, scan_status_counts
+from .scan_watcher import ScanWatcher
+from .scans import ScanInspector
+import asyncio, heapq, logging
+
+
+class ScanPriority(IntEnum):
+    """An enumeration of scan scheduling priorities.  Scans with a higher priority are released first."""
+    LOW = 0
+    NORMAL = 50
+    HIGH = 100
+
+    @staticmethod
+    def for_branch(branch : str, high_patterns : Iterable[str] = ("main", "master", "release/*", "release-*", "hotfix/*"),
+                   low_patterns : Iterable[str] = ()) -> "ScanPriority":
+        """Selects a priority by matching a branch name to glob patterns.
+
+        :param branch: The name of the branch to scan.
+        :type branch: str
+
+        :param high_patterns: Patterns of branch names scanned with HIGH priority.  Defaults to main, master, release and hotfix branches.
+        :type high_patterns: Iterable[str], optional
+
+        :param low_patterns: Patterns of branch names scanned with LOW priority.  Defaults to none.
+        :type low_patterns: Iterable[str], optional
+
+        :return: HIGH or LOW if the branch matches a pattern, NORMAL otherwise.
+        :rtype: ScanPriority
+        """
+        if branch is not None:
+            if any([fnmatch(branch, p) for p in high_patterns]):
+                return ScanPriority.HIGH
+            if any([fnmatch(branch, p) for p in low_patterns]):
+                return ScanPriority.LOW
+        return ScanPriority.NORMAL
+
+
+@dataclass(order=True)
+class _PendingScan:
+    sort_key : int
+    seq : int
+    request : ScanRequest = field(compare=False)
+    future : asyncio.Future = field(compare=False)
+
+
+class ScanScheduler:
+    """Releases scan requests to the tenant only when there is capacity to execute them.
+
+    Scheduled requests are held until the number of this scheduler's scans in the `Queued` or `Running` status
+    is below `max_active`.  If `tenant_max_active` is set, requests are also held while the tenant's scan status
+    summary reports that many `Queued` and `Running` scans, including scans not submitted by this scheduler.
+    When capacity is available, requests are released in order of priority and then in the order they were
+    scheduled.
+
+    Released requests are submitted with a `BulkScanSubmitter`, and the status of the submitted scans is
+    tracked with a `ScanWatcher`.  Call `close`, or use the scheduler with `async with`, to stop scheduling
+    and stop the watcher created by the scheduler.
+    """
+
+    __ACTIVE_STATES = ["Queued", "Running"]
+
+    def __init__(self, client : CxOneClient, max_active : int = 10, tenant_max_active : int = None,
+                 check_interval_s : float = 15.0, submitter : BulkScanSubmitter = None, watcher : ScanWatcher = None):
+        """
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :param max_active: The maximum number of this scheduler's scans that are queued or running.  Defaults to 10.
+        :type max_active: int, optional
+
+        :param tenant_max_active: The maximum number of queued or running scans in the tenant before scans are held.  Defaults to no limit.
+        :type tenant_max_active: int, optional
+
+        :param check_interval_s: The number of seconds between capacity checks while scans are held.  Defaults to 15.
+        :type check_interval_s: float, optional
+
+        :param submitter: The submitter used to submit released scans.  Defaults to a new `BulkScanSubmitter`.
+        :type submitter: BulkScanSubmitter, optional
+
+        :param watcher: The watcher used to track submitted scans.  Defaults to a new `ScanWatcher` that is closed by `close`.
+        :type watcher: ScanWatcher, optional
+        """
+        self.__client = client
+        self.__max_active = max(1, max_active)
+        self.__tenant_max = tenant_max_active
+        self.__interval = check_interval_s
+        self.__submitter = submitter if submitter is not None else BulkScanSubmitter(client)
+        self.__watcher = watcher if watcher is not None else ScanWatcher(client)
+        self.__owns_watcher = watcher is None
+        self.__heap : List[_PendingScan] = []
+        self.__seq = 0
+        self.__submitting = 0
+        self.__active : Set[str] = set()
+        self.__tasks = set()
+        self.__wakeup = asyncio.Event()
+        self.__runner = None
+
+    @property
+    def pending(self) -> int:
+        """The number of scheduled scans that have not been released."""
+        return len(self.__heap)
+
+    @property
+    def active(self) -> int:
+        """The number of released scans that are being submitted, queued or running."""
+        return self.__submitting + len(self.__active)
+
+    def schedule(self, request : ScanRequest, priority : int = ScanPriority.NORMAL) -> asyncio.Future:
+        """Schedules a scan request for submission.
+
+        :param request: The scan request.
+        :type request: ScanRequest
+
+        :param priority: The priority of the request.  Higher values are released first.  Defaults to ScanPriority.NORMAL.
+        :type priority: int, optional
+
+        :return: A future that resolves to the `ScanSubmissionResult` when the request is submitted.
+        :rtype: asyncio.Future
+        """
+        self.__seq += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.__heap, _PendingScan(-int(priority), self.__seq, request, future))
+        self.__wakeup.set()
+
+        if self.__runner is None or self.__runner.done():
+            self.__runner = asyncio.get_running_loop().create_task(self.__run())
+
+        return future
+
+    async def join(self) -> None:
+        """Waits until all scheduled scans have been submitted."""
+        while len(self.__heap) > 0 or self.__submitting > 0:
+            await asyncio.gather(*[p.future for p in self.__heap] + list(self.__tasks), return_exceptions=True)
+
+    async def close(self) -> None:
+        """Stops releasing scans and waits for submissions in progress to complete.
+
+        The futures of scheduled scans that have not been released are cancelled.  A watcher created by the
+        scheduler is closed; a watcher passed to the scheduler is left running.
+        """
+        runner = self.__runner
+        self.__runner = None
+        if runner is not None and not runner.done():
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+        heap = self.__heap
+        self.__heap = []
+        for pending in heap:
+            pending.future.cancel()
+
+        await asyncio.gather(*list(self.__tasks), return_exceptions=True)
+
+        if self.__owns_watcher:
+            await self.__watcher.close()
+
+    async def __aenter__(self) -> "ScanScheduler":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def __tenant_capacity(self) -> int:
+        if self.__tenant_max is None:
+            return self.__max_active
+
+        _log = logging.getLogger("ScanScheduler")
+
+        try:
+            counts = scan_status_counts(json_on_ok(await retrieve_scan_status_summary(self.__client)))
+        except (ResponseException, CommunicationException) as ex:
+            _log.warning(f"Unable to retrieve the scan status summary: {ex}")
+            return 0
+
+        return self.__tenant_max - sum([counts.get(s, 0) for s in ScanScheduler.__ACTIVE_STATES])
+
+    async def __scan_done(self, inspector : ScanInspector) -> None:
+        self.__active.discard(inspector.scan_id)
+        self.__wakeup.set()
+
+    async def __release(self, pending : _PendingScan) -> None:
+        try:
+            result = await self.__submitter.submit_one(pending.request)
+            if result.ok and result.scan_id is not None:
+                self.__active.add(result.scan_id)
+                watched = self.__watcher.watch(result.scan_id, self.__scan_done)
+                watched.add_done_callback(lambda f: self.__scan_gone(result.scan_id, f))
+            if not pending.future.done():
+                pending.future.set_result(result)
+        except BaseException as ex:
+            if not pending.future.done():
+                pending.future.set_result(ScanSubmissionResult(pending.request, exception=ex))
+            if isinstance(ex, asyncio.CancelledError):
+                raise
+        finally:
+            self.__submitting -= 1
+            self.__wakeup.set()
+
+    def __scan_gone(self, scan_id : str, future : asyncio.Future) -> None:
+        # Scans that can't be found or are no longer watched no longer count as active.
+        if future.cancelled() or future.exception() is not None:
+            self.__active.discard(scan_id)
+            self.__wakeup.set()
+
+    def __fail_pending(self, ex : BaseException) -> None:
+        heap = self.__heap
+        self.__heap = []
+        for pending in heap:
+            if not pending.future.done():
+                pending.future.set_result(ScanSubmissionResult(pending.request, exception=ex))
+
+    async def __run(self) -> None:
+        _log = logging.getLogger("ScanScheduler")
+
+        try:
+            await self.__release_when_ready()
+        except asyncio.CancelledError:
+            raise
+        except BaseException as ex:
+            # Failures such as an AuthException from the capacity check end scheduling, so the waiters receive the exception.
+            _log.exception(ex)
+            self.__fail_pending(ex)
+
+    async def __release_when_ready(self) -> None:
+        while len(self.__heap) > 0:
+            self.__wakeup.clear()
+
+            capacity = self.__max_active - self.active
+            if capacity > 0:
+                capacity = min(capacity, await self.__tenant_capacity())
+
+            while capacity > 0 and len(self.__heap) > 0:
+                pending = heapq.heappop(self.__heap)
+                if pending.future.done():
+                    continue
+                capacity -= 1
+                self.__submitting += 1
+                task = asyncio.get_running_loop().create_task(self.__release(pending))
+                self.__tasks.add(task)
+                task.add_done_callback(self.__tasks.discard)
+
+            if len(self.__heap) == 0:
+                break
+
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), self.__interval)
+            except asyncio.TimeoutError:
+                pass
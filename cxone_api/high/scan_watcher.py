@@ -0,0 +1,414 @@
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Iterable, List, Tuple
+from dataclasses import dataclass, field
+from .. import CxOneClient
+from ..util import json_on_ok
+from ..exceptions import ScanException, ResponseException, CommunicationException
+from ..low.scans import retrieve_list_of_scans
+from .scans import ScanInspector
+import asyncio, json, logging
+
+
+ScanCallback = Callable[[ScanInspector], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class ScanStatusEvent:
+    """An event indicating the status of a watched scan has changed."""
+    scan_id : str
+    project_id : str
+    status : str
+    previous_status : str
+    engine_changes : Dict[str, Tuple[dict, dict]] = field(default_factory=dict)
+    """A dictionary of engine names to the previous and current `statusDetails` entries of engines that have changed."""
+    inspector : ScanInspector = None
+    """The `ScanInspector` for the scan state that produced the event."""
+
+    @property
+    def completed(self) -> bool:
+        """True if the scan has completed."""
+        return not self.inspector.executing
+
+
+class _WatchedScan:
+    def __init__(self, future : asyncio.Future):
+        self.future = future
+        self.callbacks = []
+        self.snapshot = None
+        self.misses = 0
+        # The number of waiters and event subscribers that may release their interest in the scan.
+        self.holds = 0
+        # True if `watch` was called for the scan; such scans are watched until they complete or `unwatch` is called.
+        self.pinned = False
+
+
+class ScanWatcher:
+    """Waits for any number of scans to complete by polling their status in batches.
+
+    The status of all watched scans is retrieved with the scan list API using the `scan-ids` filter, so a
+    single request checks the status of up to `batch_size` scans.  The polling interval starts at
+    `initial_interval_s` and grows by `backoff_factor` up to `max_interval_s` while the status of the watched
+    scans does not change.  The interval returns to `initial_interval_s` when any watched scan changes status.
+
+    Each scan is resolved when `ScanInspector.executing` is false for the retrieved scan.
+
+    The watcher polls in a background task while any scan is watched.  Call `close`, or use the watcher
+    with `async with`, to stop polling when the watcher is no longer needed.
+    """
+
+    def __init__(self, client : CxOneClient, batch_size : int = 100, initial_interval_s : float = 5.0,
+                 max_interval_s : float = 60.0, backoff_factor : float = 1.5, max_misses : int = 3):
+        """
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :param batch_size: The maximum number of scan ids sent in each scan list request.  Defaults to 100.
+        :type batch_size: int, optional
+
+        :param initial_interval_s: The number of seconds between status checks after a status change.  Defaults to 5.
+        :type initial_interval_s: float, optional
+
+        :param max_interval_s: The maximum number of seconds between status checks.  Defaults to 60.
+        :type max_interval_s: float, optional
+
+        :param backoff_factor: The factor used to increase the interval when no status has changed.  Defaults to 1.5.
+        :type backoff_factor: float, optional
+
+        :param max_misses: The number of consecutive status checks that do not return a watched scan before the
+                           scan is considered to not exist.  Defaults to 3.
+        :type max_misses: int, optional
+        """
+        self.__client = client
+        self.__batch_size = max(1, batch_size)
+        self.__initial = initial_interval_s
+        self.__max = max_interval_s
+        self.__backoff = backoff_factor
+        self.__max_misses = max(1, max_misses)
+        self.__interval = initial_interval_s
+        self.__scans : Dict[str, _WatchedScan] = {}
+        self.__wakeup = asyncio.Event()
+        self.__runner = None
+        self.__request_count = 0
+        self.__listeners : List[Callable[[ScanInspector], None]] = []
+
+    @property
+    def watching(self) -> List[str]:
+        """The scan ids of the scans that have not yet completed."""
+        return list(self.__scans.keys())
+
+    @property
+    def request_count(self) -> int:
+        """The number of scan list requests executed by this watcher."""
+        return self.__request_count
+
+    def watch(self, scan_id : str, callback : ScanCallback = None) -> asyncio.Future:
+        """Starts watching a scan.
+
+        Watching a scan that is already watched returns the same future.  The scan is watched until it completes
+        or `unwatch` is called, even if a `wait` for the same scan times out.
+
+        :param scan_id: The id of the scan to watch.
+        :type scan_id: str
+
+        :param callback: A coroutine function called with the `ScanInspector` of the scan when the scan completes.
+        :type callback: ScanCallback, optional
+
+        :return: A future that resolves to the `ScanInspector` of the completed scan.
+        :rtype: asyncio.Future
+        """
+        watched = self.__hold(scan_id, callback)
+        watched.pinned = True
+        return watched.future
+
+    def __hold(self, scan_id : str, callback : ScanCallback = None) -> _WatchedScan:
+        watched = self.__scans.get(scan_id, None)
+        if watched is None:
+            watched = _WatchedScan(asyncio.get_running_loop().create_future())
+            self.__scans[scan_id] = watched
+            self.__interval = self.__initial
+            self.__wakeup.set()
+
+        if callback is not None:
+            watched.callbacks.append(callback)
+
+        if self.__runner is None or self.__runner.done():
+            self.__runner = asyncio.get_running_loop().create_task(self.__run())
+
+        return watched
+
+    def __held(self, scan_id : str) -> _WatchedScan:
+        watched = self.__hold(scan_id)
+        watched.holds += 1
+        return watched
+
+    def __release(self, scan_id : str, watched : _WatchedScan) -> None:
+        # Stops watching the scan when the last waiter or subscriber releases it, unless a callback or
+        # `watch` still needs the result.
+        if self.__scans.get(scan_id, None) is not watched:
+            return
+        watched.holds -= 1
+        if watched.holds <= 0 and not watched.pinned and len(watched.callbacks) == 0:
+            self.unwatch(scan_id)
+
+    def unwatch(self, scan_id : str) -> None:
+        """Stops watching a scan.  The future returned by `watch` for the scan is cancelled for all of its waiters.
+
+        :param scan_id: The id of the scan.
+        :type scan_id: str
+        """
+        watched = self.__scans.pop(scan_id, None)
+        if watched is not None and not watched.future.done():
+            watched.future.cancel()
+
+    async def wait(self, scan_id : str, timeout_s : float = None) -> ScanInspector:
+        """Waits for a scan to complete.
+
+        :param scan_id: The id of the scan.
+        :type scan_id: str
+
+        :param timeout_s: The number of seconds to wait for the scan to complete, defaults to no limit.
+        :type timeout_s: float, optional
+
+        :raises asyncio.TimeoutError: Raised if the scan does not complete before the timeout.  The scan is no longer
+                                      watched unless it is watched by another waiter, callback, or event subscriber.
+        :raises ScanException: Raised if the scan can't be found.
+
+        :rtype: ScanInspector
+        """
+        watched = self.__held(scan_id)
+        try:
+            return await asyncio.wait_for(asyncio.shield(watched.future), timeout_s)
+        finally:
+            self.__release(scan_id, watched)
+
+    async def wait_all(self, scan_ids : Iterable[str], timeout_s : float = None) -> Dict[str, ScanInspector]:
+        """Waits for all of the scans to complete.
+
+        :param scan_ids: The ids of the scans.
+        :type scan_ids: Iterable[str]
+
+        :param timeout_s: The number of seconds to wait for all scans to complete, defaults to no limit.
+        :type timeout_s: float, optional
+
+        :raises asyncio.TimeoutError: Raised if the scans do not complete before the timeout.  The scans that have
+                                      not completed are no longer watched unless they are watched by another waiter,
+                                      callback, or event subscriber.
+        :raises ScanException: Raised if a scan can't be found.
+
+        :return: A dictionary of scan ids to the `ScanInspector` of each completed scan.
+        :rtype: Dict[str, ScanInspector]
+        """
+        ids = list(dict.fromkeys(scan_ids))
+        held = [self.__held(scan_id) for scan_id in ids]
+        try:
+            inspectors = await asyncio.wait_for(asyncio.shield(asyncio.gather(*[w.future for w in held])), timeout_s)
+        finally:
+            for scan_id, watched in zip(ids, held):
+                self.__release(scan_id, watched)
+        return dict(zip(ids, inspectors))
+
+    async def close(self) -> None:
+        """Stops watching all scans and stops the background polling task.
+
+        The futures of scans that have not completed are cancelled.
+        """
+        for scan_id in list(self.__scans.keys()):
+            self.unwatch(scan_id)
+
+        runner = self.__runner
+        self.__runner = None
+        if runner is not None and not runner.done():
+            runner.cancel()
+            try:
+                await runner
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self) -> "ScanWatcher":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    def _add_listener(self, listener : Callable[[ScanInspector], None]) -> None:
+        self.__listeners.append(listener)
+
+    def _remove_listener(self, listener : Callable[[ScanInspector], None]) -> None:
+        if listener in self.__listeners:
+            self.__listeners.remove(listener)
+
+    @staticmethod
+    def __tags_match(scan_tags : dict, tags : Dict[str, str]) -> bool:
+        for key, value in tags.items():
+            if key not in scan_tags or (value is not None and scan_tags[key] != value):
+                return False
+        return True
+
+    async def events(self, scan_ids : Iterable[str] = None, project_ids : Iterable[str] = None,
+                     tags : Dict[str, str] = None) -> AsyncGenerator[ScanStatusEvent, None]:
+        """An async generator that emits an event each time the status of a watched scan changes.
+
+        An event is emitted when the root `status` of a scan or any engine entry in `statusDetails` differs from the
+        previous status check.  Status checks that return an identical scan state do not emit events.  The first
+        status check of each scan emits an event with `previous_status` set to None.
+
+        Only watched scans produce events.  Scans given in `scan_ids` are watched by the generator until it ends or
+        is closed; scans matching `project_ids` or `tags` must be watched with `watch`.  If `scan_ids` is provided,
+        the generator ends when all of those scans have completed, otherwise it runs until it is closed.
+
+        Example:
+
+          `async for event in watcher.events(project_ids=[project_id]):`
+
+        :param scan_ids: The ids of scans to watch and report.  Defaults to no restriction.
+        :type scan_ids: Iterable[str], optional
+
+        :param project_ids: Only report scans in these projects.  Defaults to no restriction.
+        :type project_ids: Iterable[str], optional
+
+        :param tags: Only report scans with these tags.  A tag with a value of None matches any value.  Defaults to no restriction.
+        :type tags: Dict[str, str], optional
+
+        :return: A generator that is used in an `async for` statement.
+        :rtype: AsyncGenerator[ScanStatusEvent, None]
+        """
+        ids = None if scan_ids is None else set(scan_ids)
+        projects = None if project_ids is None else set(project_ids)
+        last : Dict[str, ScanInspector] = {}
+        queue = asyncio.Queue()
+
+        def listener(inspector : ScanInspector) -> None:
+            if ids is not None and inspector.scan_id not in ids:
+                return
+            if projects is not None and inspector.project_id not in projects:
+                return
+            if tags is not None and not ScanWatcher.__tags_match(inspector.json.get("tags", None) or {}, tags):
+                return
+
+            previous = last.get(inspector.scan_id, None)
+            before = {} if previous is None else {d['name'] : d for d in previous.status_details}
+            after = {d['name'] : d for d in inspector.status_details}
+            changes = {name : (before.get(name, None), after.get(name, None)) for name in set(before) | set(after)
+                       if before.get(name, None) != after.get(name, None)}
+
+            if previous is not None and previous.status == inspector.status and len(changes) == 0:
+                return
+
+            last[inspector.scan_id] = inspector
+            queue.put_nowait(ScanStatusEvent(inspector.scan_id, inspector.project_id, inspector.status,
+                                             None if previous is None else previous.status, changes, inspector))
+
+        self._add_listener(listener)
+        held = {}
+        try:
+            if ids is not None:
+                held = {scan_id : self.__held(scan_id) for scan_id in ids}
+                finished = asyncio.gather(*[w.future for w in held.values()], return_exceptions=True)
+                finished.add_done_callback(lambda _: queue.put_nowait(None))
+
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            self._remove_listener(listener)
+            for scan_id, watched in held.items():
+                self.__release(scan_id, watched)
+
+    @staticmethod
+    def __snapshot(scan : dict) -> str:
+        return json.dumps([scan.get("status", None), scan.get("statusDetails", [])], sort_keys=True)
+
+    async def __fetch(self, scan_ids : List[str]) -> List[dict]:
+        self.__request_count += 1
+        return json_on_ok(await retrieve_list_of_scans(self.__client, scan_ids=scan_ids, limit=len(scan_ids)))['scans']
+
+    async def __complete(self, watched : _WatchedScan, inspector : ScanInspector) -> None:
+        _log = logging.getLogger("ScanWatcher")
+
+        if not watched.future.done():
+            watched.future.set_result(inspector)
+
+        for callback in watched.callbacks:
+            try:
+                await callback(inspector)
+            except asyncio.CancelledError:
+                raise
+            except BaseException as ex:
+                # The library's exceptions derive from BaseException, so they are not caught by Exception.
+                _log.exception(ex)
+
+    async def __poll(self) -> bool:
+        ids = list(self.__scans.keys())
+        batches = [ids[i:i + self.__batch_size] for i in range(0, len(ids), self.__batch_size)]
+        found = {}
+        for scans in await asyncio.gather(*[self.__fetch(batch) for batch in batches]):
+            for scan in scans:
+                found[scan['id']] = scan
+
+        changed = False
+        completions = []
+        for scan_id in ids:
+            watched = self.__scans.get(scan_id, None)
+            if watched is None:
+                continue
+
+            scan = found.get(scan_id, None)
+            if scan is None:
+                watched.misses += 1
+                if watched.misses >= self.__max_misses:
+                    self.__scans.pop(scan_id)
+                    if not watched.future.done():
+                        watched.future.set_exception(ScanException(f"Scan {scan_id} was not found."))
+                continue
+
+            watched.misses = 0
+            snapshot = ScanWatcher.__snapshot(scan)
+            if snapshot != watched.snapshot:
+                changed = True
+                watched.snapshot = snapshot
+
+            inspector = ScanInspector(scan)
+            for listener in list(self.__listeners):
+                listener(inspector)
+
+            if not inspector.executing:
+                self.__scans.pop(scan_id)
+                completions.append(self.__complete(watched, inspector))
+
+        await asyncio.gather(*completions)
+        return changed
+
+    def __fail_all(self, ex : BaseException) -> None:
+        scans = self.__scans
+        self.__scans = {}
+        for watched in scans.values():
+            if not watched.future.done():
+                watched.future.set_exception(ex)
+
+    async def __run(self) -> None:
+        _log = logging.getLogger("ScanWatcher")
+
+        while len(self.__scans) > 0:
+            self.__wakeup.clear()
+            try:
+                changed = await self.__poll()
+                self.__interval = self.__initial if changed else min(self.__interval * self.__backoff, self.__max)
+            except asyncio.CancelledError:
+                raise
+            except (ResponseException, CommunicationException) as ex:
+                _log.warning(f"Scan status check failed: {ex}")
+                self.__interval = min(self.__interval * self.__backoff, self.__max)
+            except BaseException as ex:
+                # Failures such as an AuthException won't resolve by polling again, so the waiters receive the exception.
+                _log.exception(ex)
+                self.__fail_all(ex)
+                break
+
+            if len(self.__scans) == 0:
+                break
+
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), self.__interval)
+            except asyncio.TimeoutError:
+                pass
@@ -1,14 +1,17 @@
-from typing import Union, List, Dict
-from jsonpath_ng import parse
+from typing import Union, List, Dict, FrozenSet, Iterable
+from dataclasses import dataclass, field
 from requests import Response
 from .projects import ProjectRepoConfig
 from .. import CxOneClient
 from ..util import json_on_ok
-from ..exceptions import ScanException
+from ..exceptions import ScanException, ResponseException
 from ..low.scan_configuration import retrieve_project_configuration
 from ..low.scans import retrieve_scan_details, run_a_repo_scan, run_a_scan
-from ..low.scan_configuration import retrieve_tenant_configuration
-from ..low.uploads import generate_upload_link, upload_to_link
+from .tenant_config_cache import TenantConfigurationCache
+from ..low.uploads import generate_upload_link
+from ..transfer import UploadProgressCallback, upload_directory, upload_file
+from ..zip_stream import ZipOptions, ZipStats
+from .upload_dedup import DedupAction, UploadDedupIndex, hash_directory, hash_file
 from .projects import ProjectRepoConfig
 from enum import Enum
 from pathlib import Path
@@ -122,15 +125,70 @@ class ScanInvoker:
     async def __get_logical_engine_config(client : CxOneClient, repo_config : ProjectRepoConfig, engine_config : List[Dict], branch : str) -> List[Dict]:
         if engine_config is not None:
             return engine_config
-        elif len(await repo_config.get_enabled_scanners(branch)) > 0:
-            return [{"type" : eng, "value" : {}} for eng in await repo_config.get_enabled_scanners(branch)]
+
+        scanners = await repo_config.get_enabled_scanners(branch)
+        if len(scanners) > 0:
+            return [{"type" : eng, "value" : {}} for eng in scanners]
         else:
             return ScanInvoker.__DEFAULT_ENGINE_CONFIG
 
+    @staticmethod
+    async def __resolve_engine_config(client : CxOneClient, project_id : str, engine_config : List[Dict], branch : str) -> List[Dict]:
+        if engine_config is not None:
+            return engine_config
+
+        return await ScanInvoker.__get_logical_engine_config(client, await ProjectRepoConfig.from_project_id(client, project_id),
+                                                             engine_config, branch)
+
+    @staticmethod
+    async def __concurrently(*aws) -> list:
+        # Runs independent steps of a scan submission at the same time.  If a step fails, the
+        # remaining steps are cancelled so that, for example, an upload does not continue after
+        # the scan configuration can't be resolved.
+        tasks = [asyncio.ensure_future(aw) for aw in aws]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @staticmethod
+    async def __dedup_previous_scan(client : CxOneClient, dedup : UploadDedupIndex, project_id : str, branch : str,
+                                    content_hash : str, engine_config : List[Dict]) -> Response:
+        entry = await dedup.lookup(project_id, branch, content_hash, engine_config)
+        if entry is None:
+            return None
+
+        _log = logging.getLogger("ScanInvoker")
+
+        if dedup.action == DedupAction.WARN:
+            _log.warning(f"Content for project {project_id} branch {branch} is identical to the content of scan {entry.scan_id}.")
+            return None
+
+        # Only a completed scan, or one still queued or running for the same content, is reused.  A scan that
+        # ended with a Partial status is scanned again like a failed one.
+        response = await retrieve_scan_details(client, entry.scan_id)
+        if response.ok and ScanInspector(response.json()).status in ScanModel.SUCCESS_STATES | ScanModel.EXECUTING_STATES:
+            _log.info(f"Skipping upload for project {project_id} branch {branch}, content is identical to scan {entry.scan_id}.")
+            return response
+
+        await dedup.forget(entry.scan_id)
+        return None
+
+    @staticmethod
+    async def __dedup_record(dedup : UploadDedupIndex, response : Response, project_id : str, branch : str,
+                             content_hash : str, engine_config : List[Dict]) -> None:
+        if response.ok:
+            scan_id = response.json().get('id', None)
+            if scan_id is not None:
+                await dedup.record(project_id, branch, content_hash, scan_id, engine_config)
 
     @staticmethod
     async def scan_by_local_zip_upload(client : CxOneClient, project_id : str, src_zip_path : str, branch : str, 
-                                       engine_config : List[Dict] = None, scan_tags : dict = None) -> Response:
+                                       engine_config : List[Dict] = None, scan_tags : dict = None,
+                                       dedup : UploadDedupIndex = None, progress : UploadProgressCallback = None) -> Response:
         """Invokes a scan by uploading a local zip file.
         
         :param client: The CxOneClient instance used to communicate with Checkmarx One
@@ -151,18 +209,35 @@ class ScanInvoker:
         :param scan_tags: A list of key/value pairs to use as scan tags.
         :type scan_tags: Dict,optional
 
+        :param dedup: An index of previously uploaded content.  If the zip file is identical to the content of the last
+                      scan of the project and branch, the index's action is applied.  If the upload is skipped, the
+                      response contains the details of the previous scan.  Only a previous scan that completed
+                      successfully or is still queued or running is reused.
+        :type dedup: UploadDedupIndex,optional
+
+        :param progress: A function called with the progress and throughput of the zip file upload.
+        :type progress: UploadProgressCallback,optional
+
         """
         
-        effective_engine_config = engine_config
-        if engine_config is None:
-            effective_engine_config = await ScanInvoker.__get_logical_engine_config(client, 
-                                                                                    await ProjectRepoConfig.from_project_id(client, project_id),
-                                                                                    engine_config, branch)
+        if dedup is not None:
+            # The upload waits for the dedup check so it can be skipped.
+            effective_engine_config, content_hash = await ScanInvoker.__concurrently(
+                ScanInvoker.__resolve_engine_config(client, project_id, engine_config, branch), hash_file(src_zip_path))
+            previous = await ScanInvoker.__dedup_previous_scan(client, dedup, project_id, branch, content_hash, effective_engine_config)
+            if previous is not None:
+                return previous
+            upload_url = await ScanInvoker.__upload_zip(client, src_zip_path, progress=progress)
+        else:
+            effective_engine_config, upload_url = await ScanInvoker.__concurrently(
+                ScanInvoker.__resolve_engine_config(client, project_id, engine_config, branch),
+                ScanInvoker.__upload_zip(client, src_zip_path, progress=progress))
+
         submit_payload = { "project" : {"id": project_id},
                             "type" : "upload",
                             "handler" : 
                                 { 
-                                    "uploadUrl" : await ScanInvoker.__upload_zip(client, src_zip_path),
+                                    "uploadUrl" : upload_url,
                                     "branch" : "unknown" if branch is None else branch
                                 },
                                 "config" : effective_engine_config
@@ -171,7 +246,92 @@ class ScanInvoker:
         if scan_tags is not None:
             submit_payload["tags"] = scan_tags
 
-        return await run_a_scan(client, submit_payload)
+        response = await run_a_scan(client, submit_payload)
+        if dedup is not None:
+            await ScanInvoker.__dedup_record(dedup, response, project_id, branch, content_hash, effective_engine_config)
+        return response
+
+    @staticmethod
+    async def scan_by_local_directory(client : CxOneClient, project_id : str, src_dir : str, branch : str,
+                                      engine_config : List[Dict] = None, scan_tags : dict = None,
+                                      zip_options : ZipOptions = None, streaming : bool = True,
+                                      zip_stats : ZipStats = None, dedup : UploadDedupIndex = None,
+                                      progress : UploadProgressCallback = None) -> Response:
+        """Invokes a scan by compressing and uploading a local directory.
+
+        The directory is compressed while it is uploaded; a zip file does not need to be created first.
+
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :param project_id: The project ID where the scan will be invoked.
+        :type project_id: str
+
+        :param src_dir: A path to a local directory containing the code to scan.
+        :type src_dir: str or path-like
+
+        :param branch: The name of the branch used when performing the scan.
+        :type branch: str
+
+        :param engine_config: A list of JSON dictionaries containing the engine configuration parameters
+        :type engine_config: List[Dict],optional
+
+        :param scan_tags: A list of key/value pairs to use as scan tags.
+        :type scan_tags: Dict,optional
+
+        :param zip_options: Options that control compression and which files are uploaded.
+        :type zip_options: ZipOptions,optional
+
+        :param streaming: Set to false to write the zip to a temporary file before uploading.
+        :type streaming: bool,optional
+
+        :param zip_stats: Counters describing the uploaded zip, including the bytes excluded and pruned by `zip_options`.
+        :type zip_stats: ZipStats,optional
+
+        :param dedup: An index of previously uploaded content.  If the files selected by `zip_options` are identical to
+                      the content of the last scan of the project and branch, the index's action is applied.  If the
+                      upload is skipped, the response contains the details of the previous scan.  Only a previous
+                      scan that completed successfully or is still queued or running is reused.
+        :type dedup: UploadDedupIndex,optional
+
+        :param progress: A function called with the progress and throughput of the zip upload.
+        :type progress: UploadProgressCallback,optional
+
+        """
+        def upload_func(url):
+            return upload_directory(client, url, src_dir, zip_options, streaming, zip_stats, progress)
+
+        if dedup is not None:
+            # The upload waits for the dedup check so it can be skipped.
+            effective_engine_config, content_hash = await ScanInvoker.__concurrently(
+                ScanInvoker.__resolve_engine_config(client, project_id, engine_config, branch),
+                hash_directory(src_dir, zip_options, None if zip_options is None else zip_options.workers))
+            previous = await ScanInvoker.__dedup_previous_scan(client, dedup, project_id, branch, content_hash, effective_engine_config)
+            if previous is not None:
+                return previous
+            upload_url = await ScanInvoker.__upload(client, upload_func)
+        else:
+            effective_engine_config, upload_url = await ScanInvoker.__concurrently(
+                ScanInvoker.__resolve_engine_config(client, project_id, engine_config, branch),
+                ScanInvoker.__upload(client, upload_func))
+
+        submit_payload = { "project" : {"id": project_id},
+                            "type" : "upload",
+                            "handler" : 
+                                { 
+                                    "uploadUrl" : upload_url,
+                                    "branch" : "unknown" if branch is None else branch
+                                },
+                                "config" : effective_engine_config
+                         }
+        
+        if scan_tags is not None:
+            submit_payload["tags"] = scan_tags
+
+        response = await run_a_scan(client, submit_payload)
+        if dedup is not None:
+            await ScanInvoker.__dedup_record(dedup, response, project_id, branch, content_hash, effective_engine_config)
+        return response
 
     @staticmethod
     async def scan_by_project_config(client : CxOneClient, project_id : str, branch : str = None, 
@@ -196,13 +356,15 @@ class ScanInvoker:
         """
         repo_cfg = await ProjectRepoConfig.from_project_id(client, project_id)
 
-        if await repo_cfg.primary_branch is None and branch is None:
-            raise ScanException("Branch was not provided and no primary branch is configured in the project's general settings.")
-        else:
-            effective_branch = branch if branch is not None else await repo_cfg.primary_branch
-        
-        if await repo_cfg.repo_url is None:
-            raise ScanException("There is no repository URL configured in the project's general settings.")
+        async def get_effective_branch():
+            return branch if branch is not None else await repo_cfg.primary_branch
+
+        async def get_enabled_scanners():
+            if engine_config is not None:
+                return [x['type'] for x in engine_config]
+
+            effective_branch = await get_effective_branch()
+            return [] if effective_branch is None else await repo_cfg.get_enabled_scanners(effective_branch)
 
         submit_payload = {
             "project" : {"id" : project_id}
@@ -211,36 +373,44 @@ class ScanInvoker:
         if scan_tags is not None:
             submit_payload['tags'] = scan_tags
 
+        if not await repo_cfg.is_scm_imported:
+            effective_branch, repo_url, logical_engine_config = await ScanInvoker.__concurrently(
+                get_effective_branch(), repo_cfg.repo_url,
+                ScanInvoker.__get_logical_engine_config(client, repo_cfg, engine_config, branch))
+        else:
+            effective_branch, repo_url, scm_type, scm_repo_id, repo_id, scm_org, scm_id, enabled_scanners = \
+                await ScanInvoker.__concurrently(get_effective_branch(), repo_cfg.repo_url, repo_cfg.scm_type,
+                                                 repo_cfg.scm_repo_id, repo_cfg.repo_id, repo_cfg.scm_org,
+                                                 repo_cfg.scm_id, get_enabled_scanners())
+
+        if effective_branch is None:
+            raise ScanException("Branch was not provided and no primary branch is configured in the project's general settings.")
+
+        if repo_url is None:
+            raise ScanException("There is no repository URL configured in the project's general settings.")
+
         if not await repo_cfg.is_scm_imported:
             submit_payload['type'] = "git"
             submit_payload['handler'] = {}
-            submit_payload['config'] = await ScanInvoker.__get_logical_engine_config(client, repo_cfg, engine_config, branch)
-
+            submit_payload['config'] = logical_engine_config
 
             submit_payload['handler']['branch'] = effective_branch
-            submit_payload['handler']['repoUrl'] = await repo_cfg.repo_url
+            submit_payload['handler']['repoUrl'] = repo_url
             
             return await run_a_scan(client, submit_payload)
         else:
-            if engine_config is not None:
-                enabled_scanners = [x['type'] for x in engine_config]
-            else:
-                enabled_scanners = await repo_cfg.get_enabled_scanners(effective_branch)
-            
-            submit_payload["repoOrigin"] = await repo_cfg.scm_type
+            submit_payload["repoOrigin"] = scm_type
             submit_payload["project"] = {
-                "repoIdentity" : await repo_cfg.scm_repo_id,
-                "repoUrl" : await repo_cfg.repo_url,
+                "repoIdentity" : scm_repo_id,
+                "repoUrl" : repo_url,
                 "projectId" : project_id,
                 "defaultBranch" : effective_branch,
                 "scannerTypes" : enabled_scanners,
-                "repoId" : await repo_cfg.repo_id
+                "repoId" : repo_id
             }
 
-            scm_org = await repo_cfg.scm_org
-
             return await run_a_repo_scan(client, 
-                                         await repo_cfg.scm_id,
+                                         scm_id,
                                          project_id,
                                          scm_org \
                                            if scm_org is not None else "anyorg", 
@@ -285,12 +455,17 @@ class ScanInvoker:
         
         if engine_config is None or branch is None:
             repo_config = await ProjectRepoConfig.from_project_id(client, project_id)
-            effective_engine_config = await ScanInvoker.__get_logical_engine_config(client, 
-                                        repo_config, engine_config, branch)
+
+            async def get_primary_branch():
+                return None if branch is not None else await repo_config.primary_branch
+
+            effective_engine_config, primary_branch = await ScanInvoker.__concurrently(
+                ScanInvoker.__get_logical_engine_config(client, repo_config, engine_config, branch),
+                get_primary_branch())
             if branch is not None:
                 effective_branch = branch
-            elif await repo_config.primary_branch is not None:
-                effective_branch = await repo_config.primary_branch
+            elif primary_branch is not None:
+                effective_branch = primary_branch
             else:
                 raise ScanException("Branch could not be determined")
         else:
@@ -370,8 +545,13 @@ class ScanInvoker:
 
 
     @staticmethod
-    async def __upload_zip(cxone_client : CxOneClient, zip_path : str, max_retries : int = 5, retry_delay_s : int = 3) -> str:
-        _log = logging.getLogger("ScanInvoker.__upload_zip")
+    async def __upload_zip(cxone_client : CxOneClient, zip_path : str, max_retries : int = 5, retry_delay_s : int = 3,
+                           progress : UploadProgressCallback = None) -> str:
+        return await ScanInvoker.__upload(cxone_client, lambda url: upload_file(cxone_client, url, zip_path, progress), max_retries, retry_delay_s)
+
+    @staticmethod
+    async def __upload(cxone_client : CxOneClient, upload_func, max_retries : int = 5, retry_delay_s : int = 3) -> str:
+        _log = logging.getLogger("ScanInvoker.__upload")
 
         upload_url = None
         retries = 0
@@ -380,16 +560,23 @@ class ScanInvoker:
                 await asyncio.sleep(retry_delay_s)
             retries += 1
 
-            link_response = await generate_upload_link(cxone_client)
-            if link_response.ok:
-                upload_url = link_response.json()['url']
+            if cxone_client.upload_link_pool is not None:
+                try:
+                    upload_url = await cxone_client.upload_link_pool.acquire()
+                except ResponseException as ex:
+                    _log.debug(f"Failed to generate link: {ex}")
+                    continue
             else:
-                _log.debug(f"Failed to generate link: {link_response.status_code} {link_response.text}")
-                continue
+                link_response = await generate_upload_link(cxone_client)
+                if link_response.ok:
+                    upload_url = link_response.json()['url']
+                else:
+                    _log.debug(f"Failed to generate link: {link_response.status_code} {link_response.text}")
+                    continue
 
-            upload_response = await upload_to_link(cxone_client, upload_url, zip_path)
+            upload_response = await upload_func(upload_url)
             if not upload_response.ok:
-                _log.debug(f"Failed to upload zip: {link_response.status_code} {link_response.text}")
+                _log.debug(f"Failed to upload zip: {upload_response.status_code} {upload_response.text}")
                 upload_url = None
                 continue
             else:
@@ -403,117 +590,155 @@ class ScanInvoker:
 
 
 
-class ScanInspector:
-    __root_status_query = parse("$.status")
-    __scan_engines_query = parse("$.engines")
-    __status_details_query = parse("$.statusDetails")
+class ScanModel:
+    """The status of a scan parsed once from the JSON returned by the scan APIs.
+
+    The scan's engine states and classification are computed when the model is created, so reading them
+    does not inspect the JSON again.
+    """
 
-    __projectid_query = parse("$.projectId")
-    __scanid_query = parse("$.id")
+    __slots__ = ("json", "scan_id", "project_id", "status", "engines", "status_details", "engine_states",
+                 "executing", "failed", "successful")
 
-    __executing_states = ["Queued", "Running"]
-    __failed_states = ["Failed", "Canceled"]
-    __maybe_states = ["Partial"]
-    __success_states = ["Completed"]
+    EXECUTING_STATES = frozenset(["Queued", "Running"])
+    FAILED_STATES = frozenset(["Failed", "Canceled"])
+    MAYBE_STATES = frozenset(["Partial"])
+    SUCCESS_STATES = frozenset(["Completed"])
 
     def __init__(self, json : dict):
+        """
+        :param json: A json dictionary of the scan data from the retrieve_scan_details or retrieve_list_of_scans API
+        :type json: Dict
+        """
+        self.json : dict = json
+        self.scan_id : str = json.get("id", None)
+        self.project_id : str = json.get("projectId", None)
+        self.status : str = json.get("status", None)
+        self.engines : FrozenSet[str] = frozenset(json.get("engines", None) or [])
+        self.status_details : List[dict] = json.get("statusDetails", None) or []
+
+        self.engine_states : FrozenSet[str] = frozenset([d['status'] for d in self.status_details if d['name'] in self.engines])
+        """The distinct states of the requested engines."""
+
+        self.executing : bool = self.status in ScanModel.EXECUTING_STATES or \
+            (self.status in ScanModel.MAYBE_STATES and
+             not self.engine_states.isdisjoint(ScanModel.EXECUTING_STATES | ScanModel.MAYBE_STATES))
+
+        self.failed : bool = self.status in ScanModel.FAILED_STATES
+
+        if self.status in ScanModel.SUCCESS_STATES:
+            self.successful = True
+        elif self.executing or self.status not in ScanModel.MAYBE_STATES:
+            self.successful = False
+        else:
+            self.successful = self.engine_states.isdisjoint(ScanModel.MAYBE_STATES | ScanModel.FAILED_STATES) and \
+                not self.engine_states.isdisjoint(ScanModel.SUCCESS_STATES)
+
+
+@dataclass
+class ScanClassification:
+    """Scans grouped by their status."""
+    executing : List["ScanInspector"] = field(default_factory=list)
+    successful : List["ScanInspector"] = field(default_factory=list)
+    failed : List["ScanInspector"] = field(default_factory=list)
+    incomplete : List["ScanInspector"] = field(default_factory=list)
+    """Scans that are no longer executing but were neither successful nor failed, such as partial scans with failed engines."""
+
+
+class ScanInspector:
+
+    __slots__ = ("__model",)
+
+    def __init__(self, json : Union[dict, ScanModel]):
         """A class used to inspect the status of a scan.
 
-        :param json: A json dictionary of the scan data from the retrieve_scan_details API
+        :param json: A json dictionary of the scan data from the retrieve_scan_details API, or a ScanModel
         :type json: Dict
         """
-        self.__json = json
+        self.__model = json if isinstance(json, ScanModel) else ScanModel(json)
 
-    def __root_status(self):
-        return ScanInspector.__root_status_query.find(self.__json)[0].value
+    @staticmethod
+    def inspect_many(scans : Iterable[dict]) -> ScanClassification:
+        """Classifies many scans by their status.
 
-    def __requested_engines(self):
-        return ScanInspector.__scan_engines_query.find(self.__json)[0].value
+        :param scans: The json dictionaries of the scans, such as the `scans` element of the retrieve_list_of_scans API response.
+        :type scans: Iterable[dict]
 
-    def __status_details(self):
-        details = ScanInspector.__status_details_query.find(self.__json)
-        if len(details) > 0:
-            return details[0].value
-        else:
-            return []
+        :rtype: ScanClassification
+        """
+        result = ScanClassification()
+        for scan in scans:
+            model = ScanModel(scan)
+            if model.executing:
+                result.executing.append(ScanInspector(model))
+            elif model.successful:
+                result.successful.append(ScanInspector(model))
+            elif model.failed:
+                result.failed.append(ScanInspector(model))
+            else:
+                result.incomplete.append(ScanInspector(model))
+
+        return result
+
+    @property
+    def model(self) -> ScanModel:
+        """The parsed scan."""
+        return self.__model
 
     @property
     def project_id(self):
         """The project ID containing the scan."""
-        return ScanInspector.__projectid_query.find(self.__json)[0].value
+        return self.__model.project_id
 
     @property
     def scan_id(self):
         """The scan ID of the scan."""
-        return ScanInspector.__scanid_query.find(self.__json)[0].value
-
-    def __current_engine_states(self):
-        return_states = []
-        engines = self.__requested_engines()
-        details = self.__status_details()
-        for detail_dict in details:
-            if detail_dict['name'] in engines:
-                if detail_dict['status'] not in return_states:
-                    return_states.append(detail_dict['status'])
-
-        return return_states
-
+        return self.__model.scan_id
 
     @property
     def json(self) -> dict:
         """The raw scan details json"""
-        return self.__json
+        return self.__model.json
+
+    @property
+    def status(self) -> str:
+        """The root status of the scan."""
+        return self.__model.status
+
+    @property
+    def status_details(self) -> List[dict]:
+        """The status details for each engine in the scan."""
+        return self.__model.status_details
 
     @property
     def executing(self) -> bool:
         """Returns a boolean value indicating if the scan is currently executing."""
-        if self.__root_status() in ScanInspector.__executing_states:
-            return True
-        elif self.__root_status() in ScanInspector.__maybe_states:
-            return len([s for s in self.__current_engine_states() if s in
-                        ScanInspector.__executing_states + ScanInspector.__maybe_states]) > 0
-
-        return False
+        return self.__model.executing
 
     @property
     def failed(self):
         """Returns a boolean value indicating if the scan ended in a failed state."""
-        if self.__root_status() in ScanInspector.__failed_states:
-            return True
-
-        return False
+        return self.__model.failed
 
     @property
     def successful(self):
         """Returns a boolean value indicating if the scan ended in a successful state."""
-        if self.__root_status() in ScanInspector.__success_states:
-            return True
-        elif self.executing:
-            return False
-        elif self.__root_status() in ScanInspector.__maybe_states:
-            maybe = [s for s in self.__current_engine_states() if s in ScanInspector.__maybe_states]
-            success = [s for s in self.__current_engine_states()
-                       if s in ScanInspector.__success_states]
-            failed = [s for s in self.__current_engine_states()
-                       if s in ScanInspector.__failed_states]
-            return len(maybe) == 0 and len(failed) == 0 and len(success) > 0
-
-        return False
+        return self.__model.successful
 
     @property
     def state_msg(self):
         """A message about the state of the scan."""
         engine_statuses = []
 
-        for detail in self.__status_details():
+        for detail in self.__model.status_details:
             stub = f"{detail['name']}: {detail['status']}"
-            if detail['status'] not in ScanInspector.__success_states and \
+            if detail['status'] not in ScanModel.SUCCESS_STATES and \
                 len(detail['details']) > 0:
                 engine_statuses.append(f"{stub}({detail['details']})")
             else:
                 engine_statuses.append(stub)
 
-        return f"Status: {self.__root_status()} [{'|'.join(engine_statuses)}]"
+        return f"Status: {self.__model.status} [{'|'.join(engine_statuses)}]"
 
 
 class ScanFilterConfig:
@@ -535,14 +760,15 @@ class ScanFilterConfig:
         :param project_config: A JSON dictionary returned from the retrieve_project_configuration API.
         :type project_config: list
 
-        :param tenant_config: A JSON dictionary returned from the retrieve_tenant_configuration API.
+        :param tenant_config: A JSON dictionary returned from the retrieve_tenant_configuration API.  If not provided,
+                              the tenant configuration is read from the client's shared `TenantConfigurationCache`.
         :type tenant_config: list, optional
 
         """
         retval = ScanFilterConfig()
 
         if tenant_config is None:
-            working_tenant_config = json_on_ok(await retrieve_tenant_configuration(cxone_client) )
+            working_tenant_config = await TenantConfigurationCache.for_client(cxone_client).get()
         else:
             working_tenant_config = tenant_config
 
@@ -584,6 +810,41 @@ class ScanFilterConfig:
         return await ScanFilterConfig.from_project_config_json(cxone_client,
                         json_on_ok(await retrieve_project_configuration(cxone_client, project_id=project_id)))
 
+    @staticmethod
+    async def for_projects(cxone_client : CxOneClient, project_ids : Iterable[str], concurrency : int = 10,
+                           tenant_config : list = None) -> Dict[str, "ScanFilterConfig"]:
+        """Creates instances of ScanFilterConfig for many projects.
+
+        The project configurations are retrieved concurrently and combined with a single snapshot of the
+        tenant configuration.
+
+        :param cxone_client: The CxOneClient instance used to communicate with Checkmarx One.
+        :type cxone_client: CxOneClient
+
+        :param project_ids: The project IDs.
+        :type project_ids: Iterable[str]
+
+        :param concurrency: The maximum number of project configurations retrieved at the same time.  Defaults to 10.
+        :type concurrency: int, optional
+
+        :param tenant_config: A JSON dictionary returned from the retrieve_tenant_configuration API.  If not provided,
+                              the tenant configuration is read from the client's shared `TenantConfigurationCache`.
+        :type tenant_config: list, optional
+
+        :return: A dictionary of project IDs to the ScanFilterConfig for each project.
+        :rtype: Dict[str, ScanFilterConfig]
+        """
+        tenant_snapshot = tenant_config if tenant_config is not None else await TenantConfigurationCache.for_client(cxone_client).get()
+        limit = asyncio.Semaphore(max(1, concurrency))
+
+        async def load(project_id : str) -> "ScanFilterConfig":
+            async with limit:
+                project_config = json_on_ok(await retrieve_project_configuration(cxone_client, project_id=project_id))
+            return await ScanFilterConfig.from_project_config_json(cxone_client, project_config, tenant_snapshot)
+
+        ids = list(dict.fromkeys(project_ids))
+        return dict(zip(ids, await asyncio.gather(*[load(project_id) for project_id in ids])))
+
     @staticmethod
     async def from_repo_config(cxone_client : CxOneClient, repo_config : ProjectRepoConfig):
         """Creates an instance of ScanFilterConfig using an instance of ProjectRepoConfig
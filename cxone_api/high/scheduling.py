@@ -0,0 +1,150 @@
+from typing import Any, Awaitable, Callable
+from dataclasses import dataclass, field
+from time import perf_counter
+import asyncio, heapq, random
+
+
+@dataclass(order=True)
+class _PollEntry:
+  due : float
+  seq : int
+  poll : Callable[[], Awaitable[Any]] = field(compare=False)
+  future : asyncio.Future = field(compare=False)
+  delay : float = field(compare=False)
+  deadline : float = field(compare=False)
+
+
+class PollScheduler:
+  """Polls the status of many pending server-side operations from a single scheduling task.
+
+  Each pending operation is registered with `wait` along with a coroutine function that checks its status.
+  The status check returns None while the operation is pending, returns a value when the operation is complete,
+  or raises an exception when the operation has failed.  The delay between status checks for each operation
+  grows by `backoff_factor` up to `max_delay_s`, and a random jitter is applied so that operations
+  registered at the same time do not poll in lockstep.
+  """
+
+  def __init__(self, initial_delay_s : float = 1.0, max_delay_s : float = 30.0, backoff_factor : float = 1.5,
+               jitter : float = 0.25, concurrency : int = 10):
+    """
+    :param initial_delay_s: The number of seconds to wait before the first status check, defaults to 1.
+    :type initial_delay_s: float
+
+    :param max_delay_s: The maximum number of seconds between status checks of an operation, defaults to 30.
+    :type max_delay_s: float
+
+    :param backoff_factor: The factor used to increase the delay after each status check, defaults to 1.5.
+    :type backoff_factor: float
+
+    :param jitter: The fraction of each delay that is randomized, defaults to 0.25.
+    :type jitter: float
+
+    :param concurrency: The maximum number of status checks executing at the same time, defaults to 10.
+    :type concurrency: int
+    """
+    self.__initial = initial_delay_s
+    self.__max = max_delay_s
+    self.__backoff = backoff_factor
+    self.__jitter = jitter
+    self.__semaphore = asyncio.Semaphore(max(1, concurrency))
+    self.__heap = []
+    self.__seq = 0
+    self.__in_flight = 0
+    self.__wakeup = asyncio.Event()
+    self.__runner = None
+    self.__poll_count = 0
+
+  @property
+  def pending(self) -> int:
+    """The number of operations that are waiting for completion."""
+    return len([e for e in self.__heap if not e.future.done()]) + self.__in_flight
+
+  @property
+  def poll_count(self) -> int:
+    """The number of status checks executed by this scheduler."""
+    return self.__poll_count
+
+  def __jittered(self, delay : float) -> float:
+    return max(0.0, delay * (1.0 + random.uniform(-self.__jitter, self.__jitter)))
+
+  def __schedule(self, entry : _PollEntry) -> None:
+    self.__seq += 1
+    entry.seq = self.__seq
+    entry.due = min(perf_counter() + self.__jittered(entry.delay), entry.deadline)
+    heapq.heappush(self.__heap, entry)
+    self.__wakeup.set()
+
+    if self.__runner is None or self.__runner.done():
+      self.__runner = asyncio.get_running_loop().create_task(self.__run())
+
+  async def wait(self, poll : Callable[[], Awaitable[Any]], timeout_s : float = None) -> Any:
+    """Waits for an operation to complete.
+
+    :param poll: A coroutine function that checks the status of the operation.
+    :type poll: Callable[[], Awaitable[Any]]
+
+    :param timeout_s: The number of seconds to wait for the operation to complete, defaults to no limit.
+    :type timeout_s: float, optional
+
+    :raises asyncio.TimeoutError: Raised if the operation does not complete before the timeout.
+
+    :return: The value returned by the status check that indicated completion.
+    :rtype: Any
+    """
+    deadline = float("inf") if timeout_s is None else perf_counter() + timeout_s
+    entry = _PollEntry(0, 0, poll, asyncio.get_running_loop().create_future(), self.__initial, deadline)
+    self.__schedule(entry)
+    return await entry.future
+
+  async def __check(self, entry : _PollEntry) -> None:
+    try:
+      async with self.__semaphore:
+        if entry.future.done():
+          return
+        self.__poll_count += 1
+        result = await entry.poll()
+
+      if entry.future.done():
+        return
+      elif result is not None:
+        entry.future.set_result(result)
+      elif perf_counter() >= entry.deadline:
+        entry.future.set_exception(asyncio.TimeoutError())
+      else:
+        entry.delay = min(entry.delay * self.__backoff, self.__max)
+        self.__schedule(entry)
+    except asyncio.CancelledError:
+      if not entry.future.done():
+        entry.future.cancel()
+      raise
+    except BaseException as ex:
+      if not entry.future.done():
+        entry.future.set_exception(ex)
+    finally:
+      self.__in_flight -= 1
+      self.__wakeup.set()
+
+  async def __run(self) -> None:
+    checks = set()
+    try:
+      while len(self.__heap) > 0 or self.__in_flight > 0:
+        self.__wakeup.clear()
+        now = perf_counter()
+
+        while len(self.__heap) > 0 and self.__heap[0].due <= now:
+          entry = heapq.heappop(self.__heap)
+          if entry.future.done():
+            continue
+          self.__in_flight += 1
+          task = asyncio.get_running_loop().create_task(self.__check(entry))
+          checks.add(task)
+          task.add_done_callback(checks.discard)
+
+        sleep = None if len(self.__heap) == 0 else self.__heap[0].due - perf_counter()
+        try:
+          await asyncio.wait_for(self.__wakeup.wait(), sleep)
+        except asyncio.TimeoutError:
+          pass
+    finally:
+      for task in list(checks):
+        task.cancel()
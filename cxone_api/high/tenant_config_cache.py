@@ -0,0 +1,104 @@
+from typing import List
+from .. import CxOneClient
+from ..util import json_on_ok
+from ..low.scan_configuration import retrieve_tenant_configuration
+import asyncio, time, weakref
+
+
+class TenantConfigurationCache:
+    """A cache of the tenant scan configuration returned by the retrieve_tenant_configuration API.
+
+    The tenant configuration is retrieved at most once every `ttl_s` seconds.  Concurrent requests for an
+    expired configuration share a single API call.  Use `for_client` to obtain the cache shared by all users
+    of a CxOneClient instance.
+
+    The configuration returned by `get` is shared by all callers and must be treated as read-only.
+    """
+
+    __shared = weakref.WeakKeyDictionary()
+
+    def __init__(self, client : CxOneClient, ttl_s : float = 300.0):
+        """
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :param ttl_s: The number of seconds a retrieved configuration is used.  Defaults to 300.
+        :type ttl_s: float, optional
+        """
+        self.__client = client
+        self.__ttl = ttl_s
+        self.__config = None
+        self.__fetched_at = None
+        self.__generation = 0
+        self.__lock = asyncio.Lock()
+
+    @staticmethod
+    def for_client(client : CxOneClient) -> "TenantConfigurationCache":
+        """Returns the cache shared by all users of a client, creating it if needed.
+
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :rtype: TenantConfigurationCache
+        """
+        cache = TenantConfigurationCache.__shared.get(client, None)
+        if cache is None:
+            cache = TenantConfigurationCache(client)
+            TenantConfigurationCache.__shared[client] = cache
+        return cache
+
+    @staticmethod
+    def invalidate_for(client : CxOneClient) -> None:
+        """Invalidates the shared cache of a client, if it exists.
+
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+        """
+        cache = TenantConfigurationCache.__shared.get(client, None)
+        if cache is not None:
+            cache.invalidate()
+
+    @property
+    def ttl_s(self) -> float:
+        """The number of seconds a retrieved configuration is used."""
+        return self.__ttl
+
+    @ttl_s.setter
+    def ttl_s(self, value : float) -> None:
+        self.__ttl = value
+
+    def __fresh(self) -> bool:
+        return self.__fetched_at is not None and time.monotonic() - self.__fetched_at < self.__ttl
+
+    async def get(self) -> List[dict]:
+        """Returns the tenant configuration, retrieving it if the cached configuration has expired.
+
+        The returned list is shared with other callers and must not be modified.
+
+        :raises ResponseException: Raised if the API responds with an error.
+
+        :rtype: List[dict]
+        """
+        if self.__fresh():
+            return self.__config
+
+        async with self.__lock:
+            if self.__fresh():
+                return self.__config
+
+            generation = self.__generation
+            config = json_on_ok(await retrieve_tenant_configuration(self.__client))
+
+            # A configuration retrieved while the cache was invalidated may predate a tenant
+            # configuration change, so it is returned to this caller but not cached.
+            if generation == self.__generation:
+                self.__config = config
+                self.__fetched_at = time.monotonic()
+
+        return config
+
+    def invalidate(self) -> None:
+        """Discards the cached configuration so the next `get` retrieves it.  A retrieval in progress is not cached."""
+        self.__generation += 1
+        self.__fetched_at = None
+        self.__config = None
@@ -0,0 +1,247 @@
+from typing import Any, List, Union
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from pathlib import Path
+from ..zip_stream import ZipOptions, walk_directory
+import asyncio, hashlib, json, os, sqlite3, threading, time
+
+__READ_SIZE = 1024 * 1024
+
+
+def __hash_file(path : Union[str, os.PathLike]) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(__READ_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def __merkle_root(leaves : List[bytes]) -> str:
+    level = leaves if len(leaves) > 0 else [hashlib.sha256(b"").digest()]
+    while len(level) > 1:
+        if len(level) % 2 == 1:
+            level = level + [level[-1]]
+        level = [hashlib.sha256(level[i] + level[i + 1]).digest() for i in range(0, len(level), 2)]
+    return level[0].hex()
+
+
+def __hash_directory(src_dir : Union[str, os.PathLike], options : ZipOptions, workers : int) -> str:
+    files = list(walk_directory(src_dir, options))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upload_dedup") as pool:
+        digests = list(pool.map(lambda item: __hash_file(item[0]), files))
+    return __merkle_root([hashlib.sha256(name.encode("utf-8") + b"\0" + bytes.fromhex(digest)).digest()
+                          for (_, name), digest in zip(files, digests)])
+
+
+async def hash_file(path : Union[str, os.PathLike]) -> str:
+    """Computes the SHA-256 hash of a file's content without blocking the event loop.
+
+    :param path: The path to the file.
+    :type path: Union[str, os.PathLike]
+
+    :return: The hex digest of the file content.
+    :rtype: str
+    """
+    return await asyncio.to_thread(__hash_file, path)
+
+
+async def hash_directory(src_dir : Union[str, os.PathLike], options : ZipOptions = None, workers : int = None) -> str:
+    """Computes a Merkle root over the files in a directory without blocking the event loop.
+
+    Each leaf is the hash of a file's archive path and the SHA-256 hash of its content, in the order the files
+    are added to a zip archive with the same options.  The root changes if any file is added, removed, renamed
+    or modified, but does not depend on file timestamps or compression settings.
+
+    :param src_dir: The directory to hash.
+    :type src_dir: Union[str, os.PathLike]
+
+    :param options: Options that select the files included in the hash.  Defaults to `ZipOptions()`.
+    :type options: ZipOptions, optional
+
+    :param workers: The number of threads hashing files at the same time.  Defaults to the number of processors.
+    :type workers: int, optional
+
+    :return: The hex digest of the Merkle root.
+    :rtype: str
+    """
+    return await asyncio.to_thread(__hash_directory, src_dir, options, workers if workers is not None else (os.cpu_count() or 1))
+
+
+class DedupAction(Enum):
+    """The action taken by `ScanInvoker` when the content of an upload matches a previous scan."""
+    SKIP = "skip"
+    """The upload and scan are skipped; the previous scan is returned."""
+    WARN = "warn"
+    """A warning is logged and the content is uploaded and scanned."""
+
+
+@dataclass(frozen=True)
+class UploadDedupEntry:
+    """The last successful scan of uploaded content for a project and branch."""
+    project_id : str
+    branch : str
+    content_hash : str
+    scan_id : str
+    recorded_at : float
+
+
+class UploadDedupIndex:
+    """A local index of the content uploaded for the last successful scan of each project and branch.
+
+    The index is stored in a SQLite database so it can be shared by processes that run on the same host.
+    Entries older than `max_age_s` are not returned by `lookup` and are removed by `evict`.  The scan
+    engine configuration is part of the lookup key so that changing the engines scanned does not match
+    a previous upload.
+    """
+
+    __SCHEMA = """CREATE TABLE IF NOT EXISTS uploads (
+        project_id TEXT NOT NULL,
+        branch TEXT NOT NULL,
+        config_hash TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        scan_id TEXT NOT NULL,
+        recorded_at REAL NOT NULL,
+        PRIMARY KEY (project_id, branch, config_hash))"""
+
+    def __init__(self, db_path : Union[str, os.PathLike], max_age_s : float = 7 * 24 * 60 * 60,
+                 action : DedupAction = DedupAction.SKIP):
+        """
+        :param db_path: The path to the SQLite database file.  It is created if it does not exist.
+        :type db_path: Union[str, os.PathLike]
+
+        :param max_age_s: The number of seconds an entry is used after it is recorded.  Defaults to 7 days.
+        :type max_age_s: float, optional
+
+        :param action: The action taken when uploaded content matches an entry.  Defaults to DedupAction.SKIP.
+        :type action: DedupAction, optional
+        """
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.__db = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self.__lock = threading.Lock()
+        self.__max_age = max_age_s
+        self.__action = action
+        self.__hits = 0
+        self.__misses = 0
+        with self.__lock, self.__db:
+            self.__db.execute(UploadDedupIndex.__SCHEMA)
+
+    @property
+    def action(self) -> DedupAction:
+        """The action taken when uploaded content matches an entry."""
+        return self.__action
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups that found an entry with matching content."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups that did not find an entry with matching content."""
+        return self.__misses
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of lookups that found an entry with matching content."""
+        total = self.__hits + self.__misses
+        return 0.0 if total == 0 else self.__hits / total
+
+    @staticmethod
+    def __config_hash(engine_config : Any) -> str:
+        return hashlib.sha256(json.dumps(engine_config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def __lookup(self, project_id : str, branch : str, content_hash : str, engine_config : Any) -> UploadDedupEntry:
+        with self.__lock:
+            row = self.__db.execute("SELECT content_hash, scan_id, recorded_at FROM uploads "
+                                    "WHERE project_id = ? AND branch = ? AND config_hash = ? AND recorded_at >= ?",
+                                    (project_id, branch or "", UploadDedupIndex.__config_hash(engine_config),
+                                     time.time() - self.__max_age)).fetchone()
+
+            if row is None or row[0] != content_hash:
+                self.__misses += 1
+                return None
+
+            self.__hits += 1
+            return UploadDedupEntry(project_id, branch, row[0], row[1], row[2])
+
+    def __record(self, project_id : str, branch : str, content_hash : str, scan_id : str, engine_config : Any) -> None:
+        with self.__lock, self.__db:
+            self.__db.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?, ?, ?)",
+                              (project_id, branch or "", UploadDedupIndex.__config_hash(engine_config),
+                               content_hash, scan_id, time.time()))
+
+    def __forget(self, scan_id : str) -> int:
+        with self.__lock, self.__db:
+            return self.__db.execute("DELETE FROM uploads WHERE scan_id = ?", (scan_id,)).rowcount
+
+    def __evict(self) -> int:
+        with self.__lock, self.__db:
+            return self.__db.execute("DELETE FROM uploads WHERE recorded_at < ?", (time.time() - self.__max_age,)).rowcount
+
+    async def lookup(self, project_id : str, branch : str, content_hash : str, engine_config : Any = None) -> UploadDedupEntry:
+        """Finds the last scan of the same content for a project, branch and engine configuration.
+
+        :param project_id: The project ID.
+        :type project_id: str
+
+        :param branch: The branch name.
+        :type branch: str
+
+        :param content_hash: The hash of the uploaded content.
+        :type content_hash: str
+
+        :param engine_config: The engine configuration of the scan.
+        :type engine_config: Any, optional
+
+        :return: The matching entry or None if the content does not match the last scan.
+        :rtype: UploadDedupEntry
+        """
+        return await asyncio.to_thread(self.__lookup, project_id, branch, content_hash, engine_config)
+
+    async def record(self, project_id : str, branch : str, content_hash : str, scan_id : str, engine_config : Any = None) -> None:
+        """Records a successful scan of uploaded content, replacing the previous entry for the project and branch.
+
+        :param project_id: The project ID.
+        :type project_id: str
+
+        :param branch: The branch name.
+        :type branch: str
+
+        :param content_hash: The hash of the uploaded content.
+        :type content_hash: str
+
+        :param scan_id: The id of the scan of the content.
+        :type scan_id: str
+
+        :param engine_config: The engine configuration of the scan.
+        :type engine_config: Any, optional
+        """
+        await asyncio.to_thread(self.__record, project_id, branch, content_hash, scan_id, engine_config)
+
+    async def forget(self, scan_id : str) -> int:
+        """Removes the entries that refer to a scan.
+
+        :param scan_id: The scan id.
+        :type scan_id: str
+
+        :return: The number of entries removed.
+        :rtype: int
+        """
+        return await asyncio.to_thread(self.__forget, scan_id)
+
+    async def evict(self) -> int:
+        """Removes entries older than `max_age_s`.
+
+        :return: The number of entries removed.
+        :rtype: int
+        """
+        return await asyncio.to_thread(self.__evict)
+
+    def close(self) -> None:
+        """Closes the database."""
+        with self.__lock:
+            self.__db.close()
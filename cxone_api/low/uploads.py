@@ -13,6 +13,9 @@ async def upload_to_link(client : CxOneClient, upload_link : str,
     """
     A method to upload a zip file to an upload link generated by the REST API
 
+    The upload link is pre-signed, so the upload is sent with the client's data_plane
+    rather than with API authentication.
+
     Parameters:
 
     client - An instance of CxOneClient.
@@ -23,6 +26,6 @@ async def upload_to_link(client : CxOneClient, upload_link : str,
     upload_response = None
 
     with open(local_zip_path, "rb") as zip_to_upload:
-        upload_response = await client.exec_request(requests.put, upload_link, data=zip_to_upload)
+        upload_response = await client.data_plane.put(upload_link, data=zip_to_upload)
 
     return upload_response
@@ -0,0 +1,477 @@
+"""Module that implements streaming transfers of large files"""
+import asyncio
+import logging
+import os
+import tempfile
+import time
+import requests
+from dataclasses import dataclass
+from typing import AsyncGenerator, BinaryIO, Callable, Iterable, Union
+from requests.exceptions import ChunkedEncodingError, ConnectionError, ReadTimeout, RequestException
+from .client import CxOneClient
+from .data_plane import is_presigned_url
+from .exceptions import ResponseException, CommunicationException
+from .zip_stream import ZipOptions, ZipStats, iter_zip_directory, write_zip_directory
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class UploadProgress:
+    """A snapshot of the progress of an upload."""
+    bytes_sent : int
+    total_bytes : int = None
+    """The size of the upload, or None if the size is not known until the upload completes."""
+    elapsed_s : float = 0.0
+    """The number of seconds since the current attempt started."""
+    attempt : int = 1
+    """The attempt number.  An upload restarts from the beginning when a failed request is retried."""
+    done : bool = False
+
+    @property
+    def bytes_per_second(self) -> float:
+        """The average throughput of the current attempt."""
+        return 0.0 if self.elapsed_s <= 0 else self.bytes_sent / self.elapsed_s
+
+    @property
+    def fraction(self) -> float:
+        """The fraction of the upload that has been sent, or None if the size is not known."""
+        if self.total_bytes is None:
+            return None
+        return 1.0 if self.total_bytes == 0 else min(1.0, self.bytes_sent / self.total_bytes)
+
+
+UploadProgressCallback = Callable[[UploadProgress], None]
+"""A function called on the event loop with the progress of an upload."""
+
+
+class _ProgressTracker:
+    def __init__(self, callback : UploadProgressCallback, total : int, interval_s : float):
+        self.__loop = asyncio.get_running_loop()
+        self.__callback = callback
+        self.__interval = interval_s
+        self.total = total
+        self.sent = 0
+        self.attempt = 1
+        self.__start = time.monotonic()
+        self.__last = 0.0
+
+    def snapshot(self, done : bool = False) -> UploadProgress:
+        return UploadProgress(self.sent, self.total, time.monotonic() - self.__start, self.attempt, done)
+
+    def restart(self, position : int) -> None:
+        self.attempt += 1
+        self.sent = position
+        self.__start = time.monotonic()
+
+    def advance(self, count : int) -> None:
+        # Called from the thread sending the request body; the callback is run on the event loop.
+        self.sent += count
+        now = time.monotonic()
+        if self.__callback is not None and now - self.__last >= self.__interval:
+            self.__last = now
+            self.__loop.call_soon_threadsafe(self.__callback, self.snapshot())
+
+    def finish(self) -> UploadProgress:
+        progress = self.snapshot(True)
+        if self.__callback is not None:
+            self.__callback(progress)
+        return progress
+
+
+class _ProgressReader:
+    def __init__(self, f : BinaryIO, tracker : _ProgressTracker):
+        self.__f = f
+        self.__tracker = tracker
+        self.__start = f.tell()
+        self.__end = f.seek(0, os.SEEK_END)
+        f.seek(self.__start)
+        tracker.total = self.__end - self.__start
+
+    def __len__(self) -> int:
+        return self.__end
+
+    def read(self, size : int = -1) -> bytes:
+        data = self.__f.read(size)
+        self.__tracker.advance(len(data))
+        return data
+
+    def tell(self) -> int:
+        return self.__f.tell()
+
+    def seek(self, offset : int, whence : int = os.SEEK_SET) -> int:
+        position = self.__f.seek(offset, whence)
+        self.__tracker.restart(position - self.__start)
+        return position
+
+
+def __progress_iter(chunks : Iterable[bytes], tracker : _ProgressTracker):
+    for chunk in chunks:
+        tracker.advance(len(chunk))
+        yield chunk
+
+
+async def upload_file(client : CxOneClient, upload_link : str, src : Union[str, os.PathLike, BinaryIO],
+                      progress : UploadProgressCallback = None, progress_interval_s : float = 1.0) -> requests.Response:
+    """Uploads a file to an upload link generated by the REST API while reporting progress.
+
+    The file is read from disk as it is sent.  If the request fails, the client's `data_plane` rewinds the file and
+    retries the upload on the same link; each retry is reported as a new attempt.  Upload links are pre-signed for a
+    single `PUT`, so the storage does not accept the file in parts and a retry resends the file from the beginning.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param upload_link: The link URL generated by the REST API.
+    :type upload_link: str
+
+    :param src: A path to the file or a binary file object open for reading.
+    :type src: Union[str, os.PathLike, BinaryIO]
+
+    :param progress: A function called with the progress of the upload at most once every `progress_interval_s`
+                     seconds while the file is sent, and once when the upload completes.
+    :type progress: UploadProgressCallback, optional
+
+    :param progress_interval_s: The minimum number of seconds between progress reports.  Defaults to 1.
+    :type progress_interval_s: float, optional
+
+    :rtype: requests.Response
+    """
+    if isinstance(src, (str, os.PathLike)):
+        with open(src, "rb") as f:
+            return await upload_file(client, upload_link, f, progress, progress_interval_s)
+
+    _log = logging.getLogger("upload_file")
+
+    tracker = _ProgressTracker(progress, None, progress_interval_s)
+    response = await client.data_plane.put(upload_link, data=_ProgressReader(src, tracker))
+    result = tracker.finish()
+
+    _log.debug(f"Uploaded {result.bytes_sent} bytes in {result.elapsed_s:.1f}s ({result.bytes_per_second / 1048576:.2f} MiB/s), "
+               f"attempt {result.attempt}, status {response.status_code}")
+    return response
+
+
+async def get_url(client : CxOneClient, url : str, stream : bool = False, headers : dict = None) -> requests.Response:
+    """Retrieves content from a URL returned by the API, such as a report or export download URL.
+
+    Pre-signed URLs are requested with the client's `data_plane` without API authentication.  Other URLs
+    are requested with the client's API credentials.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param url: The URL of the content.
+    :type url: str
+
+    :param stream: Set to true to read the response body incrementally.  Defaults to false.
+    :type stream: bool, optional
+
+    :param headers: Additional request headers.  Defaults to None.
+    :type headers: dict, optional
+
+    :rtype: requests.Response
+    """
+    if is_presigned_url(url):
+        return await client.data_plane.get(url, stream=stream, headers=headers)
+    else:
+        return await client.exec_request(requests.get, url, stream=stream, headers={} if headers is None else dict(headers))
+
+
+async def __open_stream(client : CxOneClient, url : str, offset : int) -> requests.Response:
+    headers = {"Range" : f"bytes={offset}-"} if offset > 0 else {}
+    response = await get_url(client, url, stream=True, headers=headers)
+
+    if not response.ok:
+        response.close()
+        raise ResponseException(f"Unable to download: Code: [{response.status_code}] Url: {url}")
+
+    return response
+
+
+async def iter_download(client : CxOneClient, url : str, chunk_size : int = DEFAULT_CHUNK_SIZE,
+                        max_resume_attempts : int = 5) -> AsyncGenerator[bytes, None]:
+    """An async generator that downloads the content at a URL in chunks.
+
+    At most one chunk of the content is held in memory at a time.  If the connection fails before the
+    download is complete, the download resumes from the last byte received using an HTTP `Range`
+    request.  If the server does not honor the `Range` header, the bytes already received are skipped
+    in the new response.
+
+    The URL is requested as described for `get_url`.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param url: The URL of the content to download.
+    :type url: str
+
+    :param chunk_size: The maximum number of bytes returned in each chunk.  Defaults to 1MiB.
+    :type chunk_size: int, optional
+
+    :param max_resume_attempts: The number of times to resume the download after a connection failure.  Defaults to 5.
+    :type max_resume_attempts: int, optional
+
+    :raises ResponseException: Raised if the server responds with an error.
+
+    :return: A generator that is used in an `async for` statement.
+    :rtype: AsyncGenerator[bytes, None]
+    """
+    _log = logging.getLogger("iter_download")
+
+    received = 0
+    expected = None
+    resumes = 0
+
+    while True:
+        response = await __open_stream(client, url, received)
+        try:
+            skip = received if received > 0 and response.status_code != 206 else 0
+            length = response.headers.get("Content-Length", None)
+            if length is not None and expected is None:
+                expected = int(length) + (received if response.status_code == 206 else 0)
+
+            chunks = response.iter_content(chunk_size)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+
+                if skip > 0:
+                    discard = min(skip, len(chunk))
+                    skip -= discard
+                    chunk = chunk[discard:]
+                    if len(chunk) == 0:
+                        continue
+
+                received += len(chunk)
+                yield chunk
+
+            if expected is None or received >= expected:
+                return
+
+            _log.debug(f"Stream ended after {received} of {expected} bytes for {url}")
+        except (ChunkedEncodingError, ConnectionError, ReadTimeout) as ex:
+            _log.debug(f"Stream interrupted after {received} bytes for {url}: {ex}")
+        finally:
+            response.close()
+
+        if resumes >= max_resume_attempts:
+            raise ResponseException(f"Unable to complete download after {resumes} resume attempts: Url: {url}")
+        resumes += 1
+
+
+async def download_to_file(client : CxOneClient, url : str, dest : Union[str, os.PathLike, BinaryIO],
+                           chunk_size : int = DEFAULT_CHUNK_SIZE, max_resume_attempts : int = 5) -> int:
+    """Downloads the content at a URL directly to a file without buffering the entire content in memory.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param url: The URL of the content to download.
+    :type url: str
+
+    :param dest: A path where the file is written or a binary file object open for writing.
+    :type dest: Union[str, os.PathLike, BinaryIO]
+
+    :param chunk_size: The maximum number of bytes held in memory while writing.  Defaults to 1MiB.
+    :type chunk_size: int, optional
+
+    :param max_resume_attempts: The number of times to resume the download after a connection failure.  Defaults to 5.
+    :type max_resume_attempts: int, optional
+
+    :raises ResponseException: Raised if the server responds with an error.
+
+    :return: The number of bytes written.
+    :rtype: int
+    """
+    if isinstance(dest, (str, os.PathLike)):
+        with open(dest, "wb") as f:
+            return await download_to_file(client, url, f, chunk_size, max_resume_attempts)
+
+    written = 0
+    async for chunk in iter_download(client, url, chunk_size, max_resume_attempts):
+        await asyncio.to_thread(dest.write, chunk)
+        written += len(chunk)
+
+    return written
+
+
+async def __probe_length(client : CxOneClient, url : str) -> Union[int, None]:
+    # A single byte range request reveals both range support and the total length.
+    response = await get_url(client, url, stream=True, headers={"Range" : "bytes=0-0"})
+    try:
+        content_range = response.headers.get("Content-Range", "")
+        if response.status_code == 206 and "/" in content_range:
+            total = content_range.rsplit("/", 1)[1].strip()
+            if total.isdigit():
+                return int(total)
+        return None
+    finally:
+        response.close()
+
+
+def __write_at(f : BinaryIO, offset : int, data : bytes) -> None:
+    f.seek(offset)
+    f.write(data)
+
+
+async def __fetch_range(client : CxOneClient, url : str, path : Union[str, os.PathLike], start : int, end : int,
+                        chunk_size : int, max_resume_attempts : int) -> int:
+    _log = logging.getLogger("ranged_download")
+
+    position = start
+    resumes = 0
+    with open(path, "r+b") as f:
+        while position <= end:
+            response = await get_url(client, url, stream=True, headers={"Range" : f"bytes={position}-{end}"})
+            try:
+                if response.status_code != 206:
+                    raise ResponseException(f"Byte range request failed: Code: [{response.status_code}] Url: {url}")
+
+                chunks = response.iter_content(chunk_size)
+                while True:
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        break
+                    chunk = chunk[:end - position + 1]
+                    await asyncio.to_thread(__write_at, f, position, chunk)
+                    position += len(chunk)
+            except (ChunkedEncodingError, ConnectionError, ReadTimeout) as ex:
+                _log.debug(f"Range {start}-{end} interrupted at {position} for {url}: {ex}")
+            finally:
+                response.close()
+
+            if position <= end:
+                if resumes >= max_resume_attempts:
+                    raise ResponseException(f"Unable to complete byte range {start}-{end} after {resumes} resume attempts: Url: {url}")
+                resumes += 1
+
+    return position - start
+
+
+async def ranged_download(client : CxOneClient, url : str, dest : Union[str, os.PathLike], part_size : int = 16 * DEFAULT_CHUNK_SIZE,
+                          concurrency : int = 4, chunk_size : int = DEFAULT_CHUNK_SIZE, max_resume_attempts : int = 5) -> int:
+    """Downloads the content at a URL to a file using several concurrent byte range requests.
+
+    The server is first probed for byte range support and the content length.  The destination file is
+    allocated at its full size and each part is written at its offset as it arrives.  If the server does
+    not support byte ranges, the content is downloaded as a single stream with `download_to_file`.
+
+    This is useful for large artifacts such as SCA exports (`sca/export/requests/{exportId}/download`),
+    report downloads (`reports/{reportId}/download`) or scan log redirect targets, where a single
+    connection limits the transfer rate.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param url: The URL of the content to download.
+    :type url: str
+
+    :param dest: A path where the file is written.
+    :type dest: Union[str, os.PathLike]
+
+    :param part_size: The number of bytes requested by each byte range request.  Defaults to 16MiB.
+    :type part_size: int, optional
+
+    :param concurrency: The maximum number of byte range requests executing at the same time.  Defaults to 4.
+    :type concurrency: int, optional
+
+    :param chunk_size: The maximum number of bytes held in memory by each request while writing.  Defaults to 1MiB.
+    :type chunk_size: int, optional
+
+    :param max_resume_attempts: The number of times to resume each part after a connection failure.  Defaults to 5.
+    :type max_resume_attempts: int, optional
+
+    :raises ResponseException: Raised if the server responds with an error or the downloaded length is incorrect.
+
+    :return: The number of bytes written.
+    :rtype: int
+    """
+    total = await __probe_length(client, url)
+
+    if total is None or total <= part_size:
+        return await download_to_file(client, url, dest, chunk_size, max_resume_attempts)
+
+    with open(dest, "wb") as f:
+        f.truncate(total)
+
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_part(start : int):
+        async with limit:
+            return await __fetch_range(client, url, dest, start, min(start + part_size, total) - 1, chunk_size, max_resume_attempts)
+
+    # If a part fails, the remaining parts are cancelled and awaited so nothing is written to the
+    # file after the error is raised.
+    parts = [asyncio.ensure_future(fetch_part(start)) for start in range(0, total, part_size)]
+    try:
+        written = sum(await asyncio.gather(*parts))
+    except BaseException:
+        for part in parts:
+            part.cancel()
+        await asyncio.gather(*parts, return_exceptions=True)
+        raise
+
+    if written != total or os.path.getsize(dest) != total:
+        raise ResponseException(f"Downloaded {written} bytes but expected {total} bytes: Url: {url}")
+
+    return written
+
+
+async def upload_directory(client : CxOneClient, upload_link : str, src_dir : Union[str, os.PathLike],
+                           options : ZipOptions = None, streaming : bool = True, stats : ZipStats = None,
+                           progress : UploadProgressCallback = None, progress_interval_s : float = 1.0) -> requests.Response:
+    """Uploads a zip archive of a directory to an upload link generated by the REST API.
+
+    When `streaming` is true, the archive is compressed while it is sent using chunked transfer encoding so that
+    the archive is never written to disk.  If the upload link's storage does not accept a chunked upload, the
+    archive is written to a temporary file and uploaded with a known length.
+
+    :param client: The CxOneClient instance used to communicate with Checkmarx One
+    :type client: CxOneClient
+
+    :param upload_link: The link URL generated by the REST API.
+    :type upload_link: str
+
+    :param src_dir: The directory to archive.
+    :type src_dir: Union[str, os.PathLike]
+
+    :param options: Options that control compression and which files are included.  Defaults to `ZipOptions()`.
+    :type options: ZipOptions, optional
+
+    :param streaming: Set to false to always write the archive to a temporary file before uploading.  Defaults to true.
+    :type streaming: bool, optional
+
+    :param stats: Counters describing the uploaded archive, including the bytes excluded and pruned by `options`.
+    :type stats: ZipStats, optional
+
+    :param progress: A function called with the progress of the upload.  The total size of a streamed archive is
+                     not known until the upload completes.
+    :type progress: UploadProgressCallback, optional
+
+    :param progress_interval_s: The minimum number of seconds between progress reports.  Defaults to 1.
+    :type progress_interval_s: float, optional
+
+    :rtype: requests.Response
+    """
+    _log = logging.getLogger("upload_directory")
+    counters = stats if stats is not None else ZipStats()
+
+    if streaming:
+        try:
+            tracker = _ProgressTracker(progress, None, progress_interval_s)
+            response = await client.data_plane.put(upload_link, data=__progress_iter(iter_zip_directory(src_dir, options, stats=counters), tracker))
+            if response.ok or response.status_code not in [400, 411, 501]:
+                tracker.total = tracker.sent
+                tracker.finish()
+                return response
+            _log.debug(f"Chunked upload rejected with status {response.status_code}, uploading from a temporary file.")
+        except (RequestException, CommunicationException) as ex:
+            _log.debug(f"Chunked upload failed, uploading from a temporary file: {ex}")
+
+    with tempfile.TemporaryFile() as archive:
+        counters.reset()
+        await asyncio.to_thread(write_zip_directory, src_dir, archive, options, counters)
+        archive.seek(0)
+        return await upload_file(client, upload_link, archive, progress, progress_interval_s)
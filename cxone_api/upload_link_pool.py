@@ -0,0 +1,187 @@
+"""Module that keeps pre-generated upload links ready for use"""
+import asyncio
+import calendar
+import logging
+import time
+import urllib
+from typing import List, Tuple
+from .client import CxOneClient
+from .exceptions import ResponseException, CommunicationException
+from .low.uploads import generate_upload_link
+
+
+def upload_link_expiry(url : str, default_ttl_s : float, generated_at : float = None) -> float:
+    """Computes the time an upload link expires.
+
+    The expiry is read from the `X-Amz-Date`/`X-Amz-Expires` or `X-Goog-Date`/`X-Goog-Expires` query parameters
+    of a pre-signed URL.  Links without these parameters expire `default_ttl_s` seconds after they are generated.
+
+    :param url: The upload link.
+    :type url: str
+
+    :param default_ttl_s: The number of seconds a link is used if the link does not indicate when it expires.
+    :type default_ttl_s: float
+
+    :param generated_at: The time the link was generated as returned by `time.time()`.  Defaults to now.
+    :type generated_at: float, optional
+
+    :return: The expiry time as a value comparable to `time.time()`.
+    :rtype: float
+    """
+    generated = generated_at if generated_at is not None else time.time()
+    query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+
+    for prefix in ["X-Amz-", "X-Goog-"]:
+        signed = query.get(f"{prefix}Date", None)
+        expires = query.get(f"{prefix}Expires", None)
+        if signed is not None and expires is not None:
+            try:
+                return calendar.timegm(time.strptime(signed[0], "%Y%m%dT%H%M%SZ")) + int(expires[0])
+            except ValueError:
+                break
+
+    return generated + default_ttl_s
+
+
+class UploadLinkPool:
+    """A pool of upload links generated ahead of the uploads that use them.
+
+    Each upload link accepts a single upload, so a link is removed from the pool when it is acquired.  The pool
+    is refilled in the background to `size` links, and links that are within `refresh_margin_s` seconds of
+    expiring are discarded and replaced.  If the pool is empty when a link is needed, a link is generated
+    immediately.
+
+    Assign an instance to the `upload_link_pool` property of CxOneClient so that `ScanInvoker` methods that
+    upload content use links from the pool.  Call `close` to stop refilling the pool.
+    """
+
+    def __init__(self, client : CxOneClient, size : int = 4, default_ttl_s : float = 600,
+                 refresh_margin_s : float = 60, retry_delay_s : float = 5):
+        """
+        :param client: The CxOneClient instance used to communicate with Checkmarx One
+        :type client: CxOneClient
+
+        :param size: The number of links kept ready for use.  Defaults to 4.
+        :type size: int, optional
+
+        :param default_ttl_s: The number of seconds a link is used if the link does not indicate when it expires.  Defaults to 600.
+        :type default_ttl_s: float, optional
+
+        :param refresh_margin_s: Links are replaced when they are within this many seconds of expiring.  Defaults to 60.
+        :type refresh_margin_s: float, optional
+
+        :param retry_delay_s: The number of seconds to wait before refilling the pool after a link can't be generated.  Defaults to 5.
+        :type retry_delay_s: float, optional
+        """
+        self.__client = client
+        self.__size = max(1, size)
+        self.__ttl = default_ttl_s
+        self.__margin = refresh_margin_s
+        self.__retry_delay = retry_delay_s
+        self.__links : List[Tuple[float, str]] = []
+        self.__wakeup = asyncio.Event()
+        self.__runner = None
+        self.__closed = False
+        self.__hits = 0
+        self.__misses = 0
+
+    @property
+    def available(self) -> int:
+        """The number of unexpired links in the pool."""
+        return len(self.__usable())
+
+    @property
+    def hits(self) -> int:
+        """The number of links acquired from the pool."""
+        return self.__hits
+
+    @property
+    def misses(self) -> int:
+        """The number of links generated on demand because the pool was empty."""
+        return self.__misses
+
+    def __usable(self) -> List[Tuple[float, str]]:
+        deadline = time.time() + self.__margin
+        return [link for link in self.__links if link[0] > deadline]
+
+    async def __generate(self) -> Tuple[float, str]:
+        generated = time.time()
+        response = await generate_upload_link(self.__client)
+        if not response.ok:
+            raise ResponseException(f"Unable to generate an upload link: Code: [{response.status_code}] {response.text}")
+        url = response.json()['url']
+        return upload_link_expiry(url, self.__ttl, generated), url
+
+    def __start(self) -> None:
+        if not self.__closed and (self.__runner is None or self.__runner.done()):
+            self.__runner = asyncio.get_running_loop().create_task(self.__run())
+        self.__wakeup.set()
+
+    async def acquire(self) -> str:
+        """Removes a link from the pool, or generates a link if the pool is empty.
+
+        :raises ResponseException: Raised if a link must be generated and the API responds with an error.
+
+        :return: An upload link.
+        :rtype: str
+        """
+        self.__links = self.__usable()
+        self.__start()
+
+        if len(self.__links) > 0:
+            self.__hits += 1
+            return self.__links.pop(0)[1]
+
+        self.__misses += 1
+        return (await self.__generate())[1]
+
+    async def __fill(self) -> None:
+        self.__links = self.__usable()
+        needed = self.__size - len(self.__links)
+        if needed > 0:
+            results = await asyncio.gather(*[self.__generate() for _ in range(needed)], return_exceptions=True)
+            self.__links = sorted(self.__links + [r for r in results if isinstance(r, tuple)])
+            self.__links = self.__usable()
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+
+    async def fill(self) -> None:
+        """Generates links until the pool holds `size` unexpired links.
+
+        :raises ResponseException: Raised if the API responds with an error.
+        """
+        await self.__fill()
+        self.__start()
+
+    async def __run(self) -> None:
+        _log = logging.getLogger("UploadLinkPool")
+
+        while not self.__closed:
+            self.__wakeup.clear()
+            try:
+                await self.__fill()
+                if len(self.__links) > 0:
+                    delay = max(0, min([expiry for expiry, _ in self.__links]) - self.__margin - time.time())
+                else:
+                    _log.warning(f"Upload links expire within the refresh margin of {self.__margin} seconds.")
+                    delay = self.__retry_delay
+            except asyncio.CancelledError:
+                raise
+            except (ResponseException, CommunicationException, Exception) as ex:
+                # The library's exceptions derive from BaseException, so they are not caught by Exception alone.
+                _log.warning(f"Unable to refill the upload link pool, retrying in {self.__retry_delay} seconds: {ex}")
+                delay = self.__retry_delay
+
+            try:
+                await asyncio.wait_for(self.__wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self) -> None:
+        """Stops refilling the pool and discards the links in the pool."""
+        self.__closed = True
+        self.__links = []
+        if self.__runner is not None:
+            self.__runner.cancel()
+            await asyncio.gather(self.__runner, return_exceptions=True)
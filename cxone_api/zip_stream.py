@@ -0,0 +1,321 @@
+"""Module that produces zip archives of a directory as a stream of bytes"""
+import os
+import struct
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, FrozenSet, Generator, Tuple, Union
+
+DEFAULT_STORE_EXTENSIONS = frozenset([".zip", ".jar", ".war", ".ear", ".apk", ".aar", ".nupkg", ".whl", ".egg",
+                                      ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar", ".zst",
+                                      ".png", ".jpg", ".jpeg", ".gif", ".webp", ".mp3", ".mp4", ".mov", ".woff", ".woff2"])
+"""File extensions of content that is already compressed and is stored in the archive without compression."""
+
+__ZIP64_LIMIT = 0xFFFFFFFF
+__ZIP64_COUNT_LIMIT = 0xFFFF
+__READ_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class ZipOptions:
+    """Options that control how a directory is archived."""
+    compression_level : int = 6
+    """The deflate compression level from 0 (none) to 9 (best).  Defaults to 6."""
+    store_extensions : FrozenSet[str] = field(default=DEFAULT_STORE_EXTENSIONS)
+    """Lower case file extensions of files added without compression."""
+    workers : int = None
+    """The number of threads compressing files at the same time.  Defaults to the number of processors."""
+    include : Callable[[str], bool] = None
+    """A function that is passed the archive path of each file and returns true if the file is added.  Defaults to all files."""
+    spool_max_memory : int = 8 * 1024 * 1024
+    """The maximum size of a compressed file held in memory before it is spooled to a temporary file."""
+    prune : Callable[[str], bool] = None
+    """A function that is passed the archive path of each directory and returns true if the directory is not walked.  Defaults to no directories."""
+
+
+@dataclass
+class ZipStats:
+    """Counters describing the content of a zip archive as it is produced."""
+    files_added : int = 0
+    bytes_added : int = 0
+    """The uncompressed size of the files added to the archive."""
+    bytes_compressed : int = 0
+    """The compressed size of the files added to the archive."""
+    files_excluded : int = 0
+    bytes_excluded : int = 0
+    """The size of the files not added to the archive because `ZipOptions.include` returned false."""
+    dirs_pruned : int = 0
+    """The number of directories not walked because `ZipOptions.prune` returned true."""
+    files_pruned : int = 0
+    """The number of files in pruned directories.  These are not counted in `files_excluded`."""
+    bytes_pruned : int = 0
+    """The size of the files in pruned directories.  These are not counted in `bytes_excluded`."""
+
+    @property
+    def bytes_saved(self) -> int:
+        """The size of all files not added to the archive, the sum of `bytes_excluded` and `bytes_pruned`."""
+        return self.bytes_excluded + self.bytes_pruned
+
+    def reset(self) -> None:
+        """Sets all counters to zero."""
+        self.files_added = self.bytes_added = self.bytes_compressed = 0
+        self.files_excluded = self.bytes_excluded = self.dirs_pruned = 0
+        self.files_pruned = self.bytes_pruned = 0
+
+
+@dataclass
+class _Entry:
+    name : bytes
+    mode : int
+    dos_time : int
+    dos_date : int
+    crc : int = 0
+    size : int = 0
+    compressed_size : int = 0
+    method : int = 8
+    data : Union[bytes, BinaryIO] = None
+    offset : int = 0
+
+
+def __dos_date_time(mtime : float) -> Tuple[int, int]:
+    t = time.localtime(mtime)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+def __measure(path : Path, stats : ZipStats) -> None:
+    # Only file sizes are read; a pruned tree is never opened or filtered.
+    for dirpath, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                st = os.lstat(os.path.join(dirpath, filename))
+            except OSError:
+                continue
+            stats.files_pruned += 1
+            stats.bytes_pruned += st.st_size
+
+
+def __walk(root : Path, options : ZipOptions, stats : ZipStats, measure_pruned : bool = False) -> Generator[Tuple[Path, str], None, None]:
+    for dirpath, dirnames, filenames in os.walk(root):
+        if options.prune is not None:
+            kept = []
+            for d in dirnames:
+                if options.prune((Path(dirpath) / d).relative_to(root).as_posix()):
+                    stats.dirs_pruned += 1
+                    if measure_pruned:
+                        __measure(Path(dirpath) / d, stats)
+                else:
+                    kept.append(d)
+            dirnames[:] = kept
+        dirnames.sort()
+        for filename in sorted(filenames):
+            path = Path(dirpath) / filename
+            if not path.is_file():
+                continue
+            name = path.relative_to(root).as_posix()
+            if options.include is None or options.include(name):
+                yield path, name
+            else:
+                stats.files_excluded += 1
+                stats.bytes_excluded += path.stat().st_size
+
+
+def walk_directory(src_dir : Union[str, os.PathLike], options : ZipOptions = None) -> Generator[Tuple[Path, str], None, None]:
+    """A generator of the files in a directory that would be added to a zip archive with the given options.
+
+    :param src_dir: The directory to walk.
+    :type src_dir: Union[str, os.PathLike]
+
+    :param options: Options that control which files are included.  Defaults to `ZipOptions()`.
+    :type options: ZipOptions, optional
+
+    :return: A generator of the path of each file and the path of the file in the archive, in archive order.
+    :rtype: Generator[Tuple[Path, str], None, None]
+    """
+    root = Path(src_dir)
+    return __walk(root, options if options is not None else ZipOptions(), ZipStats())
+
+
+def __compress(path : Path, name : str, options : ZipOptions) -> _Entry:
+    stat = path.stat()
+    dos_time, dos_date = __dos_date_time(stat.st_mtime)
+    entry = _Entry(name.encode("utf-8"), stat.st_mode & 0xFFFF, dos_time, dos_date)
+
+    store = path.suffix.lower() in options.store_extensions or options.compression_level == 0
+    entry.method = 0 if store else 8
+    compressor = None if store else zlib.compressobj(options.compression_level, zlib.DEFLATED, -15)
+
+    out = tempfile.SpooledTemporaryFile(max_size=options.spool_max_memory)
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(__READ_SIZE)
+            if not block:
+                break
+            entry.crc = zlib.crc32(block, entry.crc)
+            entry.size += len(block)
+            out.write(block if compressor is None else compressor.compress(block))
+
+    if compressor is not None:
+        out.write(compressor.flush())
+
+    entry.compressed_size = out.tell()
+    out.seek(0)
+    if entry.compressed_size <= options.spool_max_memory:
+        entry.data = out.read()
+        out.close()
+    else:
+        entry.data = out
+
+    return entry
+
+
+def __local_header(entry : _Entry) -> bytes:
+    zip64 = entry.size >= __ZIP64_LIMIT or entry.compressed_size >= __ZIP64_LIMIT
+    extra = struct.pack("<HHQQ", 1, 16, entry.size, entry.compressed_size) if zip64 else b""
+    sizes = (__ZIP64_LIMIT, __ZIP64_LIMIT) if zip64 else (entry.compressed_size, entry.size)
+    return struct.pack("<IHHHHHIIIHH", 0x04034b50, 45 if zip64 else 20, 0x800, entry.method, entry.dos_time, entry.dos_date,
+                       entry.crc, sizes[0], sizes[1], len(entry.name), len(extra)) + entry.name + extra
+
+
+def __central_header(entry : _Entry) -> bytes:
+    fields = []
+    size, compressed_size, offset = entry.size, entry.compressed_size, entry.offset
+    if entry.size >= __ZIP64_LIMIT:
+        fields.append(entry.size)
+        size = __ZIP64_LIMIT
+    if entry.compressed_size >= __ZIP64_LIMIT:
+        fields.append(entry.compressed_size)
+        compressed_size = __ZIP64_LIMIT
+    if entry.offset >= __ZIP64_LIMIT:
+        fields.append(entry.offset)
+        offset = __ZIP64_LIMIT
+
+    extra = struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields) if len(fields) > 0 else b""
+    version = 45 if len(fields) > 0 else 20
+    return struct.pack("<IHHHHHHIIIHHHHHII", 0x02014b50, (3 << 8) | 45, version, 0x800, entry.method, entry.dos_time,
+                       entry.dos_date, entry.crc, compressed_size, size, len(entry.name), len(extra), 0, 0, 0,
+                       entry.mode << 16, offset) + entry.name + extra
+
+
+def __end_records(count : int, cd_offset : int, cd_size : int) -> bytes:
+    records = b""
+    if count >= __ZIP64_COUNT_LIMIT or cd_offset >= __ZIP64_LIMIT or cd_size >= __ZIP64_LIMIT:
+        zip64_end_offset = cd_offset + cd_size
+        records += struct.pack("<IQHHIIQQQQ", 0x06064b50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset)
+        records += struct.pack("<IIQI", 0x07064b50, 0, zip64_end_offset, 1)
+        count = min(count, __ZIP64_COUNT_LIMIT)
+        cd_offset = min(cd_offset, __ZIP64_LIMIT)
+        cd_size = min(cd_size, __ZIP64_LIMIT)
+
+    return records + struct.pack("<IHHHHIIH", 0x06054b50, 0, 0, count, count, cd_size, cd_offset, 0)
+
+
+def iter_zip_directory(src_dir : Union[str, os.PathLike], options : ZipOptions = None,
+                       chunk_size : int = 1024 * 1024, stats : ZipStats = None) -> Generator[bytes, None, None]:
+    """A generator that produces a zip archive of the files in a directory.
+
+    Files are compressed concurrently by a pool of threads and written to the archive in directory order.
+    The archive is produced as it is compressed; it is never written to disk in its entirety.  Large
+    archives and files use the Zip64 extensions as needed.
+
+    The generator can be passed directly as the body of an HTTP request.
+
+    :param src_dir: The directory to archive.  Paths in the archive are relative to this directory.
+    :type src_dir: Union[str, os.PathLike]
+
+    :param options: Options that control compression and which files are included.  Defaults to `ZipOptions()`.
+    :type options: ZipOptions, optional
+
+    :param chunk_size: The maximum number of bytes in each chunk of compressed data.  Defaults to 1MiB.
+    :type chunk_size: int, optional
+
+    :param stats: Counters updated as the archive is produced.  When provided, the size of the files in pruned directories is also measured.
+    :type stats: ZipStats, optional
+
+    :return: A generator of the bytes of the archive.
+    :rtype: Generator[bytes, None, None]
+    """
+    opts = options if options is not None else ZipOptions()
+    workers = opts.workers if opts.workers is not None else (os.cpu_count() or 1)
+    root = Path(src_dir)
+    counters = stats if stats is not None else ZipStats()
+
+    entries = []
+    offset = 0
+    pending = []
+    files = __walk(root, opts, counters, measure_pruned=stats is not None)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip_stream") as pool:
+        try:
+            def fill():
+                # Compression runs ahead of the writer by a bounded number of files to limit memory use.
+                while len(pending) < workers * 2:
+                    item = next(files, None)
+                    if item is None:
+                        break
+                    pending.append(pool.submit(__compress, item[0], item[1], opts))
+
+            fill()
+            while len(pending) > 0:
+                entry = pending.pop(0).result()
+                fill()
+
+                entry.offset = offset
+                header = __local_header(entry)
+                yield header
+                offset += len(header)
+
+                if isinstance(entry.data, bytes):
+                    for pos in range(0, len(entry.data), chunk_size):
+                        yield entry.data[pos:pos + chunk_size]
+                else:
+                    with entry.data:
+                        while True:
+                            block = entry.data.read(chunk_size)
+                            if not block:
+                                break
+                            yield block
+                offset += entry.compressed_size
+                counters.files_added += 1
+                counters.bytes_added += entry.size
+                counters.bytes_compressed += entry.compressed_size
+                entry.data = None
+                entries.append(entry)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    cd_offset = offset
+    central = b"".join([__central_header(e) for e in entries])
+    yield central
+    yield __end_records(len(entries), cd_offset, len(central))
+
+
+def write_zip_directory(src_dir : Union[str, os.PathLike], dest : BinaryIO, options : ZipOptions = None,
+                        stats : ZipStats = None) -> int:
+    """Writes a zip archive of the files in a directory to a file object.
+
+    :param src_dir: The directory to archive.
+    :type src_dir: Union[str, os.PathLike]
+
+    :param dest: A binary file object open for writing.
+    :type dest: BinaryIO
+
+    :param options: Options that control compression and which files are included.  Defaults to `ZipOptions()`.
+    :type options: ZipOptions, optional
+
+    :param stats: Counters updated as the archive is written.
+    :type stats: ZipStats, optional
+
+    :return: The number of bytes written.
+    :rtype: int
+    """
+    written = 0
+    for chunk in iter_zip_directory(src_dir, options, stats=stats):
+        dest.write(chunk)
+        written += len(chunk)
+    return written
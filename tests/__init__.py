@@ -3,6 +3,7 @@ import os
 import asyncio
 import time
 from cxone_api.high.scans import ScanLoader
+from cxone_api.high.scan_watcher import ScanWatcher
 from cxone_api import CxOneClient, AuthRegionEndpoints, ApiRegionEndpoints
 from dotenv import load_dotenv
 
@@ -30,17 +31,20 @@ class BaseTest(unittest.IsolatedAsyncioTestCase):
         super().__init__(*args, **kwargs)
     
     
+    def scan_watcher(self, client):
+        # One watcher per client is shared by the test and closed when the test ends.
+        watchers = self.__dict__.setdefault("_scan_watchers", {})
+        if id(client) not in watchers:
+            watchers[id(client)] = ScanWatcher(client, initial_interval_s=10.0)
+            self.addAsyncCleanup(watchers[id(client)].close)
+        return watchers[id(client)]
+
     async def wait_for_scan_completion(self, client, scanid):
-        start = time.time()
-        while time.time() - start < BaseTest.MAX_SCAN_SECONDS:
-            inspector = await ScanLoader.load(client, scanid)
-            if inspector.executing:
-                await asyncio.sleep(10.0)
-                continue
-            else:
-                return inspector.successful
-        
-        return False
+        try:
+            inspector = await self.scan_watcher(client).wait(scanid, BaseTest.MAX_SCAN_SECONDS)
+            return inspector.successful
+        except asyncio.TimeoutError:
+            return False
     
 
     async def execute_client_call(self, coro, response_eval, kwarg_generators=None, *arg, **kwargs):
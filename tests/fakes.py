@@ -0,0 +1,110 @@
+"""Stand-ins for CxOneClient and requests.Response used by the offline tests."""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List
+from urllib.parse import urlsplit, parse_qs
+
+
+class FakeResponse:
+    """A requests.Response stand-in with a JSON payload or a raw body."""
+
+    def __init__(self, status_code : int = 200, json_data=None, body : bytes = b"", headers : dict = None, url : str = ""):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.body = body
+        self.content = body
+        self.headers = headers if headers is not None else {}
+        self.text = ""
+        self.url = url
+        self.request = self
+        self.closed = False
+        self.__json = json_data
+
+    def json(self):
+        return self.__json
+
+    def iter_content(self, chunk_size):
+        for pos in range(0, len(self.body), chunk_size):
+            yield self.body[pos:pos + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+@dataclass
+class FakeRequest:
+    """A request received by FakeClient.  `path` is relative to the API endpoint and `query` holds the first value of each parameter."""
+    method : Callable
+    url : str
+    path : str
+    query : Dict[str, str]
+    json : object = None
+    kwargs : dict = field(default_factory=dict)
+
+
+FakeHandler = Callable[[FakeRequest], FakeResponse]
+
+
+class FakeClient:
+    """A CxOneClient stand-in that routes each request to a handler by method and path.
+
+    Handlers are registered with `route`, or a subclass overrides `handle`.  Requests that match no route
+    receive a 404 response.  Each request and upload takes `delay_s` seconds so concurrency can be observed
+    with `in_flight` and `max_in_flight`.
+    """
+    api_endpoint = "https://example.com/api/"
+
+    def __init__(self, delay_s : float = 0):
+        self.data_plane = self
+        self.upload_link_pool = None
+        self.delay_s = delay_s
+        self.requests : List[FakeRequest] = []
+        self.counts : Dict[str, int] = {}
+        self.uploads : List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.__routes = []
+
+    def route(self, method : Callable, path : str, handler : FakeHandler, prefix : bool = False) -> "FakeClient":
+        """Sends requests with `method` (None for any) to `path`, or to paths starting with `path` if `prefix` is set, to the handler."""
+        self.__routes.append((method, path, prefix, handler))
+        return self
+
+    def handle(self, request : FakeRequest) -> FakeResponse:
+        for method, path, prefix, handler in self.__routes:
+            if method is not None and method != request.method:
+                continue
+            if request.path == path or (prefix and request.path.startswith(path)):
+                return handler(request)
+        return FakeResponse(404, url=request.url)
+
+    async def delay(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay_s)
+        finally:
+            self.in_flight -= 1
+
+    async def put(self, url, data, headers=None):
+        """The data plane upload; records the upload URL in `uploads`."""
+        await self.delay()
+        self.uploads.append(url)
+        return FakeResponse(200, url=url)
+
+    async def exec_request(self, method, url, json=None, **kwargs):
+        await self.delay()
+
+        parts = urlsplit(url)
+        path = url[len(self.api_endpoint):].split("?")[0] if url.startswith(self.api_endpoint) else parts.path
+        query = {k : v[0] for k, v in parse_qs(parts.query).items()}
+        request = FakeRequest(method, url, path, query, json, kwargs)
+        self.requests.append(request)
+        self.counts[path] = self.counts.get(path, 0) + 1
+
+        response = self.handle(request)
+        if asyncio.iscoroutine(response):
+            response = await response
+        if not response.url:
+            response.url = url
+        return response
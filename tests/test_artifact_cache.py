@@ -0,0 +1,106 @@
+import unittest, unittest.mock, asyncio, os, tempfile, time
+from pathlib import Path
+from datetime import date, timedelta
+from cxone_api.high.artifact_cache import ArtifactCache
+from cxone_api.high.reports import JSONReport, ImprovedScanReport, ProjectReport, ScanList, ReportType
+
+
+class FakeClient:
+    auth_endpoint = "https://iam.foo.bar.com/auth/realms/tenant/protocol/openid-connect/token"
+    api_endpoint = "https://foo.bar.com/api/"
+
+
+class CountingJSONReport(JSONReport):
+    generated = 0
+
+    async def _get_report(self):
+        CountingJSONReport.generated += 1
+        return {"scanId" : self.content_type.data["scanId"], "results" : [1, 2, 3]}
+
+
+class TestArtifactCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_put_get(self):
+        cache = ArtifactCache(self.dir.name)
+        key = ArtifactCache.key(FakeClient(), "report", {"scanId" : "a"})
+        self.assertIsNone(cache.get(key))
+        cache.put(key, b"content")
+        self.assertEqual(cache.get(key), b"content")
+        self.assertEqual([f for f in os.listdir(os.path.join(self.dir.name, key[:2])) if f.endswith(".tmp")], [])
+
+    def test_key_order_independent(self):
+        self.assertEqual(ArtifactCache.key(FakeClient(), {"a" : 1, "b" : 2}), ArtifactCache.key(FakeClient(), {"b" : 2, "a" : 1}))
+        self.assertNotEqual(ArtifactCache.key(FakeClient(), {"a" : 1}), ArtifactCache.key(FakeClient(), {"a" : 2}))
+
+    def test_lru_eviction(self):
+        cache = ArtifactCache(self.dir.name, max_bytes=250)
+        keys = [ArtifactCache.key(FakeClient(), i) for i in range(3)]
+        for i, key in enumerate(keys[:2]):
+            cache.put(key, b"x" * 100)
+            os.utime(cache.cache_dir / key[:2] / f"{key}.artifact", (time.time() - 100 + i, time.time() - 100 + i))
+
+        cache.get(keys[0])
+        cache.put(keys[2], b"x" * 100)
+
+        self.assertTrue(cache.contains(keys[0]))
+        self.assertFalse(cache.contains(keys[1]))
+        self.assertTrue(cache.contains(keys[2]))
+        self.assertLessEqual(cache.size, 250)
+
+    def test_index_loaded_once(self):
+        cache = ArtifactCache(self.dir.name, max_bytes=250)
+        keys = [ArtifactCache.key(FakeClient(), i) for i in range(4)]
+        cache.put(keys[0], b"x" * 100)
+
+        with unittest.mock.patch.object(Path, "glob", side_effect=AssertionError("cache directory scanned")):
+            for key in keys[1:]:
+                cache.put(key, b"x" * 100)
+            self.assertEqual(cache.size, 200)
+            cache.remove(keys[3])
+            self.assertEqual(cache.size, 100)
+
+        self.assertEqual([cache.contains(k) for k in keys], [False, False, True, False])
+
+    def test_index_loaded_from_directory(self):
+        keys = [ArtifactCache.key(FakeClient(), i) for i in range(2)]
+        ArtifactCache(self.dir.name).put(keys[0], b"x" * 100)
+
+        cache = ArtifactCache(self.dir.name, max_bytes=150)
+        self.assertEqual(cache.size, 100)
+        cache.put(keys[1], b"x" * 100)
+        self.assertFalse(cache.contains(keys[0]))
+        self.assertEqual(cache.size, 100)
+
+    def test_cached_report(self):
+        cache = ArtifactCache(self.dir.name)
+        CountingJSONReport.generated = 0
+
+        async def run():
+            report = ImprovedScanReport(FakeClient(), "scan", "project")
+            first = await CountingJSONReport("json", report, 300)._get_cached_report(cache)
+            second = await CountingJSONReport("json", report, 300)._get_cached_report(cache)
+            return first, second
+
+        first, second = asyncio.run(run())
+        self.assertEqual(first, second)
+        self.assertEqual(CountingJSONReport.generated, 1)
+
+    def test_cacheable(self):
+        client = FakeClient()
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        today = date.today().isoformat()
+        self.assertTrue(ImprovedScanReport(client, "scan", "project").cacheable)
+        self.assertFalse(ImprovedScanReport(client, "scan", "project", report_type=ReportType.EMAIL, email=["a@b.com"]).cacheable)
+        self.assertTrue(ProjectReport(client, "project", "2024-01-01", yesterday, ProjectReport.Granularity.ALL).cacheable)
+        self.assertFalse(ProjectReport(client, "project", "2024-01-01", today, ProjectReport.Granularity.ALL).cacheable)
+        self.assertFalse(ScanList(client, "project").cacheable)
+
+
+if __name__ == '__main__':
+    unittest.main()
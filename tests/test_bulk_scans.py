@@ -0,0 +1,127 @@
+import unittest, asyncio
+from cxone_api.high.bulk_scans import BulkScanSubmitter, ScanRequest, scan_status_counts
+from cxone_api.exceptions import ResponseException, CommunicationException, AuthException
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeSubmitClient(FakeClient):
+
+    def __init__(self, post_statuses=None, queued=None):
+        super().__init__()
+        self.post_statuses = list(post_statuses or [])
+        self.queued = list(queued or [])
+        self.created = []
+        self.posts = 0
+        self.active = 0
+        self.max_active = 0
+
+    async def handle(self, request):
+        if request.json is not None:
+            self.posts += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            status = self.post_statuses.pop(0) if len(self.post_statuses) > 0 else 201
+            if isinstance(status, BaseException):
+                raise status
+            if status in [201, 500]:
+                # A 500 response can be returned even though the scan was created.
+                self.created.append({"id" : f"scan{len(self.created)}", "tags" : request.json.get("tags", {})})
+            return FakeResponse(status, self.created[-1] if status == 201 else None)
+        elif request.path == "scans/summary":
+            return FakeResponse(200, {"status" : {"Queued" : self.queued.pop(0) if len(self.queued) > 0 else 0, "Running" : 4}})
+        else:
+            value = request.query["tags-values"]
+            return FakeResponse(200, {"scans" : [s for s in self.created if value in s["tags"].values()]})
+
+
+def request(i):
+    return ScanRequest(f"project{i}", "main", [{"type" : "sast", "value" : {}}], clone_url="https://github.com/org/repo.git")
+
+
+class TestBulkScanSubmitter(unittest.IsolatedAsyncioTestCase):
+
+    async def test_bounded_concurrency(self):
+        client = FakeSubmitClient()
+
+        async def source():
+            for i in range(6):
+                yield request(i)
+
+        results = [r async for r in BulkScanSubmitter(client, concurrency=2).submit(source())]
+        self.assertEqual(len(results), 6)
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(len(set(r.scan_id for r in results)), 6)
+        self.assertLessEqual(client.max_active, 2)
+
+    async def test_ambiguous_failure_not_duplicated(self):
+        client = FakeSubmitClient([500])
+        submitter = BulkScanSubmitter(client, retry_delay_s=0, submission_tag="submission-id")
+        results = [r async for r in submitter.submit([request(0)])]
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].scan_id, "scan0")
+        self.assertEqual(client.posts, 1)
+        self.assertEqual(len(client.created), 1)
+
+    async def test_untagged_by_default(self):
+        client = FakeSubmitClient([500])
+        results = [r async for r in BulkScanSubmitter(client, retry_delay_s=0).submit([request(0)])]
+        self.assertFalse(results[0].ok)
+        self.assertEqual(client.posts, 1)
+        self.assertEqual(client.created[0]["tags"], {})
+
+    async def test_communication_failure_reported(self):
+        client = FakeSubmitClient([CommunicationException(FakeClient.exec_request)])
+        results = [r async for r in BulkScanSubmitter(client, retry_delay_s=0).submit([request(0), request(1)])]
+        self.assertEqual(len([r for r in results if r.ok]), 1)
+        self.assertIsInstance([r for r in results if not r.ok][0].exception, CommunicationException)
+
+    async def test_rejected_submission_retried(self):
+        client = FakeSubmitClient([429, 400])
+        results = [r async for r in BulkScanSubmitter(client, retry_delay_s=0).submit([request(0), request(1)])]
+        self.assertEqual(client.posts, 3)
+        self.assertEqual(len([r for r in results if r.ok]), 1)
+        self.assertEqual(len([r for r in results if not r.ok]), 1)
+
+    async def test_backpressure(self):
+        client = FakeSubmitClient(queued=[5, 5, 0])
+        submitter = BulkScanSubmitter(client, max_queued=3, queue_check_interval_s=0.01)
+        results = [r async for r in submitter.submit([request(0)])]
+        self.assertTrue(results[0].ok)
+        self.assertEqual(client.queued, [])
+
+    async def test_auth_failure_reported(self):
+        client = FakeSubmitClient([AuthException("token expired")])
+        results = [r async for r in BulkScanSubmitter(client, retry_delay_s=0).submit([request(0), request(1)])]
+        self.assertEqual(len([r for r in results if r.ok]), 1)
+        self.assertIsInstance([r for r in results if not r.ok][0].exception, AuthException)
+
+    async def test_queue_length_shared(self):
+        client = FakeSubmitClient(queued=[0])
+        submitter = BulkScanSubmitter(client, concurrency=3, max_queued=10)
+        results = [r async for r in submitter.submit([request(i) for i in range(6)])]
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(client.counts["scans/summary"], 1)
+        self.assertEqual(client.max_active, 3)
+
+    async def test_submissions_counted_until_refresh(self):
+        client = FakeSubmitClient(queued=[1, 0])
+        submitter = BulkScanSubmitter(client, concurrency=1, max_queued=3, queue_check_interval_s=0.05)
+        results = [r async for r in submitter.submit([request(i) for i in range(4)])]
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(client.counts["scans/summary"], 2)
+
+    def test_status_counts(self):
+        self.assertEqual(scan_status_counts({"status" : {"Queued" : 2, "Running" : 1}}), {"Queued" : 2, "Running" : 1})
+        for unexpected in [{"statusCounters" : [{"status" : "Queued", "counter" : 3}]}, {"Queued" : 1, "totalCount" : 9},
+                           {"status" : {"Queued" : "1"}}, [], None]:
+            with self.subTest(summary=unexpected):
+                with self.assertRaises(ResponseException):
+                    scan_status_counts(unexpected)
+
+
+if __name__ == '__main__':
+    unittest.main()
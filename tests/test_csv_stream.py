@@ -0,0 +1,44 @@
+import unittest, asyncio
+from cxone_api.high.reports import iter_csv_records, iter_csv_dicts
+
+CSV = 'Name,Count,Notes\r\nalpha,1,"line one\r\nline two"\r\n"be,ta",,"say ""hi"""\r\ngamma,3,last'.encode("utf-8-sig")
+
+
+async def chunked(data, size):
+    for pos in range(0, len(data), size):
+        yield data[pos:pos + size]
+
+
+class TestCsvStream(unittest.TestCase):
+
+    def __records(self, size):
+        async def run():
+            return [r async for r in iter_csv_records(chunked(CSV, size))]
+        return asyncio.run(run())
+
+    def test_records_any_chunk_size(self):
+        expected = [["Name", "Count", "Notes"], ["alpha", "1", "line one\r\nline two"], ["be,ta", "", 'say "hi"'], ["gamma", "3", "last"]]
+        for size in [1, 2, 3, 7, 1024]:
+            with self.subTest(size=size):
+                self.assertEqual(self.__records(size), expected)
+
+    def test_multibyte_split(self):
+        data = "Name\nété\n".encode("utf-8")
+
+        async def run():
+            return [r async for r in iter_csv_records(chunked(data, 1))]
+
+        self.assertEqual(asyncio.run(run()), [["Name"], ["été"]])
+
+    def test_dicts_with_schema(self):
+        async def run():
+            return [r async for r in iter_csv_dicts(chunked(CSV, 5), {"Count" : int})]
+
+        rows = asyncio.run(run())
+        self.assertEqual(rows[0], {"Name" : "alpha", "Count" : 1, "Notes" : "line one\r\nline two"})
+        self.assertIsNone(rows[1]["Count"])
+        self.assertEqual(rows[2]["Count"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest, asyncio, io, os, tempfile, zipfile
+from cxone_api.high.file_filter import FileFilter
+from cxone_api.high.scans import ScanFilterConfig
+from cxone_api.zip_stream import ZipStats, write_zip_directory
+
+FILES = {
+    "src/main.py" : b"print('hello')\n" * 100,
+    "src/Main.java" : b"class Main {}\n",
+    "src/test/test_main.py" : b"assert True\n",
+    "node_modules/lib/index.js" : b"x" * 5000,
+    "docs/guide.md" : b"# guide\n",
+    "package.json" : b"{}",
+}
+
+
+class TestFileFilter(unittest.TestCase):
+
+    def test_empty_expression_includes_all(self):
+        f = FileFilter([None])
+        self.assertTrue(f("src/main.py"))
+        self.assertFalse(f.prunes_directory("src"))
+
+    def test_exclusions(self):
+        f = FileFilter(["!**/node_modules/**,!*.md"])
+        self.assertTrue(f("src/main.py"))
+        self.assertFalse(f("node_modules/lib/index.js"))
+        self.assertFalse(f("a/node_modules/b.js"))
+        self.assertFalse(f("docs/guide.md"))
+        self.assertTrue(f.prunes_directory("node_modules"))
+        self.assertTrue(f.prunes_directory("a/b/node_modules"))
+        self.assertFalse(f.prunes_directory("src"))
+
+    def test_inclusions_with_exclusion_precedence(self):
+        f = FileFilter(["*.py, !src/test/**"])
+        self.assertTrue(f("src/main.py"))
+        self.assertTrue(f("main.py"))
+        self.assertFalse(f("src/test/test_main.py"))
+        self.assertFalse(f("src/Main.java"))
+
+    def test_single_star_does_not_cross_directories(self):
+        f = FileFilter(["src/*.py"])
+        self.assertTrue(f("src/main.py"))
+        self.assertFalse(f("src/test/test_main.py"))
+
+    def test_case_insensitive(self):
+        self.assertFalse(FileFilter(["*.java"])("src/Main.JAVA"))
+        self.assertTrue(FileFilter(["*.java"], case_sensitive=False)("src/Main.JAVA"))
+
+    def test_engines_are_combined(self):
+        f = FileFilter(["*.java", "package.json"])
+        self.assertTrue(f("src/Main.java"))
+        self.assertTrue(f("package.json"))
+        self.assertFalse(f("src/main.py"))
+
+    def test_directory_pruned_only_if_all_engines_exclude_it(self):
+        self.assertFalse(FileFilter(["!node_modules/", "*.js"]).prunes_directory("node_modules"))
+        self.assertTrue(FileFilter(["!node_modules/", "!**/node_modules/**"]).prunes_directory("node_modules"))
+        self.assertFalse(FileFilter(["!node_modules/"]).prunes_directory("a/node_modules"))
+
+    def test_for_engines(self):
+        config = asyncio.run(ScanFilterConfig.from_project_config_json(None,
+            [{"key" : "scan.config.sast.filter", "value" : "!**/test/**"}],
+            [{"key" : "scan.config.sast.filter", "value" : "!*.md"}, {"key" : "scan.config.sca.filter", "value" : ""}]))
+
+        sast = FileFilter.for_engines(config, ["sast"], {"sast" : "!*.json"})
+        self.assertFalse(sast("src/test/test_main.py"))
+        self.assertFalse(sast("docs/guide.md"))
+        self.assertFalse(sast("package.json"))
+        self.assertTrue(sast("src/main.py"))
+
+        both = FileFilter.for_engines(config, ["sast", "sca"])
+        self.assertTrue(both("docs/guide.md"))
+
+
+class TestFileFilterZip(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        for name, content in FILES.items():
+            path = os.path.join(self.dir.name, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_zip_prunes_files_and_reports_savings(self):
+        stats = ZipStats()
+        buffer = io.BytesIO()
+        write_zip_directory(self.dir.name, buffer, FileFilter(["!**/node_modules/**,!*.md"]).zip_options(), stats)
+
+        with zipfile.ZipFile(buffer) as z:
+            self.assertEqual(sorted(z.namelist()), ["package.json", "src/Main.java", "src/main.py", "src/test/test_main.py"])
+
+        self.assertEqual(stats.files_added, 4)
+        self.assertEqual(stats.dirs_pruned, 1)
+        self.assertEqual(stats.files_excluded, 1)
+        self.assertEqual(stats.bytes_excluded, len(FILES["docs/guide.md"]))
+        self.assertEqual(stats.files_pruned, 1)
+        self.assertEqual(stats.bytes_pruned, len(FILES["node_modules/lib/index.js"]))
+        self.assertEqual(stats.bytes_saved, len(FILES["docs/guide.md"]) + len(FILES["node_modules/lib/index.js"]))
+
+    def test_excluded_files_counted_when_not_pruned(self):
+        stats = ZipStats()
+        buffer = io.BytesIO()
+        write_zip_directory(self.dir.name, buffer, FileFilter(["*.py"]).zip_options(), stats)
+
+        with zipfile.ZipFile(buffer) as z:
+            self.assertEqual(sorted(z.namelist()), ["src/main.py", "src/test/test_main.py"])
+
+        self.assertEqual(stats.files_excluded, 4)
+        self.assertEqual(stats.bytes_excluded, sum([len(FILES[n]) for n in FILES.keys() if not n.endswith(".py")]))
+        self.assertEqual(stats.bytes_added, len(FILES["src/main.py"]) + len(FILES["src/test/test_main.py"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from cxone_api.high.projects import ProjectRepoConfig
+from cxone_api.exceptions import ResponseException
+from tests.fakes import FakeClient, FakeResponse
+
+
+def project(i):
+    pid = f"p{i}"
+    if i % 3 == 0:
+        return {"id" : pid, "mainBranch" : "main", "repoUrl" : f"https://example.com/manual/{pid}.git"}
+    return {"id" : pid, "repoId" : f"r{i}", "scmRepoId" : f"scm-repo-{i}", "mainBranch" : "", "repoUrl" : ""}
+
+
+class FakeProjectClient(FakeClient):
+
+    def __init__(self, project_count=30, page_size=7, failed_scms=()):
+        super().__init__(delay_s=0.01)
+        self.failed_scms = failed_scms
+        self.projects = {p["id"] : p for p in [project(i) for i in range(project_count)]}
+        self.page_size = page_size
+        self.scm_requests = []
+        self.route(None, "projects", self.__list)
+        self.route(None, "projects/", lambda r: FakeResponse(200, self.projects[r.path.split("/")[1]]), prefix=True)
+        self.route(None, "repos-manager/repo/", self.__repo, prefix=True)
+        self.route(None, "repos-manager/getscmdtobyid", self.__scm)
+        self.route(None, "configuration/project", lambda r: FakeResponse(200, [{"project" : r.query["project-id"]}]))
+
+    def __list(self, request):
+        ids = request.query["ids"].split(",")
+        offset = int(request.query["offset"])
+        matched = [self.projects[i] for i in ids if i in self.projects]
+        return FakeResponse(200, {"projects" : matched[offset:offset + self.page_size]})
+
+    def __repo(self, request):
+        i = int(request.path.split("/")[-1][1:])
+        return FakeResponse(200, {"url" : f"https://github.com/org{i % 2}/repo{i}.git", "scmId" : f"scm{i % 2}",
+                                  "sastScannerEnabled" : True, "branches" : [{"name" : "develop", "isDefaultBranch" : True}]})
+
+    def __scm(self, request):
+        self.scm_requests.append(request.query["scmId"])
+        if request.query["scmId"] in self.failed_scms:
+            return FakeResponse(500)
+        return FakeResponse(200, {"type" : "github"})
+
+
+class TestProjectRepoConfigLoadMany(unittest.IsolatedAsyncioTestCase):
+
+    async def test_hydrated_instances(self):
+        client = FakeProjectClient()
+        ids = [f"p{i}" for i in range(30)]
+        configs = await ProjectRepoConfig.load_many(client, ids + ["missing", "p1"], concurrency=4, ids_per_page=10)
+
+        self.assertEqual(list(configs.keys()), ids)
+        self.assertEqual(client.counts["repos-manager/repo/r1"], 1)
+        self.assertEqual(sorted(client.scm_requests), ["scm0", "scm1"])
+        self.assertLessEqual(client.max_in_flight, 4)
+
+        before = dict(client.counts)
+        self.assertEqual(await configs["p1"].repo_url, "https://github.com/org1/repo1.git")
+        self.assertEqual(await configs["p1"].primary_branch, "develop")
+        self.assertEqual(await configs["p1"].scm_type, "github")
+        self.assertEqual(await configs["p1"].scm_org, "org1")
+        self.assertEqual(await configs["p4"].scm_id, "scm0")
+        self.assertEqual(await configs["p3"].repo_url, "https://example.com/manual/p3.git")
+        self.assertIsNone(await configs["p3"].scm_type)
+        self.assertEqual(client.counts, before)
+
+    async def test_shared_scm_cache(self):
+        client = FakeProjectClient(project_count=6)
+        cache = {"scm0" : {"type" : "gitlab"}}
+        configs = await ProjectRepoConfig.load_many(client, [f"p{i}" for i in range(6)], scm_cache=cache)
+
+        self.assertEqual(client.scm_requests, ["scm1"])
+        self.assertEqual(set(cache.keys()), {"scm0", "scm1"})
+        self.assertEqual(await configs["p2"].scm_type, "gitlab")
+
+        await ProjectRepoConfig.load_many(client, ["p1", "p2"], scm_cache=cache)
+        self.assertEqual(client.scm_requests, ["scm1"])
+
+    async def test_include_scan_config(self):
+        client = FakeProjectClient(project_count=4)
+        configs = await ProjectRepoConfig.load_many(client, ["p0", "p1"], include_scan_config=True)
+        self.assertEqual(client.counts["configuration/project"], 2)
+        self.assertEqual(await configs["p1"].get_project_scan_config(), [{"project" : "p1"}])
+        self.assertEqual(client.counts["configuration/project"], 2)
+
+    async def test_failed_scm_logged(self):
+        client = FakeProjectClient(project_count=6, failed_scms=("scm1",))
+        with self.assertLogs("ProjectRepoConfig", "WARNING") as logs:
+            configs = await ProjectRepoConfig.load_many(client, [f"p{i}" for i in range(6)])
+
+        self.assertIn("scm1", logs.output[0])
+        self.assertEqual(await configs["p2"].scm_type, "github")
+        with self.assertRaises(ResponseException):
+            await configs["p1"].scm_type
+
+
+class TestProjectRepoConfigMemoization(unittest.IsolatedAsyncioTestCase):
+
+    async def test_values_resolved_once(self):
+        client = FakeProjectClient()
+        config = await ProjectRepoConfig.from_project_id(client, "p1")
+
+        for _ in range(5):
+            self.assertEqual(await config.repo_url, "https://github.com/org1/repo1.git")
+            self.assertEqual(await config.primary_branch, "develop")
+            self.assertEqual(await config.scm_type, "github")
+            self.assertEqual(await config.scm_org, "org1")
+
+        self.assertEqual(client.counts["repos-manager/repo/r1"], 1)
+        self.assertEqual(client.scm_requests, ["scm1"])
+
+    async def test_refresh(self):
+        client = FakeProjectClient()
+        config = await ProjectRepoConfig.from_project_id(client, "p1")
+        self.assertEqual(await config.scm_type, "github")
+
+        config.refresh()
+        self.assertEqual(await config.scm_type, "github")
+        self.assertEqual(client.counts["repos-manager/repo/r1"], 2)
+        self.assertEqual(client.scm_requests, ["scm1", "scm1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from cxone_api.high.sca.analysis.columnar import ScaColumnarTable
+
+class TestScaColumnarTable(unittest.IsolatedAsyncioTestCase):
+    ROWS = [
+        {"projectName" : "p1", "packageName" : "a", "severity" : "High", "epss" : 0.5, "isExploitable" : True, "isFixAvailable" : True, "applicationIds" : ["app1", "app2"]},
+        {"projectName" : "p1", "packageName" : "b", "severity" : "Low", "epss" : 0.1, "isExploitable" : False, "isFixAvailable" : True, "applicationIds" : ["app1"]},
+        {"projectName" : "p2", "packageName" : "a", "severity" : "High", "epss" : None, "isExploitable" : True, "isFixAvailable" : True, "applicationIds" : []},
+        {"projectName" : "p2", "packageName" : "c", "severity" : "Critical", "epss" : 0.9, "isExploitable" : None, "isFixAvailable" : False, "applicationIds" : ["app2"]},
+    ]
+
+    FIELDS = ["projectName", "packageName", "severity", "epss", "isExploitable", "isFixAvailable", "applicationIds"]
+
+    def table(self):
+        return ScaColumnarTable.from_rows(TestScaColumnarTable.ROWS, TestScaColumnarTable.FIELDS)
+
+    def test_canary(self):
+        self.assertTrue(True)
+
+    def test_round_trip(self):
+        self.assertEqual(list(self.table().rows()), TestScaColumnarTable.ROWS)
+
+    def test_count_by_severity_per_project(self):
+        counts = self.table().group_by("projectName", "severity").count()
+        self.assertEqual(counts, {("p1", "High") : 1, ("p1", "Low") : 1, ("p2", "High") : 1, ("p2", "Critical") : 1})
+
+    def test_epss_sum_by_application(self):
+        sums = self.table().group_by("applicationIds").sum("epss")
+        self.assertAlmostEqual(sums["app1"], 0.6)
+        self.assertAlmostEqual(sums["app2"], 1.4)
+
+    def test_exploitable_and_fixable_per_package(self):
+        counts = self.table().filter(isExploitable=True, isFixAvailable=True).group_by("packageName").count()
+        self.assertEqual(counts, {"a" : 2})
+
+    def test_filter_predicate_and_list_membership(self):
+        self.assertEqual(len(self.table().filter(epss=lambda x: x is not None and x > 0.3)), 2)
+        self.assertEqual(self.table().filter(applicationIds="app2").column("packageName"), ["a", "c"])
+
+    def test_filter_unknown_value(self):
+        self.assertEqual(len(self.table().filter(severity="Medium")), 0)
+
+    def test_filter_predicate_without_missing_values(self):
+        self.assertEqual(self.table().filter(packageName=lambda x: x.startswith("a")).column("projectName"), ["p1", "p2"])
+
+    def test_filter_predicate_with_missing_values(self):
+        table = ScaColumnarTable.from_rows([{"packageName" : "a"}, {"packageName" : None}], ["packageName"])
+        self.assertEqual(len(table.filter(packageName=lambda x: x is None)), 1)
+
+    def test_int_values(self):
+        table = ScaColumnarTable.from_rows([{"count" : 1}, {"count" : None}, {"count" : 3}], ["count"])
+        self.assertEqual(table.column("count"), [1, None, 3])
+        self.assertIsInstance(table.column("count")[0], int)
+        self.assertEqual(table.top_k("count", 1)[0]["count"], 3)
+
+    def test_top_k(self):
+        top = self.table().top_k("epss", 2)
+        self.assertEqual([r["packageName"] for r in top], ["c", "a"])
+
+    async def test_from_query(self):
+        async def gen():
+            for r in TestScaColumnarTable.ROWS:
+                yield r
+
+        table = await ScaColumnarTable.from_query(gen(), ["severity"])
+        self.assertEqual(table.group_by("severity").count(), {"High" : 2, "Low" : 1, "Critical" : 1})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,144 @@
+import unittest, asyncio, gzip, os, tempfile
+from cxone_api.high.sca import ScaExportManager, ScaReportOptions, ScaReportParameters, ScaReportType, get_sca_report_content
+from cxone_api.exceptions import ResponseException
+from cxone_api.high.scheduling import PollScheduler
+from cxone_api.high.artifact_cache import ArtifactCache
+from tests.fakes import FakeClient, FakeResponse
+
+CONTENT = b'{"packages" : []}' * 5000
+
+
+class FakeExportClient(FakeClient):
+    auth_endpoint = "https://iam.foo.bar.com/auth/realms/tenant/protocol/openid-connect/token"
+
+    def __init__(self, compress, fail_scans=(), fail_download=False):
+        super().__init__()
+        self.compress = compress
+        self.fail_scans = fail_scans
+        self.fail_download = fail_download
+        self.exports = {}
+
+    def handle(self, request):
+        if request.json is not None:
+            export_id = f"export-{request.json['scanId']}"
+            self.exports[export_id] = 0
+            return FakeResponse(202, {"exportId" : export_id})
+        elif "exportId" in request.query:
+            export_id = request.query["exportId"]
+            self.exports[export_id] += 1
+            if export_id.split("-", 1)[1] in self.fail_scans:
+                status = "Failed"
+            else:
+                status = "Completed" if self.exports[export_id] > 1 else "Exporting"
+            return FakeResponse(200, {"exportId" : export_id, "exportStatus" : status})
+        elif self.fail_download:
+            return FakeResponse(500)
+        else:
+            body = gzip.compress(CONTENT) if self.compress else CONTENT
+            return FakeResponse(200, body=body, headers={"Content-Length" : str(len(body))})
+
+
+class TestScaExportManager(unittest.TestCase):
+
+    def __export(self, client, scans, options):
+        async def run(dest):
+            manager = ScaExportManager(client, dest, scheduler=PollScheduler(initial_delay_s=0.01, jitter=0))
+            results = [r async for r in manager.export_many([(s, options) for s in scans])]
+            return {r.scanId : (r, open(r.path, "rb").read() if r.ok else None) for r in results}
+
+        with tempfile.TemporaryDirectory() as d:
+            return asyncio.run(run(d))
+
+    def test_export_many(self):
+        results = self.__export(FakeExportClient(False), ["a", "b", "c"], ScaReportOptions(ScaReportType.SpdxJson))
+        self.assertEqual(len(results), 3)
+        for scan, (result, content) in results.items():
+            self.assertTrue(result.ok)
+            self.assertEqual(os.path.basename(result.path), f"{scan}-SpdxJson.json")
+            self.assertEqual(content, CONTENT)
+
+    def test_export_decompresses(self):
+        options = ScaReportOptions(ScaReportType.ScanReportJson, ScaReportParameters(compressOutput=True))
+        result, content = self.__export(FakeExportClient(True), ["a"], options)["a"]
+        self.assertEqual(result.bytes_written, len(CONTENT))
+        self.assertEqual(content, CONTENT)
+
+    def test_export_cached(self):
+        client = FakeExportClient(True)
+        options = ScaReportOptions(ScaReportType.ScanReportJson, ScaReportParameters(compressOutput=True))
+
+        async def run(dest, cache_dir):
+            manager = ScaExportManager(client, dest, scheduler=PollScheduler(initial_delay_s=0.01, jitter=0), cache=ArtifactCache(cache_dir))
+            first = await manager.export("a", options)
+            second = await manager.export("a", options, os.path.join(dest, "copy.json"))
+            return open(first.path, "rb").read(), open(second.path, "rb").read()
+
+        with tempfile.TemporaryDirectory() as d, tempfile.TemporaryDirectory() as c:
+            first, second = asyncio.run(run(d, c))
+
+        self.assertEqual(first, CONTENT)
+        self.assertEqual(second, CONTENT)
+        self.assertEqual(len(client.exports), 1)
+        self.assertEqual(client.exports["export-a"], 2)
+
+    def test_export_failure_reported(self):
+        results = self.__export(FakeExportClient(False, ["b"]), ["a", "b"], ScaReportOptions(ScaReportType.ScanReportCsv))
+        self.assertTrue(results["a"][0].ok)
+        self.assertFalse(results["b"][0].ok)
+
+    def test_failed_download_keeps_existing_file(self):
+        client = FakeExportClient(False, fail_download=True)
+
+        async def run(dest):
+            manager = ScaExportManager(client, dest, scheduler=PollScheduler(initial_delay_s=0.01, jitter=0))
+            with self.assertRaises(ResponseException):
+                await manager.export("a", ScaReportOptions(ScaReportType.SpdxJson), os.path.join(dest, "a.json"))
+
+        with tempfile.TemporaryDirectory() as d:
+            with open(os.path.join(d, "a.json"), "wb") as f:
+                f.write(b"previous")
+            asyncio.run(run(d))
+
+            self.assertEqual(os.listdir(d), ["a.json"])
+            self.assertEqual(open(os.path.join(d, "a.json"), "rb").read(), b"previous")
+
+
+class TestScaReportContent(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    @staticmethod
+    def client(download_status=200):
+        client = FakeClient()
+        client.auth_endpoint = FakeExportClient.auth_endpoint
+        client.route(None, "sca/export/requests", lambda r: FakeResponse(202, {"exportId" : "e"}) if r.json is not None
+                     else FakeResponse(200, {"exportId" : "e", "exportStatus" : "Completed"}))
+        client.route(None, "sca/export/requests/e/download", lambda r: FakeResponse(download_status, body=CONTENT))
+        return client
+
+    async def test_cached_content(self):
+        cache = ArtifactCache(self.dir.name)
+        options = ScaReportOptions(ScaReportType.SpdxJson)
+
+        client = self.client()
+        self.assertEqual(await get_sca_report_content(client, "a", options, cache=cache), CONTENT)
+        self.assertEqual(client.counts["sca/export/requests/e/download"], 1)
+
+        cached_client = self.client()
+        self.assertEqual(await get_sca_report_content(cached_client, "a", options, cache=cache), CONTENT)
+        self.assertEqual(cached_client.requests, [])
+
+    async def test_failed_download_raises(self):
+        cache = ArtifactCache(self.dir.name)
+        client = self.client(download_status=500)
+        with self.assertRaises(ResponseException):
+            await get_sca_report_content(client, "a", ScaReportOptions(ScaReportType.SpdxJson), cache=cache)
+        self.assertEqual(cache.size, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest, asyncio, re
+from cxone_api.high.sca.analysis.batch import ScaGQLBatchExecutor, alias_query
+from cxone_api.high.sca import ScaTenantRisks, ScaTenantPackages
+from cxone_api.exceptions import ResponseException
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeGQLClient(FakeClient):
+
+    def __init__(self, rows_by_element):
+        super().__init__()
+        self.rows = rows_by_element
+
+    def handle(self, request):
+        data = {}
+        for alias, element in re.findall(r"(q\d+): (\w+)\(", request.json['query']):
+            skip = request.json['variables'][f"{alias}_skip"]
+            take = request.json['variables'][f"{alias}_take"]
+            data[alias] = self.rows[element][skip:skip + take] if element in self.rows else None
+        return FakeResponse(200, {"data" : data})
+
+
+class TestScaGQLBatch(unittest.IsolatedAsyncioTestCase):
+
+    def test_canary(self):
+        self.assertTrue(True)
+
+    def test_alias_query(self):
+        decls, selection = alias_query("query ($where: X, $take: Int!) { reportingRisks(where: $where, take: $take) { a b } }", "q3")
+        self.assertEqual(decls, "$q3_where: X, $q3_take: Int!")
+        self.assertTrue(selection.startswith("q3: reportingRisks(where: $q3_where, take: $q3_take)"))
+
+    def test_alias_query_bad_format(self):
+        with self.assertRaises(ValueError):
+            alias_query("{ reportingRisks { a } }", "q0")
+
+    async def test_batched_iteration(self):
+        client = FakeGQLClient({"reportingRisks" : [{"n" : i} for i in range(5)],
+                             "reportingPackages" : [{"n" : i} for i in range(3)]})
+        executor = ScaGQLBatchExecutor(client, max_batch_size=10, linger_s=0.01)
+
+        async def collect(query):
+            return [x['n'] async for x in query]
+
+        risks, packages = await asyncio.gather(collect(ScaTenantRisks(client, page_size=2, batch_executor=executor)),
+                                               collect(ScaTenantPackages(client, page_size=2, batch_executor=executor)))
+
+        self.assertEqual(risks, list(range(5)))
+        self.assertEqual(packages, list(range(3)))
+        self.assertEqual(executor.round_trips, len(client.requests))
+        self.assertLess(executor.round_trips, 7)
+
+    async def test_missing_alias_raises(self):
+        client = FakeGQLClient({})
+        executor = ScaGQLBatchExecutor(client, linger_s=0)
+        with self.assertRaises(ResponseException):
+            await executor.execute(ScaTenantRisks(client)._query, {"take" : 1, "skip" : 0}, "reportingRisks")
+
+if __name__ == "__main__":
+    unittest.main()
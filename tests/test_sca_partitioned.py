@@ -0,0 +1,78 @@
+import unittest
+import requests
+from cxone_api.high.sca import ScaTenantRisks, ScaPartitionKey, partitioned_query
+from cxone_api.exceptions import ResponseException
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakePartitionClient(FakeClient):
+
+    def __init__(self, rows_per_partition=3, fail=()):
+        super().__init__(delay_s=0.01)
+        self.rows_per_partition = rows_per_partition
+        self.fail = fail
+        self.wheres = []
+        self.route(requests.post, "sca/graphql/graphql", self.__query)
+        self.route(None, "projects", lambda r: FakeResponse(200, {"projects" : [{"id" : f"p{i}"} for i in range(5)][int(r.query["offset"]):]}))
+
+    @staticmethod
+    def partition_of(where):
+        criteria = where["and"][1] if "and" in where else where
+        if "projectId" in criteria:
+            return criteria["projectId"]["eq"]
+        return criteria["applicationIds"]["some"]["eq"]
+
+    def __query(self, request):
+        variables = request.json["variables"]
+        self.wheres.append(variables["where"])
+        partition = FakePartitionClient.partition_of(variables["where"])
+        if partition in self.fail:
+            return FakeResponse(500)
+        rows = [{"partition" : partition, "n" : i} for i in range(self.rows_per_partition)]
+        return FakeResponse(200, {"data" : {"reportingRisks" : rows[variables["skip"]:variables["skip"] + variables["take"]]}})
+
+
+class TestPartitionedQuery(unittest.IsolatedAsyncioTestCase):
+
+    async def test_merged_where(self):
+        client = FakePartitionClient()
+        where = {"severity" : {"eq" : "High"}}
+        rows = [r async for r in partitioned_query(client, ScaTenantRisks, ScaPartitionKey.PROJECT_ID, ["p1", "p2"],
+                                                   where=where, page_size=2)]
+
+        self.assertEqual(sorted((r["partition"], r["n"]) for r in rows), [(p, n) for p in ["p1", "p2"] for n in range(3)])
+        self.assertTrue(all(w == {"and" : [where, {"projectId" : {"eq" : FakePartitionClient.partition_of(w)}}]}
+                            for w in client.wheres))
+
+    async def test_concurrency_bound(self):
+        client = FakePartitionClient()
+        rows = [r async for r in partitioned_query(client, ScaTenantRisks, ScaPartitionKey.PROJECT_ID,
+                                                   [f"p{i}" for i in range(10)], concurrency=3, page_size=1)]
+
+        self.assertEqual(len(rows), 30)
+        self.assertGreater(client.max_in_flight, 1)
+        self.assertLessEqual(client.max_in_flight, 3)
+
+    async def test_partition_failure_raises(self):
+        client = FakePartitionClient(fail=("bad",))
+        with self.assertRaises(ResponseException):
+            async for _ in partitioned_query(client, ScaTenantRisks, ScaPartitionKey.PROJECT_ID, ["p1", "bad", "p2"],
+                                             page_retries_max=1, page_retry_delay_s=0):
+                pass
+
+    async def test_application_partition(self):
+        client = FakePartitionClient(rows_per_partition=1)
+        rows = [r async for r in partitioned_query(client, ScaTenantRisks, ScaPartitionKey.APPLICATION_ID, ["a1", "a2"])]
+
+        self.assertEqual(sorted(r["partition"] for r in rows), ["a1", "a2"])
+        self.assertEqual(sorted(client.wheres, key=str), [{"applicationIds" : {"some" : {"eq" : "a1"}}},
+                                                          {"applicationIds" : {"some" : {"eq" : "a2"}}}])
+
+    async def test_all_projects_when_partitions_omitted(self):
+        client = FakePartitionClient(rows_per_partition=1)
+        rows = [r async for r in partitioned_query(client, ScaTenantRisks, ScaPartitionKey.PROJECT_ID)]
+        self.assertEqual(sorted(r["partition"] for r in rows), [f"p{i}" for i in range(5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from cxone_api.high.sca import ScaTenantRisks, ScaTenantPackages, ScaTenantLicenses, record_type
+
+
+class FakeRisks(ScaTenantRisks):
+    def __init__(self, rows):
+        super().__init__(None)
+        self.__rows = rows
+
+    def __aiter__(self):
+        return self.__gen()
+
+    async def __gen(self):
+        for r in self.__rows:
+            yield r
+
+
+class FakeTaggedRisks(FakeRisks):
+    _QUERY_TEXT = "query ($take: Int!) { reportingRisks(take: $take) { projectName tags } }"
+
+
+class TestScaRecords(unittest.IsolatedAsyncioTestCase):
+
+    def test_canary(self):
+        self.assertTrue(True)
+
+    def test_record_fields(self):
+        for query_class in [ScaTenantRisks, ScaTenantPackages, ScaTenantLicenses]:
+            with self.subTest(query_class.__name__):
+                fields = record_type(query_class)._fields
+                self.assertIn("projectId", fields)
+                self.assertIn("applicationIds", fields)
+                self.assertNotIn("where", fields)
+
+    async def test_compact_records(self):
+        rows = [{"projectName" : "".join(["proj", "ect"]), "severity" : "High", "applicationIds" : ["a"]},
+                {"projectName" : "".join(["pro", "ject"]), "severity" : "High", "applicationIds" : ["a"]}]
+
+        records = [r async for r in FakeRisks(rows).records()]
+
+        self.assertEqual(records[0].projectName, "project")
+        self.assertIs(records[0].projectName, records[1].projectName)
+        self.assertEqual(records[0]['applicationIds'], ("a",))
+        self.assertIsNone(records[0].get("scanId"))
+        self.assertFalse(hasattr(records[0], "__dict__"))
+
+        with self.assertRaises(AttributeError):
+            records[0].severity = "Low"
+
+    async def test_hash_with_dict_values(self):
+        rows = [{"projectName" : "p", "tags" : {"env" : ["prod", "eu"]}} for _ in range(2)]
+        records = [r async for r in FakeTaggedRisks(rows).records()]
+
+        self.assertEqual(hash(records[0]), hash(records[1]))
+        self.assertEqual(len({records[0], records[1]}), 1)
+        self.assertEqual(records[0].tags, {"env" : ("prod", "eu")})
+
+    def test_query_text_on_class(self):
+        self.assertIs(ScaTenantRisks(None)._query, ScaTenantRisks._QUERY_TEXT)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from cxone_api.high.scans import ScanInspector, ScanModel
+
+
+def scan(scan_id, status, engines=None, **engine_states):
+    engines = engines if engines is not None else list(engine_states.keys())
+    return {"id" : scan_id, "projectId" : "p1", "status" : status, "engines" : engines,
+            "statusDetails" : [{"name" : name, "status" : state, "details" : ""} for name, state in engine_states.items()]}
+
+
+class TestScanInspector(unittest.TestCase):
+
+    def test_root_states(self):
+        for status, executing, successful, failed in [("Queued", True, False, False), ("Running", True, False, False),
+                                                      ("Completed", False, True, False), ("Failed", False, False, True),
+                                                      ("Canceled", False, False, True)]:
+            with self.subTest(status=status):
+                inspector = ScanInspector(scan("s1", status, sast=status))
+                self.assertEqual(inspector.executing, executing)
+                self.assertEqual(inspector.successful, successful)
+                self.assertEqual(inspector.failed, failed)
+
+    def test_partial_states(self):
+        self.assertTrue(ScanInspector(scan("s1", "Partial", sast="Running", sca="Completed")).executing)
+
+        done = ScanInspector(scan("s1", "Partial", sast="Completed", sca="Completed"))
+        self.assertFalse(done.executing)
+        self.assertTrue(done.successful)
+
+        with_failure = ScanInspector(scan("s1", "Partial", sast="Failed", sca="Completed"))
+        self.assertFalse(with_failure.executing)
+        self.assertFalse(with_failure.successful)
+        self.assertFalse(with_failure.failed)
+
+    def test_only_requested_engines_count(self):
+        inspector = ScanInspector(scan("s1", "Partial", engines=["sca"], sast="Running", sca="Completed"))
+        self.assertFalse(inspector.executing)
+        self.assertTrue(inspector.successful)
+        self.assertEqual(inspector.model.engine_states, frozenset(["Completed"]))
+
+    def test_properties(self):
+        json = scan("s1", "Completed", sast="Completed")
+        inspector = ScanInspector(json)
+        self.assertEqual(inspector.scan_id, "s1")
+        self.assertEqual(inspector.project_id, "p1")
+        self.assertIs(inspector.json, json)
+        self.assertEqual(inspector.status_details, json["statusDetails"])
+        self.assertEqual(inspector.state_msg, "Status: Completed [sast: Completed]")
+
+    def test_missing_details(self):
+        inspector = ScanInspector({"id" : "s1", "status" : "Queued", "statusDetails" : None})
+        self.assertTrue(inspector.executing)
+        self.assertEqual(inspector.status_details, [])
+
+    def test_model_is_slotted(self):
+        with self.assertRaises(AttributeError):
+            ScanModel(scan("s1", "Queued")).extra = 1
+
+    def test_inspect_many(self):
+        result = ScanInspector.inspect_many([scan("s1", "Running", sast="Running"),
+                                             scan("s2", "Completed", sast="Completed"),
+                                             scan("s3", "Failed", sast="Failed"),
+                                             scan("s4", "Partial", sast="Failed", sca="Completed"),
+                                             scan("s5", "Queued")])
+
+        self.assertEqual([i.scan_id for i in result.executing], ["s1", "s5"])
+        self.assertEqual([i.scan_id for i in result.successful], ["s2"])
+        self.assertEqual([i.scan_id for i in result.failed], ["s3"])
+        self.assertEqual([i.scan_id for i in result.incomplete], ["s4"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest, asyncio
+import requests
+from cxone_api.exceptions import ResponseException
+from cxone_api.high.scans import ScanInvoker
+from tests.fakes import FakeClient, FakeResponse
+
+DELAY = 0.1
+
+PROJECT = {"id" : "p1", "repoId" : "r1", "scmRepoId" : "scm-repo-1", "mainBranch" : "main", "repoUrl" : ""}
+REPO = {"url" : "https://github.com/org/repo.git", "scmId" : "scm1", "sastScannerEnabled" : True, "scaScannerEnabled" : True,
+        "branches" : [{"name" : "main", "isDefaultBranch" : True}]}
+SCM = {"type" : "github"}
+
+
+class FakeDelayClient(FakeClient):
+    """Every request takes DELAY seconds, so steps that run one after another add up."""
+
+    def __init__(self, project=PROJECT):
+        super().__init__(delay_s=DELAY)
+        self.submitted = None
+        self.route(requests.post, "uploads", lambda r: FakeResponse(200, {"url" : "https://storage.example.com/upload"}))
+        self.route(requests.post, "scans", self.__submit)
+        self.route(requests.post, "repos-manager/scms/", self.__submit, prefix=True)
+        self.route(None, "projects/p1", lambda r: FakeResponse(200, project) if project is not None else FakeResponse(404))
+        self.route(None, "projects/last-scan", lambda r: FakeResponse(200, {"p1" : {"id" : "s0", "engines" : ["sast", "kics"]}}))
+        self.route(None, "repos-manager/repo/", lambda r: FakeResponse(200, REPO), prefix=True)
+        self.route(None, "repos-manager/getscmdtobyid", lambda r: FakeResponse(200, SCM))
+        self.route(None, "configuration/project", lambda r: FakeResponse(200, []))
+
+    def __submit(self, request):
+        self.submitted = (request.url[len(self.api_endpoint):], request.json)
+        return FakeResponse(201, {"id" : "scan-1"})
+
+
+class TestScanInvokerConcurrency(unittest.IsolatedAsyncioTestCase):
+
+    async def test_zip_upload_resolves_engines_during_upload(self):
+        client = FakeDelayClient({k : v for k, v in PROJECT.items() if k != "repoId"})
+        response = await ScanInvoker.scan_by_local_zip_upload(client, "p1", __file__, "main")
+
+        self.assertTrue(response.ok)
+        self.assertEqual(client.submitted[1]["config"], [{"type" : "sast", "value" : {}}, {"type" : "kics", "value" : {}}])
+        self.assertEqual(client.submitted[1]["handler"]["uploadUrl"], "https://storage.example.com/upload")
+        self.assertGreater(client.max_in_flight, 1)
+
+    async def test_project_config_scan_resolves_repo_settings_concurrently(self):
+        client = FakeDelayClient()
+        response = await ScanInvoker.scan_by_project_config(client, "p1")
+
+        self.assertTrue(response.ok)
+        path, payload = client.submitted
+        self.assertEqual(path, "repos-manager/scms/scm1/orgs/org/repo/projectScan?projectId=p1")
+        self.assertEqual(payload["repoOrigin"], "github")
+        self.assertEqual(payload["project"], {"repoIdentity" : "scm-repo-1", "repoUrl" : "https://github.com/org/repo.git",
+                                              "projectId" : "p1", "defaultBranch" : "main", "scannerTypes" : ["sast", "sca"],
+                                              "repoId" : "r1"})
+        # The project, repo and scm configurations are each retrieved once before the submit.
+        self.assertEqual(len(client.requests), 4)
+
+    async def test_failed_step_cancels_upload(self):
+        client = FakeDelayClient(project=None)
+        with self.assertRaises(ResponseException):
+            await ScanInvoker.scan_by_local_zip_upload(client, "p1", __file__, "main")
+        await asyncio.sleep(DELAY * 3)
+        self.assertEqual(client.uploads, [])
+        self.assertIsNone(client.submitted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest, asyncio
+from cxone_api.high.bulk_scans import ScanRequest
+from cxone_api.high.scan_scheduler import ScanScheduler, ScanPriority
+from cxone_api.high.scan_watcher import ScanWatcher
+from cxone_api.exceptions import AuthException
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeTenantClient(FakeClient):
+
+    def __init__(self, other_active=0, summary_raises=None):
+        super().__init__()
+        self.summary_raises = summary_raises
+        self.order = []
+        self.scans = {}
+        self.other_active = other_active
+        self.max_running = 0
+
+    def running(self):
+        return len([s for s in self.scans.values() if s["status"] == "Running"])
+
+    def handle(self, request):
+        if request.json is not None:
+            scan_id = f"scan{len(self.scans)}"
+            self.order.append(request.json["project"]["id"])
+            self.scans[scan_id] = {"id" : scan_id, "projectId" : request.json["project"]["id"], "status" : "Running",
+                                   "engines" : ["sast"], "statusDetails" : [], "polls" : 0}
+            self.max_running = max(self.max_running, self.running())
+            return FakeResponse(201, {"id" : scan_id})
+        elif request.path == "scans/summary":
+            if self.summary_raises is not None:
+                raise self.summary_raises
+            return FakeResponse(200, {"status" : {"Queued" : 0, "Running" : self.running() + self.other_active}})
+        else:
+            ids = request.query["scan-ids"].split(",")
+            for scan_id in ids:
+                scan = self.scans[scan_id]
+                scan["polls"] += 1
+                if scan["polls"] >= 2:
+                    scan["status"] = "Completed"
+            return FakeResponse(200, {"scans" : [self.scans[s] for s in ids]})
+
+
+def request(project_id):
+    return ScanRequest(project_id, "main", [{"type" : "sast", "value" : {}}], clone_url="https://github.com/org/repo.git")
+
+
+class TestScanScheduler(unittest.IsolatedAsyncioTestCase):
+
+    def scheduler(self, client, **kwargs):
+        return ScanScheduler(client, check_interval_s=0.01, watcher=ScanWatcher(client, initial_interval_s=0.01), **kwargs)
+
+    async def test_priority_order(self):
+        client = FakeTenantClient()
+        scheduler = self.scheduler(client, max_active=1)
+        futures = [scheduler.schedule(request("feature"), ScanPriority.for_branch("feature/x")),
+                   scheduler.schedule(request("nightly"), ScanPriority.LOW),
+                   scheduler.schedule(request("release"), ScanPriority.for_branch("release/1.0"))]
+        results = await asyncio.gather(*futures)
+
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual(client.order, ["release", "feature", "nightly"])
+        self.assertEqual(client.max_running, 1)
+
+    async def test_tenant_capacity(self):
+        client = FakeTenantClient(other_active=2)
+        scheduler = self.scheduler(client, max_active=5, tenant_max_active=4)
+        for i in range(6):
+            scheduler.schedule(request(f"p{i}"))
+        await scheduler.join()
+
+        self.assertEqual(len(client.order), 6)
+        self.assertLessEqual(client.max_running, 2)
+        self.assertEqual(scheduler.pending, 0)
+
+    async def test_capacity_check_failure_fails_pending(self):
+        client = FakeTenantClient(summary_raises=AuthException("token expired"))
+        scheduler = self.scheduler(client, tenant_max_active=4)
+        futures = [scheduler.schedule(request(f"p{i}")) for i in range(3)]
+
+        with self.assertLogs("ScanScheduler", "ERROR"):
+            await asyncio.wait_for(scheduler.join(), 5)
+
+        results = [f.result() for f in futures]
+        self.assertTrue(all(isinstance(r.exception, AuthException) for r in results))
+        self.assertEqual(client.order, [])
+
+    async def test_close(self):
+        client = FakeTenantClient(other_active=10)
+        async with ScanScheduler(client, max_active=2, tenant_max_active=11, check_interval_s=0.01) as scheduler:
+            submitted = await scheduler.schedule(request("p0"))
+            held = scheduler.schedule(request("p1"))
+            await asyncio.sleep(0.03)
+            self.assertEqual(scheduler.pending, 1)
+
+        self.assertTrue(submitted.ok)
+        self.assertTrue(held.cancelled())
+        self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+
+    def test_branch_priority(self):
+        self.assertEqual(ScanPriority.for_branch("main"), ScanPriority.HIGH)
+        self.assertEqual(ScanPriority.for_branch("feature/abc"), ScanPriority.NORMAL)
+        self.assertEqual(ScanPriority.for_branch("dependabot/x", low_patterns=["dependabot/*"]), ScanPriority.LOW)
+
+
+if __name__ == '__main__':
+    unittest.main()
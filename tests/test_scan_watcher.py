@@ -0,0 +1,186 @@
+import unittest, asyncio
+from cxone_api.high.scan_watcher import ScanWatcher
+from cxone_api.exceptions import ScanException, AuthException
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeScanClient(FakeClient):
+
+    def __init__(self, polls_to_complete, failures=0, raises=None):
+        super().__init__()
+        self.polls_to_complete = polls_to_complete
+        self.polls = {}
+        self.failures = failures
+        self.raises = raises
+
+    def scan(self, scan_id):
+        self.polls[scan_id] = self.polls.get(scan_id, 0) + 1
+        done = self.polls[scan_id] >= self.polls_to_complete[scan_id]
+        return {"id" : scan_id, "projectId" : "p", "status" : "Completed" if done else "Running", "engines" : ["sast"],
+                "statusDetails" : [{"name" : "sast", "status" : "Completed" if done else "Running", "details" : ""}]}
+
+    def handle(self, request):
+        if self.raises is not None:
+            raise self.raises
+        if self.failures > 0:
+            self.failures -= 1
+            return FakeResponse(500)
+        scan_ids = request.query["scan-ids"].split(",")
+        return FakeResponse(200, {"scans" : [self.scan(s) for s in scan_ids if s in self.polls_to_complete]})
+
+
+class TestScanWatcher(unittest.IsolatedAsyncioTestCase):
+
+    async def test_batched_completion(self):
+        client = FakeScanClient({f"s{i}" : 1 + i % 3 for i in range(10)})
+        watcher = ScanWatcher(client, batch_size=4, initial_interval_s=0.01)
+        completed = []
+
+        async def on_complete(inspector):
+            completed.append(inspector.scan_id)
+
+        for i in range(10):
+            watcher.watch(f"s{i}", on_complete)
+
+        results = await watcher.wait_all([f"s{i}" for i in range(10)], timeout_s=5)
+
+        self.assertTrue(all(inspector.successful for inspector in results.values()))
+        self.assertEqual(sorted(completed), sorted(results.keys()))
+        self.assertTrue(all(len(r.query["scan-ids"].split(",")) <= 4 for r in client.requests))
+        self.assertEqual(watcher.request_count, len(client.requests))
+        self.assertLessEqual(len(client.requests), 3 + 2 + 1)
+        self.assertEqual(watcher.watching, [])
+
+    async def test_failed_poll_retried(self):
+        client = FakeScanClient({"a" : 1}, failures=2)
+        watcher = ScanWatcher(client, initial_interval_s=0.01)
+        with self.assertLogs("ScanWatcher", "WARNING"):
+            inspector = await watcher.wait("a", timeout_s=5)
+
+        self.assertTrue(inspector.successful)
+        self.assertEqual(len(client.requests), 3)
+
+    async def test_unexpected_failure_fails_waiters(self):
+        watcher = ScanWatcher(FakeScanClient({"a" : 1}, raises=AuthException("token expired")), initial_interval_s=0.01)
+        with self.assertLogs("ScanWatcher", "ERROR"):
+            with self.assertRaises(AuthException):
+                await watcher.wait("a", timeout_s=5)
+        self.assertEqual(watcher.watching, [])
+
+    async def test_failing_callback_logged(self):
+        watcher = ScanWatcher(FakeScanClient({"a" : 1}), initial_interval_s=0.01)
+        called = []
+
+        async def failing(inspector):
+            raise ScanException("callback failed")
+
+        async def succeeding(inspector):
+            called.append(inspector.scan_id)
+
+        watcher.watch("a", failing)
+        watcher.watch("a", succeeding)
+        with self.assertLogs("ScanWatcher", "ERROR"):
+            await watcher.wait("a", timeout_s=5)
+            await asyncio.sleep(0)
+        self.assertEqual(called, ["a"])
+
+    async def test_concurrent_waiters(self):
+        client = FakeScanClient({"a" : 10})
+        watcher = ScanWatcher(client, initial_interval_s=0.01, backoff_factor=1)
+
+        results = await asyncio.gather(watcher.wait("a", timeout_s=0.03), watcher.wait("a", timeout_s=5), return_exceptions=True)
+
+        self.assertIsInstance(results[0], asyncio.TimeoutError)
+        self.assertTrue(results[1].successful)
+        self.assertEqual(watcher.watching, [])
+
+    async def test_timed_out_waiter_keeps_callback(self):
+        watcher = ScanWatcher(FakeScanClient({"a" : 10}), initial_interval_s=0.01, backoff_factor=1)
+        done = asyncio.Event()
+
+        async def on_complete(inspector):
+            done.set()
+
+        watcher.watch("a", on_complete)
+        with self.assertRaises(asyncio.TimeoutError):
+            await watcher.wait("a", timeout_s=0.03)
+        self.assertEqual(watcher.watching, ["a"])
+
+        await asyncio.wait_for(done.wait(), 5)
+
+    async def test_closed_events_release_scans(self):
+        watcher = ScanWatcher(FakeScanClient({"a" : 1000}), initial_interval_s=0.01)
+        events = watcher.events(scan_ids=["a"])
+        await events.__anext__()
+        self.assertEqual(watcher.watching, ["a"])
+
+        await events.aclose()
+        self.assertEqual(watcher.watching, [])
+
+    async def test_events(self):
+        client = FakeScanClient({"a" : 3, "b" : 1})
+        watcher = ScanWatcher(client, initial_interval_s=0.01)
+        events = [e async for e in watcher.events(scan_ids=["a", "b"])]
+
+        a_events = [e for e in events if e.scan_id == "a"]
+        self.assertEqual([(e.previous_status, e.status) for e in a_events], [(None, "Running"), ("Running", "Completed")])
+        self.assertEqual(a_events[1].engine_changes["sast"][1]["status"], "Completed")
+        self.assertTrue(a_events[1].completed)
+        self.assertEqual(len([e for e in events if e.scan_id == "b"]), 1)
+
+    async def test_events_project_filter(self):
+        client = FakeScanClient({"a" : 2})
+        watcher = ScanWatcher(client, initial_interval_s=0.01)
+        received = {"p" : [], "other" : []}
+
+        async def collect(project_id):
+            async for event in watcher.events(project_ids=[project_id]):
+                received[project_id].append(event.status)
+
+        tasks = [asyncio.create_task(collect(p)) for p in received.keys()]
+        await asyncio.sleep(0)
+        await watcher.wait("a", timeout_s=5)
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.assertEqual(received["p"], ["Running", "Completed"])
+        self.assertEqual(received["other"], [])
+
+    async def test_missing_scan(self):
+        watcher = ScanWatcher(FakeScanClient({}), initial_interval_s=0.01, max_misses=2)
+        with self.assertRaises(ScanException):
+            await watcher.wait("missing", timeout_s=5)
+
+    async def test_timeout(self):
+        watcher = ScanWatcher(FakeScanClient({"slow" : 1000}), initial_interval_s=0.01)
+        with self.assertRaises(asyncio.TimeoutError):
+            await watcher.wait("slow", timeout_s=0.1)
+        self.assertEqual(watcher.watching, [])
+
+    async def test_wait_all_timeout_unwatches(self):
+        client = FakeScanClient({"fast" : 1, "slow" : 1000})
+        watcher = ScanWatcher(client, initial_interval_s=0.01)
+        with self.assertRaises(asyncio.TimeoutError):
+            await watcher.wait_all(["fast", "slow"], timeout_s=0.1)
+        self.assertEqual(watcher.watching, [])
+
+        await asyncio.sleep(0.05)
+        polls = len(client.requests)
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(client.requests), polls)
+
+    async def test_close_stops_polling(self):
+        client = FakeScanClient({"slow" : 1000})
+        async with ScanWatcher(client, initial_interval_s=0.01) as watcher:
+            future = watcher.watch("slow")
+            await asyncio.sleep(0.05)
+
+        self.assertTrue(future.cancelled())
+        polls = len(client.requests)
+        await asyncio.sleep(0.05)
+        self.assertEqual(len(client.requests), polls)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest, asyncio
+from types import SimpleNamespace
+from unittest import mock
+from cxone_api.high.scheduling import PollScheduler
+from cxone_api.high.reports import generate_reports
+from cxone_api.high.reports.exceptions import ReportException
+
+
+class FakeStatusCheck:
+    """Returns None until it has been called `complete_after` times, recording the loop time of each call."""
+
+    def __init__(self, complete_after=None, fail_with=None):
+        self.complete_after = complete_after
+        self.fail_with = fail_with
+        self.calls = []
+
+    async def __call__(self):
+        self.calls.append(asyncio.get_running_loop().time())
+        if self.fail_with is not None:
+            raise self.fail_with
+        if self.complete_after is not None and len(self.calls) >= self.complete_after:
+            return "done"
+        return None
+
+    @property
+    def intervals(self):
+        return [b - a for a, b in zip(self.calls, self.calls[1:])]
+
+
+class TestPollScheduler(unittest.IsolatedAsyncioTestCase):
+
+    async def test_backoff_growth(self):
+        scheduler = PollScheduler(initial_delay_s=0.01, max_delay_s=0.04, backoff_factor=2, jitter=0)
+        check = FakeStatusCheck(complete_after=5)
+        self.assertEqual(await scheduler.wait(check), "done")
+
+        # The delay doubles after each check until it reaches max_delay_s.
+        for interval, expected in zip(check.intervals, [0.02, 0.04, 0.04, 0.04]):
+            self.assertGreaterEqual(interval, expected * 0.9)
+        self.assertEqual(scheduler.poll_count, 5)
+
+    async def test_jitter_bounds(self):
+        for extreme in [-0.5, 0.5]:
+            with self.subTest(extreme=extreme):
+                scheduler = PollScheduler(initial_delay_s=0.04, backoff_factor=1, jitter=0.5)
+                check = FakeStatusCheck(complete_after=3)
+                with mock.patch("cxone_api.high.scheduling.random.uniform", return_value=extreme) as uniform:
+                    await scheduler.wait(check)
+
+                uniform.assert_called_with(-0.5, 0.5)
+                for interval in check.intervals:
+                    self.assertGreaterEqual(interval, 0.04 * (1 + extreme) * 0.9)
+
+    async def test_timeout_per_entry(self):
+        scheduler = PollScheduler(initial_delay_s=0.01, max_delay_s=0.01)
+        never = FakeStatusCheck()
+        soon = FakeStatusCheck(complete_after=3)
+
+        results = await asyncio.gather(scheduler.wait(never, timeout_s=0.05), scheduler.wait(soon), return_exceptions=True)
+
+        self.assertIsInstance(results[0], asyncio.TimeoutError)
+        self.assertEqual(results[1], "done")
+
+    async def test_failing_check_raises(self):
+        scheduler = PollScheduler(initial_delay_s=0.01)
+        check = FakeStatusCheck(fail_with=ValueError("status check failed"))
+        with self.assertRaises(ValueError):
+            await scheduler.wait(check)
+        self.assertEqual(len(check.calls), 1)
+
+    async def test_drains_when_empty(self):
+        scheduler = PollScheduler(initial_delay_s=0.01, max_delay_s=0.01)
+        await asyncio.gather(*[scheduler.wait(FakeStatusCheck(complete_after=i)) for i in range(1, 4)])
+        await asyncio.sleep(0.02)
+
+        self.assertEqual(scheduler.pending, 0)
+        self.assertEqual(asyncio.all_tasks(), {asyncio.current_task()})
+
+
+class FakeReport:
+    def __init__(self, name, polls=1, fail_submit=False, timeout_seconds=5):
+        self.name = name
+        self.polls = polls
+        self.fail_submit = fail_submit
+        self.timeout_seconds = timeout_seconds
+        self.content_type = SimpleNamespace(data={"name" : name})
+        self.checks = 0
+
+    async def _submit(self):
+        if self.fail_submit:
+            raise ReportException.error_on_create(self.name)
+        return f"id-{self.name}"
+
+    async def _check_status(self, report_id):
+        self.checks += 1
+        return f"https://example.com/{report_id}" if self.checks >= self.polls else None
+
+    async def _download(self, url):
+        return url
+
+
+class TestGenerateReports(unittest.IsolatedAsyncioTestCase):
+
+    async def test_results(self):
+        reports = [FakeReport("a", polls=2), FakeReport("b"), FakeReport("bad", fail_submit=True),
+                   FakeReport("slow", polls=1000, timeout_seconds=0.05)]
+        scheduler = PollScheduler(initial_delay_s=0.01, max_delay_s=0.01)
+        results = {r.report.name : r async for r in generate_reports(reports, scheduler=scheduler)}
+
+        self.assertEqual(results["a"].content, "https://example.com/id-a")
+        self.assertTrue(results["b"].ok)
+        self.assertIsInstance(results["bad"].exception, ReportException)
+        self.assertIsInstance(results["slow"].exception, ReportException)
+        self.assertIn("timed out", str(results["slow"].exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest, asyncio
+from cxone_api.high.scans import ScanFilterConfig
+from cxone_api.high.tenant_config_cache import TenantConfigurationCache
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeConfigClient(FakeClient):
+
+    def __init__(self):
+        super().__init__(delay_s=0.01)
+        self.route(None, "configuration/tenant", lambda r: FakeResponse(200, [{"key" : "scan.config.sast.filter", "value" : "!*.md"}]))
+        self.route(None, "configuration/project", lambda r: FakeResponse(200, [{"key" : "scan.config.sast.filter",
+                                                                                 "value" : f"!{r.query['project-id']}/**"}]))
+
+    @property
+    def tenant_fetches(self):
+        return self.counts.get("configuration/tenant", 0)
+
+    @property
+    def project_fetches(self):
+        return self.counts.get("configuration/project", 0)
+
+
+class TestTenantConfigurationCache(unittest.IsolatedAsyncioTestCase):
+
+    async def test_shared_per_client(self):
+        client = FakeConfigClient()
+        self.assertIs(TenantConfigurationCache.for_client(client), TenantConfigurationCache.for_client(client))
+        self.assertIsNot(TenantConfigurationCache.for_client(client), TenantConfigurationCache.for_client(FakeConfigClient()))
+
+    async def test_concurrent_gets_share_one_request(self):
+        client = FakeConfigClient()
+        cache = TenantConfigurationCache(client)
+        results = await asyncio.gather(*[cache.get() for _ in range(10)])
+        self.assertEqual(client.tenant_fetches, 1)
+        self.assertTrue(all([r is results[0] for r in results]))
+
+    async def test_ttl_and_invalidate(self):
+        client = FakeConfigClient()
+        cache = TenantConfigurationCache(client, ttl_s=0.05)
+        await cache.get()
+        await cache.get()
+        self.assertEqual(client.tenant_fetches, 1)
+
+        await asyncio.sleep(0.06)
+        await cache.get()
+        self.assertEqual(client.tenant_fetches, 2)
+
+        cache.invalidate()
+        await cache.get()
+        self.assertEqual(client.tenant_fetches, 3)
+
+    async def test_invalidate_during_fetch_is_not_cached(self):
+        client = FakeConfigClient()
+        cache = TenantConfigurationCache(client)
+        fetch = asyncio.create_task(cache.get())
+        await asyncio.sleep(0)
+        cache.invalidate()
+        await fetch
+
+        await cache.get()
+        self.assertEqual(client.tenant_fetches, 2)
+        await cache.get()
+        self.assertEqual(client.tenant_fetches, 2)
+
+    async def test_invalidate_for(self):
+        client = FakeConfigClient()
+        TenantConfigurationCache.invalidate_for(client)
+        await TenantConfigurationCache.for_client(client).get()
+        TenantConfigurationCache.invalidate_for(client)
+        await TenantConfigurationCache.for_client(client).get()
+        self.assertEqual(client.tenant_fetches, 2)
+
+    async def test_filter_config_for_projects(self):
+        client = FakeConfigClient()
+        ids = [f"p{i}" for i in range(50)]
+        configs = await ScanFilterConfig.for_projects(client, ids + ["p0"], concurrency=5)
+
+        self.assertEqual(list(configs.keys()), ids)
+        self.assertEqual(client.tenant_fetches, 1)
+        self.assertEqual(client.project_fetches, 50)
+        self.assertLessEqual(client.max_in_flight, 5)
+        self.assertEqual(configs["p7"].compute_filters("sast"), "!*.md,!p7/**")
+
+    async def test_filter_config_from_project_id_uses_cache(self):
+        client = FakeConfigClient()
+        await ScanFilterConfig.from_project_id(client, "p1")
+        await ScanFilterConfig.from_project_id(client, "p2")
+        self.assertEqual(client.tenant_fetches, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
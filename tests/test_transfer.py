@@ -0,0 +1,204 @@
+import unittest, asyncio, io, os, tempfile
+from requests.exceptions import ChunkedEncodingError
+from cxone_api.transfer import download_to_file, iter_download, ranged_download, upload_file
+from cxone_api.exceptions import ResponseException
+
+DATA = bytes(range(256)) * 1000
+
+
+class FakeStreamResponse:
+    def __init__(self, start, honor_range, fail_at):
+        self.start = start if honor_range else 0
+        self.status_code = 206 if honor_range and start > 0 else 200
+        self.ok = True
+        self.headers = {"Content-Length" : str(len(DATA) - self.start)}
+        self.fail_at = fail_at
+
+    def iter_content(self, chunk_size):
+        pos = self.start
+        while pos < len(DATA):
+            if self.fail_at is not None and pos >= self.fail_at:
+                raise ChunkedEncodingError("Connection dropped")
+            yield DATA[pos:pos + chunk_size]
+            pos += chunk_size
+
+    def close(self):
+        pass
+
+
+class FakeStreamClient:
+    api_endpoint = "https://foo.bar.com/api/"
+
+    def __init__(self, honor_range, failures=1):
+        self.data_plane = self
+        self.honor_range = honor_range
+        self.failures = failures
+        self.calls = 0
+
+    async def exec_request(self, verb, url, stream=False, headers=None, **kwargs):
+        self.calls += 1
+        start = int(headers["Range"][6:-1]) if headers is not None and "Range" in headers else 0
+        return FakeStreamResponse(start, self.honor_range, 100000 if self.calls <= self.failures else None)
+
+    async def get(self, url, stream=False, headers=None):
+        self.presigned_calls = getattr(self, "presigned_calls", 0) + 1
+        return await self.exec_request(None, url, stream, headers)
+
+
+class FakeRangeResponse:
+    def __init__(self, headers):
+        self.ok = True
+        if headers is not None and "Range" in headers:
+            start, end = headers["Range"][6:].split("-")
+            start, end = int(start), int(end) if len(end) > 0 else len(DATA) - 1
+            self.body = DATA[start:end + 1]
+            self.status_code = 206
+            self.headers = {"Content-Range" : f"bytes {start}-{end}/{len(DATA)}"}
+        else:
+            self.body = DATA
+            self.status_code = 200
+            self.headers = {"Content-Length" : str(len(DATA))}
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+
+class FakeRangeClient:
+    def __init__(self):
+        self.ranges = []
+
+    async def exec_request(self, verb, url, stream=False, headers=None, **kwargs):
+        self.ranges.append(headers.get("Range", None))
+        return FakeRangeResponse(headers)
+
+
+class FakeFailingRangeClient(FakeRangeClient):
+    """The range starting at `fail_start` fails; the other ranges are slow."""
+
+    def __init__(self, fail_start):
+        super().__init__()
+        self.fail_start = fail_start
+        self.completed = 0
+
+    async def exec_request(self, verb, url, stream=False, headers=None, **kwargs):
+        response = await super().exec_request(verb, url, stream, headers, **kwargs)
+        if headers["Range"] == f"bytes={self.fail_start}-{self.fail_start + 49999}":
+            response.status_code = 500
+        elif headers["Range"] != "bytes=0-0":
+            await asyncio.sleep(0.05)
+            self.completed += 1
+        return response
+
+
+class FakeUploadResponse:
+    status_code = 200
+    ok = True
+
+
+class FakeUploadClient:
+    def __init__(self, fail_first):
+        self.data_plane = self
+        self.fail_first = fail_first
+        self.bodies = []
+        self.lengths = []
+
+    def __send(self, data):
+        start = data.tell()
+        self.lengths.append(len(data) - start)
+        if self.fail_first:
+            data.read(1000)
+            data.seek(start)
+        body = b""
+        while True:
+            block = data.read(8192)
+            if not block:
+                break
+            body += block
+        self.bodies.append(body)
+
+    async def put(self, url, data, headers=None):
+        # The request body is read on a worker thread, as it is by DataPlaneClient.
+        await asyncio.to_thread(self.__send, data)
+        return FakeUploadResponse()
+
+
+class TestTransfer(unittest.IsolatedAsyncioTestCase):
+
+    def test_canary(self):
+        self.assertTrue(True)
+
+    async def test_resume_with_range(self):
+        client = FakeStreamClient(True)
+        dest = io.BytesIO()
+        self.assertEqual(await download_to_file(client, "https://storage/file", dest, chunk_size=7000), len(DATA))
+        self.assertEqual(dest.getvalue(), DATA)
+        self.assertEqual(client.calls, 2)
+
+    async def test_resume_without_range_support(self):
+        client = FakeStreamClient(False)
+        chunks = [c async for c in iter_download(client, "https://storage/file", chunk_size=7000)]
+        self.assertEqual(b"".join(chunks), DATA)
+        self.assertTrue(all(len(c) <= 7000 for c in chunks))
+
+    async def test_presigned_url_uses_data_plane(self):
+        client = FakeStreamClient(True, failures=0)
+        await download_to_file(client, "https://storage/file?X-Amz-Signature=abc", io.BytesIO())
+        self.assertEqual(client.presigned_calls, 1)
+
+    async def test_ranged_download(self):
+        client = FakeRangeClient()
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "artifact")
+            self.assertEqual(await ranged_download(client, "https://foo.bar.com/api/file", path, part_size=50000, chunk_size=7000), len(DATA))
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), DATA)
+        self.assertEqual(len(client.ranges), 1 + 6)
+
+    async def test_ranged_download_failure_cancels_parts(self):
+        client = FakeFailingRangeClient(fail_start=50000)
+        with tempfile.TemporaryDirectory() as d:
+            with self.assertRaises(ResponseException):
+                await ranged_download(client, "https://foo.bar.com/api/file", os.path.join(d, "artifact"), part_size=50000, concurrency=6)
+            self.assertEqual(client.completed, 0)
+            await asyncio.sleep(0.1)
+            self.assertEqual(client.completed, 0)
+
+    async def test_resume_attempts_exhausted(self):
+        client = FakeStreamClient(True, failures=10)
+        with self.assertRaises(ResponseException):
+            await download_to_file(client, "https://storage/file", io.BytesIO(), chunk_size=7000, max_resume_attempts=2)
+
+class TestUploadFile(unittest.IsolatedAsyncioTestCase):
+
+    async def test_progress_reported(self):
+        reports = []
+        client = FakeUploadClient(False)
+        response = await upload_file(client, "https://storage/upload", io.BytesIO(DATA), reports.append, progress_interval_s=0)
+
+        self.assertTrue(response.ok)
+        self.assertEqual(client.bodies, [DATA])
+        self.assertEqual(client.lengths, [len(DATA)])
+        self.assertTrue(reports[-1].done)
+        self.assertEqual(reports[-1].bytes_sent, len(DATA))
+        self.assertEqual(reports[-1].fraction, 1.0)
+        self.assertGreater(len(reports), 1)
+
+    async def test_retry_reported_as_new_attempt(self):
+        reports = []
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "upload.zip")
+            with open(path, "wb") as f:
+                f.write(DATA)
+            await upload_file(FakeUploadClient(True), "https://storage/upload", path, reports.append)
+
+        self.assertEqual(reports[-1].attempt, 2)
+        self.assertEqual(reports[-1].bytes_sent, len(DATA))
+        self.assertEqual(reports[-1].total_bytes, len(DATA))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest, asyncio, os, tempfile, zipfile
+import requests
+from cxone_api.high.scans import ScanInvoker
+from cxone_api.high.upload_dedup import DedupAction, UploadDedupIndex, hash_directory, hash_file
+from cxone_api.zip_stream import ZipOptions
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeScanClient(FakeClient):
+
+    def __init__(self):
+        super().__init__()
+        self.scans = {}
+        self.route(requests.post, "uploads", lambda r: FakeResponse(200, {"url" : "https://storage.example.com/upload"}))
+        self.route(requests.post, "scans", self.__submit)
+        self.route(requests.get, "scans/", lambda r: FakeResponse(200, self.scans[r.path.split("/")[-1]])
+                   if r.path.split("/")[-1] in self.scans else FakeResponse(404), prefix=True)
+
+    def __submit(self, request):
+        scan_id = f"scan-{len(self.scans) + 1}"
+        self.scans[scan_id] = {"id" : scan_id, "status" : "Completed", "statusDetails" : []}
+        return FakeResponse(201, self.scans[scan_id])
+
+
+class TestUploadDedup(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.dir.name, "src")
+        os.makedirs(os.path.join(self.src, "pkg"))
+        with open(os.path.join(self.src, "pkg", "a.py"), "w") as f:
+            f.write("a = 1\n")
+        with open(os.path.join(self.src, "b.py"), "w") as f:
+            f.write("b = 2\n")
+        self.zip_path = os.path.join(self.dir.name, "src.zip")
+        with zipfile.ZipFile(self.zip_path, "w") as z:
+            z.writestr("a.py", "a = 1\n")
+        self.index = UploadDedupIndex(os.path.join(self.dir.name, "dedup", "index.db"))
+
+    def tearDown(self):
+        self.index.close()
+        self.dir.cleanup()
+
+    async def test_hash_directory_tracks_content_and_names(self):
+        first = await hash_directory(self.src)
+        self.assertEqual(first, await hash_directory(self.src, workers=1))
+
+        os.utime(os.path.join(self.src, "b.py"), (0, 0))
+        self.assertEqual(first, await hash_directory(self.src))
+
+        os.rename(os.path.join(self.src, "b.py"), os.path.join(self.src, "c.py"))
+        self.assertNotEqual(first, await hash_directory(self.src))
+
+    async def test_hash_directory_uses_zip_options(self):
+        only_b = ZipOptions(include=lambda name: name == "b.py")
+        before = await hash_directory(self.src, only_b)
+        with open(os.path.join(self.src, "pkg", "a.py"), "w") as f:
+            f.write("a = 3\n")
+        self.assertEqual(before, await hash_directory(self.src, only_b))
+
+    async def test_lookup_and_metrics(self):
+        self.assertIsNone(await self.index.lookup("p1", "main", "h1"))
+        await self.index.record("p1", "main", "h1", "s1", [{"type" : "sast"}])
+
+        self.assertIsNone(await self.index.lookup("p1", "main", "h1"))
+        self.assertIsNone(await self.index.lookup("p1", "main", "h2", [{"type" : "sast"}]))
+        self.assertIsNone(await self.index.lookup("p1", "dev", "h1", [{"type" : "sast"}]))
+
+        entry = await self.index.lookup("p1", "main", "h1", [{"type" : "sast"}])
+        self.assertEqual(entry.scan_id, "s1")
+        self.assertEqual(self.index.hits, 1)
+        self.assertEqual(self.index.misses, 4)
+        self.assertAlmostEqual(self.index.hit_ratio, 0.2)
+
+    async def test_eviction_by_age(self):
+        index = UploadDedupIndex(os.path.join(self.dir.name, "dedup", "index.db"), max_age_s=-1)
+        try:
+            await index.record("p1", "main", "h1", "s1")
+            self.assertIsNone(await index.lookup("p1", "main", "h1"))
+            self.assertEqual(await index.evict(), 1)
+        finally:
+            index.close()
+
+    async def test_zip_upload_skipped_when_unchanged(self):
+        client = FakeScanClient()
+        first = await ScanInvoker.scan_by_local_zip_upload(client, "p1", self.zip_path, "main", [{"type" : "sast", "value" : {}}], dedup=self.index)
+        second = await ScanInvoker.scan_by_local_zip_upload(client, "p1", self.zip_path, "main", [{"type" : "sast", "value" : {}}], dedup=self.index)
+
+        self.assertEqual(first.json()["id"], second.json()["id"])
+        self.assertEqual(len(client.uploads), 1)
+        self.assertEqual(len(client.scans), 1)
+
+    async def test_unsuccessful_previous_scan_is_not_reused(self):
+        for status in ["Failed", "Canceled", "Partial"]:
+            with self.subTest(status=status):
+                client = FakeScanClient()
+                first = await ScanInvoker.scan_by_local_zip_upload(client, status, self.zip_path, "main", [{"type" : "sast", "value" : {}}], dedup=self.index)
+                client.scans[first.json()["id"]]["status"] = status
+                second = await ScanInvoker.scan_by_local_zip_upload(client, status, self.zip_path, "main", [{"type" : "sast", "value" : {}}], dedup=self.index)
+
+                self.assertNotEqual(first.json()["id"], second.json()["id"])
+                self.assertEqual(len(client.uploads), 2)
+
+    async def test_running_previous_scan_is_reused(self):
+        client = FakeScanClient()
+        first = await ScanInvoker.scan_by_local_zip_upload(client, "p1", self.zip_path, "main", [{"type" : "sast", "value" : {}}], dedup=self.index)
+        client.scans[first.json()["id"]]["status"] = "Running"
+        second = await ScanInvoker.scan_by_local_zip_upload(client, "p1", self.zip_path, "main", [{"type" : "sast", "value" : {}}], dedup=self.index)
+
+        self.assertEqual(first.json()["id"], second.json()["id"])
+        self.assertEqual(len(client.uploads), 1)
+
+    async def test_warn_action_scans_again(self):
+        index = UploadDedupIndex(os.path.join(self.dir.name, "dedup", "index.db"), action=DedupAction.WARN)
+        try:
+            client = FakeScanClient()
+            await ScanInvoker.scan_by_local_directory(client, "p1", self.src, "main", [{"type" : "sast", "value" : {}}], dedup=index)
+            with self.assertLogs("ScanInvoker", "WARNING"):
+                await ScanInvoker.scan_by_local_directory(client, "p1", self.src, "main", [{"type" : "sast", "value" : {}}], dedup=index)
+
+            self.assertEqual(len(client.uploads), 2)
+            self.assertEqual(index.hits, 1)
+        finally:
+            index.close()
+
+    async def test_hash_file(self):
+        self.assertEqual(await hash_file(self.zip_path), await hash_file(self.zip_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest, asyncio, time
+import requests
+from cxone_api.exceptions import ResponseException, CommunicationException
+from cxone_api.high.scans import ScanInvoker
+from cxone_api.upload_link_pool import UploadLinkPool, upload_link_expiry
+from tests.fakes import FakeClient, FakeResponse
+
+
+class FakeLinkClient(FakeClient):
+
+    def __init__(self, expires_s=900, fail=False, unreachable=0):
+        super().__init__()
+        self.expires_s = expires_s
+        self.fail = fail
+        self.unreachable = unreachable
+        self.generated = 0
+        self.submitted = []
+        self.route(requests.post, "uploads", self.__generate)
+        self.route(requests.post, "scans", self.__submit)
+
+    def __generate(self, request):
+        if self.fail:
+            return FakeResponse(500)
+        if self.unreachable > 0:
+            self.unreachable -= 1
+            raise CommunicationException(FakeClient.exec_request)
+        self.generated += 1
+        signed = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime())
+        return FakeResponse(200, {"url" : f"https://storage.example.com/{self.generated}?X-Amz-Date={signed}"
+                                          f"&X-Amz-Expires={self.expires_s}&X-Amz-Signature=abc"})
+
+    def __submit(self, request):
+        self.submitted.append(request.json)
+        return FakeResponse(201, {"id" : "scan-1"})
+
+
+class TestUploadLinkPool(unittest.IsolatedAsyncioTestCase):
+
+    def test_expiry_from_presigned_url(self):
+        self.assertEqual(upload_link_expiry("https://s/x?X-Amz-Date=20240101T000000Z&X-Amz-Expires=600", 10), 1704067800)
+        self.assertEqual(upload_link_expiry("https://s/x?X-Goog-Date=20240101T000000Z&X-Goog-Expires=60", 10), 1704067260)
+        self.assertEqual(upload_link_expiry("https://s/x", 10, generated_at=100), 110)
+
+    async def test_fill_and_acquire(self):
+        client = FakeLinkClient()
+        pool = UploadLinkPool(client, size=3)
+        try:
+            await pool.fill()
+            self.assertEqual(pool.available, 3)
+
+            first = await pool.acquire()
+            self.assertTrue(first.startswith("https://storage.example.com/1?"))
+            self.assertEqual(pool.hits, 1)
+
+            await asyncio.sleep(0.05)
+            self.assertEqual(pool.available, 3)
+            self.assertEqual(client.generated, 4)
+        finally:
+            await pool.close()
+
+    async def test_empty_pool_generates_on_demand(self):
+        client = FakeLinkClient()
+        pool = UploadLinkPool(client, size=1)
+        try:
+            self.assertIsNotNone(await pool.acquire())
+            self.assertEqual(pool.misses, 1)
+        finally:
+            await pool.close()
+
+    async def test_links_near_expiry_are_replaced(self):
+        client = FakeLinkClient(expires_s=30)
+        pool = UploadLinkPool(client, size=2, refresh_margin_s=60, retry_delay_s=0.01)
+        try:
+            await pool.fill()
+            self.assertEqual(pool.available, 0)
+            await pool.acquire()
+            self.assertEqual(pool.hits, 0)
+            self.assertEqual(pool.misses, 1)
+        finally:
+            await pool.close()
+
+    async def test_scan_invoker_uses_pool(self):
+        client = FakeLinkClient()
+        client.upload_link_pool = UploadLinkPool(client, size=2)
+        try:
+            await client.upload_link_pool.fill()
+            await ScanInvoker.scan_by_local_zip_upload(client, "p1", __file__, "main", [{"type" : "sast", "value" : {}}])
+
+            self.assertEqual(client.upload_link_pool.hits, 1)
+            self.assertEqual(client.uploads[0], client.submitted[0]["handler"]["uploadUrl"])
+            self.assertTrue(client.uploads[0].startswith("https://storage.example.com/1?"))
+        finally:
+            await client.upload_link_pool.close()
+
+    async def test_generation_failure_raises(self):
+        pool = UploadLinkPool(FakeLinkClient(fail=True), size=1, retry_delay_s=0.01)
+        try:
+            with self.assertRaises(ResponseException):
+                await pool.acquire()
+        finally:
+            await pool.close()
+
+    async def test_refill_retried_after_communication_failure(self):
+        client = FakeLinkClient(unreachable=2)
+        pool = UploadLinkPool(client, size=1, retry_delay_s=0.01)
+        try:
+            with self.assertLogs("UploadLinkPool", "WARNING"):
+                with self.assertRaises(CommunicationException):
+                    await pool.acquire()
+                await asyncio.sleep(0.1)
+
+            self.assertEqual(pool.available, 1)
+        finally:
+            await pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest, asyncio, io, os, tempfile, zipfile
+from cxone_api.zip_stream import ZipOptions, iter_zip_directory
+from cxone_api.transfer import upload_directory
+from tests.fakes import FakeClient, FakeResponse
+
+FILES = {
+    "README.md" : b"# readme\n" * 1000,
+    "src/main.py" : b"print('hello')\n" * 5000,
+    "src/deep/nested/été.txt" : b"unicode name",
+    "assets/logo.png" : os.urandom(50000),
+    "empty.txt" : b"",
+}
+
+
+class FakeDataPlane(FakeClient):
+
+    def __init__(self, streaming_status):
+        super().__init__()
+        self.streaming_status = streaming_status
+        self.bodies = []
+
+    async def put(self, url, data, headers=None):
+        if hasattr(data, "read"):
+            self.bodies.append(("file", data.read()))
+            return FakeResponse(200)
+        self.bodies.append(("stream", b"".join(data)))
+        return FakeResponse(self.streaming_status)
+
+
+class TestZipStream(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        for name, content in FILES.items():
+            path = os.path.join(self.dir.name, *name.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def __read(self, data):
+        archive = zipfile.ZipFile(io.BytesIO(data))
+        self.assertIsNone(archive.testzip())
+        return archive
+
+    def test_archive_contents(self):
+        for workers in [1, 4]:
+            with self.subTest(workers=workers):
+                archive = self.__read(b"".join(iter_zip_directory(self.dir.name, ZipOptions(workers=workers), chunk_size=1000)))
+                self.assertEqual(sorted(archive.namelist()), sorted(FILES.keys()))
+                for name, content in FILES.items():
+                    self.assertEqual(archive.read(name), content)
+                self.assertEqual(archive.getinfo("assets/logo.png").compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(archive.getinfo("src/main.py").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_spooled_entries(self):
+        archive = self.__read(b"".join(iter_zip_directory(self.dir.name, ZipOptions(spool_max_memory=100))))
+        self.assertEqual(archive.read("assets/logo.png"), FILES["assets/logo.png"])
+
+    def test_include_and_store_only(self):
+        options = ZipOptions(compression_level=0, include=lambda name: name.startswith("src/"))
+        archive = self.__read(b"".join(iter_zip_directory(self.dir.name, options)))
+        self.assertEqual(sorted(archive.namelist()), sorted([n for n in FILES.keys() if n.startswith("src/")]))
+        self.assertTrue(all(i.compress_type == zipfile.ZIP_STORED for i in archive.infolist()))
+
+    def test_upload_streaming(self):
+        client = FakeDataPlane(200)
+        self.assertTrue(asyncio.run(upload_directory(client, "https://bucket/upload?X-Amz-Signature=x", self.dir.name)).ok)
+        self.assertEqual([kind for kind, _ in client.bodies], ["stream"])
+        self.__read(client.bodies[0][1])
+
+    def test_upload_fallback(self):
+        client = FakeDataPlane(501)
+        self.assertTrue(asyncio.run(upload_directory(client, "https://bucket/upload?X-Amz-Signature=x", self.dir.name)).ok)
+        self.assertEqual([kind for kind, _ in client.bodies], ["stream", "file"])
+        self.assertEqual(sorted(self.__read(client.bodies[1][1]).namelist()), sorted(FILES.keys()))
+
+
+if __name__ == '__main__':
+    unittest.main()